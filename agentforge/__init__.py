@@ -2,19 +2,35 @@
 
 __version__ = "0.1.0"
 
-from agentforge.core.agent_generator import generate_agent_files, generate_agents
-from agentforge.core.repo_analyzer import analyze_repo
-from agentforge.core.spec_parser import parse_spec
-from agentforge.core.prompt_builder import build_agent_generation_prompt
-from agentforge.core.executor import execute, run_with_agent
-
-__all__ = [
-    "__version__",
-    "generate_agents",
-    "generate_agent_files",
-    "analyze_repo",
-    "parse_spec",
-    "build_agent_generation_prompt",
-    "execute",
-    "run_with_agent",
-]
+# Public names resolve on first access so importing the package (or the CLI)
+# does not pull in every submodule.
+_EXPORTS = {
+    "generate_agents": "agentforge.core.agent_generator",
+    "generate_agent_files": "agentforge.core.agent_generator",
+    "analyze_repo": "agentforge.core.repo_analyzer",
+    "parse_spec": "agentforge.core.spec_parser",
+    "build_agent_generation_prompt": "agentforge.core.prompt_builder",
+    "execute": "agentforge.core.executor",
+    "execute_async": "agentforge.core.executor",
+    "run_with_agent": "agentforge.core.executor",
+    "run_with_agent_async": "agentforge.core.executor",
+    "stream_execute": "agentforge.core.executor",
+    "stream_execute_async": "agentforge.core.executor",
+}
+
+__all__ = ["__version__", *_EXPORTS]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
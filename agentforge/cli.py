@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import subprocess
 import sys
 from pathlib import Path
 
-from agentforge.core import agent_generator, executor, repo_analyzer, spec_parser
+# Core modules are imported inside the command handlers so each subcommand only
+# loads what it uses; see benchmarks/startup.py for the startup budget.
 
 
 def _load_json_file(path: str) -> dict:
+    import json
+
     data = Path(path).read_text(encoding="utf-8")
     try:
         parsed = json.loads(data)
@@ -24,6 +26,8 @@ def _load_json_file(path: str) -> dict:
 
 
 def _write_output(path: str | None, payload: dict | list[dict]) -> None:
+    import json
+
     output = json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=True)
     if path:
         Path(path).write_text(output + "\n", encoding="utf-8")
@@ -31,7 +35,198 @@ def _write_output(path: str | None, payload: dict | list[dict]) -> None:
         print(output)
 
 
-def main() -> None:
+def _add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the codex response cache.",
+    )
+    cache_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached codex responses and overwrite them with fresh results.",
+    )
+
+
+def _configure_cache(args: argparse.Namespace) -> None:
+    from agentforge.core import cache
+
+    if args.no_cache:
+        os.environ.pop("AGENTFORGE_CACHE_DIR", None)
+        return
+    os.environ.setdefault("AGENTFORGE_CACHE_DIR", str(cache.default_cache_dir()))
+    os.environ.setdefault("AGENTFORGE_LOCK_DIR", str(cache.default_cache_root() / "locks"))
+    if args.refresh:
+        os.environ["AGENTFORGE_CACHE_REFRESH"] = "1"
+
+
+def _add_prompt_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--prompt-budget",
+        type=int,
+        help="Estimated token budget for generated prompts; optional spec sections "
+        "are dropped to fit (overrides AGENTFORGE_PROMPT_BUDGET).",
+    )
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="Send indented JSON and the raw spec text instead of the compact encoding.",
+    )
+
+
+def _configure_prompt(args: argparse.Namespace) -> None:
+    if args.no_compact:
+        os.environ["AGENTFORGE_PROMPT_COMPACT"] = "0"
+    else:
+        os.environ.setdefault("AGENTFORGE_PROMPT_COMPACT", "1")
+    if args.prompt_budget is not None:
+        os.environ["AGENTFORGE_PROMPT_BUDGET"] = str(args.prompt_budget)
+
+
+def _add_execution_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Start a second codex attempt when a call runs past the observed p95 latency.",
+    )
+    parser.add_argument(
+        "--adaptive-timeout",
+        action="store_true",
+        help="Time out calls at a multiple of the observed p99 latency instead of 300s.",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        help="Host-wide cap on codex processes shared by all agentforge processes "
+        "(overrides AGENTFORGE_MAX_CONCURRENT).",
+    )
+    parser.add_argument(
+        "--cpu-limit",
+        type=int,
+        metavar="SECONDS",
+        help="RLIMIT_CPU for each codex process (overrides AGENTFORGE_CODEX_CPU_SECONDS).",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        metavar="MB",
+        help="RLIMIT_AS for each codex process (overrides AGENTFORGE_CODEX_MEMORY_MB).",
+    )
+
+
+def _configure_execution(args: argparse.Namespace) -> None:
+    from agentforge.core import cache
+
+    os.environ.setdefault(
+        "AGENTFORGE_LATENCY_FILE", str(cache.default_cache_root() / "latency.json")
+    )
+    if args.hedge:
+        os.environ["AGENTFORGE_HEDGE"] = "1"
+    if args.adaptive_timeout:
+        os.environ["AGENTFORGE_ADAPTIVE_TIMEOUT"] = "1"
+    if args.max_concurrent is not None:
+        os.environ["AGENTFORGE_MAX_CONCURRENT"] = str(args.max_concurrent)
+    if args.cpu_limit is not None:
+        os.environ["AGENTFORGE_CODEX_CPU_SECONDS"] = str(args.cpu_limit)
+    if args.memory_limit is not None:
+        os.environ["AGENTFORGE_CODEX_MEMORY_MB"] = str(args.memory_limit)
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-phase timing breakdown to stderr.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Write a Chrome trace-event JSON file of the run (implies --profile).",
+    )
+
+
+def _report_profile(args: argparse.Namespace) -> None:
+    from agentforge.core import tracing
+
+    if not tracing.is_enabled():
+        return
+    tracing.disable()
+    print(tracing.format_summary(), file=sys.stderr)
+    if args.profile_output:
+        tracing.write_chrome_trace(args.profile_output)
+
+
+def _flush_cache_stats() -> None:
+    executor = sys.modules.get("agentforge.core.executor")
+    if executor is None:
+        return
+    response_cache = executor.get_response_cache()
+    if response_cache is not None:
+        response_cache.flush_stats()
+
+
+def _analyze_repo(args: argparse.Namespace) -> dict:
+    from agentforge.core import repo_analyzer
+
+    if args.sample_budget_ms is not None or args.sample_max_files is not None:
+        budget = args.sample_budget_ms / 1000 if args.sample_budget_ms is not None else None
+        return repo_analyzer.analyze_repo(
+            args.repo,
+            sample_budget_seconds=budget,
+            sample_max_files=args.sample_max_files,
+        )
+    return repo_analyzer.analyze_repo(
+        args.repo,
+        snapshot_path=str(repo_analyzer.default_snapshot_path(args.repo)),
+        full_rescan=args.rescan,
+        workers=args.workers,
+    )
+
+
+def _run_batch(args: argparse.Namespace) -> None:
+    from agentforge.core import batch
+
+    checkpoint = args.checkpoint
+    if checkpoint is None and args.batch != "-":
+        checkpoint = f"{args.batch}.checkpoint"
+
+    # A resumed run adds to the results of the tasks its checkpoint skips.
+    resuming = checkpoint is not None and os.path.exists(checkpoint)
+    results = (
+        open(args.output, "a" if resuming else "w", encoding="utf-8")
+        if args.output
+        else sys.stdout
+    )
+    try:
+        if args.batch == "-":
+            summary = batch.run_batch(
+                sys.stdin, results, args.jobs, args.ordered, checkpoint
+            )
+        else:
+            with open(args.batch, encoding="utf-8-sig") as stream:
+                summary = batch.run_batch(
+                    stream, results, args.jobs, args.ordered, checkpoint
+                )
+    finally:
+        if results is not sys.stdout:
+            results.close()
+
+    if checkpoint is not None and not summary.failed:
+        # Every task is done; a later run of the same file starts over.
+        try:
+            os.remove(checkpoint)
+        except FileNotFoundError:
+            pass
+    print(
+        f"Batch complete: {summary.succeeded} succeeded, {summary.failed} failed, "
+        f"{summary.skipped} skipped.",
+        file=sys.stderr,
+    )
+    if summary.failed:
+        sys.exit(1)
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="agentforge")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -50,12 +245,90 @@ def main() -> None:
         "--codex-path",
         help="Path to the codex CLI executable (overrides AGENTFORGE_CODEX_PATH).",
     )
+    generate_parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        help="Threads used to walk the repository (default: min(8, CPU count)).",
+    )
+    generate_parser.add_argument(
+        "--sample-budget-ms",
+        type=int,
+        help="Estimate repository metadata from a sample, spending at most this many ms.",
+    )
+    generate_parser.add_argument(
+        "--sample-max-files",
+        type=int,
+        help="Estimate repository metadata from a sample of at most this many files.",
+    )
+    generate_parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore the saved repository snapshot and rescan every directory.",
+    )
+    generate_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate agents even if the spec and repository are unchanged.",
+    )
+    generate_parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Remove agent directories in --output-dir that are no longer generated.",
+    )
+    generate_parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help="Split the spec by section, generate each shard concurrently, and merge the agents.",
+    )
+    generate_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Concurrent codex calls in --sharded mode (default: 4).",
+    )
+    _add_cache_arguments(generate_parser)
+    _add_prompt_arguments(generate_parser)
+    _add_execution_arguments(generate_parser)
+    _add_profile_arguments(generate_parser)
 
     run_parser = subparsers.add_parser("run", help="Run an agent definition.")
-    run_parser.add_argument("--agent", required=True, help="Path to an agent definition.")
+    run_parser.add_argument(
+        "--agent",
+        help="Path to an agent definition, or the slug, name or role of an agent in a "
+        "generate --output-dir directory or AGENTFORGE_AGENT_PATH.",
+    )
     task_group = run_parser.add_mutually_exclusive_group(required=True)
     task_group.add_argument("--task", help="Task text to run.")
     task_group.add_argument("--task-file", help="Path to a task file.")
+    task_group.add_argument(
+        "--batch",
+        help="Path to a JSONL file of tasks (use - for stdin); results are written as JSONL.",
+    )
+    run_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of batch tasks to run concurrently (default: 1).",
+    )
+    run_parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Write batch results in input order instead of completion order.",
+    )
+    run_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print codex output as it arrives instead of after it exits.",
+    )
+    run_parser.add_argument(
+        "--output",
+        help="Write codex output (or batch results) to this file instead of stdout.",
+    )
+    run_parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file for batch runs (default: <batch>.checkpoint).",
+    )
     run_parser.add_argument(
         "--context",
         help="Path to a JSON file providing execution context.",
@@ -64,38 +337,390 @@ def main() -> None:
         "--codex-path",
         help="Path to the codex CLI executable (overrides AGENTFORGE_CODEX_PATH).",
     )
+    run_parser.add_argument(
+        "--rescan-agents",
+        action="store_true",
+        help="Rescan every registered agent directory before resolving --agent "
+        "(picks up agents renamed in place).",
+    )
+    _add_cache_arguments(run_parser)
+    _add_prompt_arguments(run_parser)
+    _add_execution_arguments(run_parser)
+    _add_profile_arguments(run_parser)
 
-    args = parser.parse_args()
+    pipeline_parser = subparsers.add_parser(
+        "pipeline", help="Run a dependency graph of agents from a config file."
+    )
+    pipeline_parser.add_argument(
+        "--config",
+        default="agents/agents-config.json",
+        help="Pipeline config listing agents and their depends_on ids "
+        "(default: agents/agents-config.json).",
+    )
+    pipeline_parser.add_argument(
+        "--task",
+        default="",
+        help="Task text given to every agent in the pipeline.",
+    )
+    pipeline_parser.add_argument(
+        "--context",
+        help="Path to a JSON file providing execution context.",
+    )
+    pipeline_parser.add_argument(
+        "--output-dir",
+        default="pipeline-output",
+        help="Directory for per-agent outputs and pipeline state (default: pipeline-output).",
+    )
+    pipeline_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Number of agents to run concurrently (default: 4).",
+    )
+    pipeline_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run every agent even if its inputs are unchanged.",
+    )
+    pipeline_parser.add_argument(
+        "--codex-path",
+        help="Path to the codex CLI executable (overrides AGENTFORGE_CODEX_PATH).",
+    )
+    _add_cache_arguments(pipeline_parser)
+    _add_prompt_arguments(pipeline_parser)
+    _add_execution_arguments(pipeline_parser)
+    _add_profile_arguments(pipeline_parser)
+
+    analyze_parser = subparsers.add_parser(
+        "analyze", help="Analyze many repositories and write their metadata as JSONL."
+    )
+    analyze_parser.add_argument(
+        "repos",
+        nargs="*",
+        help="Repository roots to analyze (default: read them from --repos-file or stdin).",
+    )
+    analyze_parser.add_argument(
+        "--repos-file",
+        help="File listing one repository root per line ('-' for stdin).",
+    )
+    analyze_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of repositories analyzed in parallel processes (default: CPU count).",
+    )
+    analyze_parser.add_argument(
+        "--output",
+        help="Write JSONL results to this file instead of stdout.",
+    )
+    analyze_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Threads used to walk each repository (default: 1).",
+    )
+    analyze_parser.add_argument(
+        "--sample-budget-ms",
+        type=int,
+        help="Estimate repository metadata from a sample, spending at most this many ms.",
+    )
+    analyze_parser.add_argument(
+        "--sample-max-files",
+        type=int,
+        help="Estimate repository metadata from a sample of at most this many files.",
+    )
+    analyze_parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore saved repository snapshots and rescan every directory.",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a resident daemon that answers agentforge commands with warm caches."
+    )
+    serve_parser.add_argument(
+        "--socket",
+        help="UNIX socket to listen on (default: AGENTFORGE_SOCKET or "
+        "~/.cache/agentforge/daemon.sock).",
+    )
+
+    return parser
+
+
+def _command_generate(args: argparse.Namespace) -> None:
+    from agentforge.core import agent_generator, spec_parser
+    from agentforge.core.output_writer import WriteSummary
+
+    if args.output_dir:
+        def report(summary: WriteSummary) -> None:
+            print(
+                f"Agent files: {summary.written} written, {summary.unchanged} unchanged, "
+                f"{summary.removed} removed.",
+                file=sys.stderr,
+            )
+
+        agent_generator.generate_agent_files(
+            args.spec,
+            args.repo,
+            args.output_dir,
+            _analyze_repo(args),
+            force=args.force,
+            prune=args.prune,
+            on_write=report,
+            sharded=args.sharded,
+            jobs=args.jobs,
+        )
+        _register_agents(args.output_dir)
+    else:
+        spec = spec_parser.parse_spec(args.spec)
+        repo_meta = _analyze_repo(args)
+        agents = agent_generator.generate_agents(
+            spec, repo_meta, sharded=args.sharded, jobs=args.jobs
+        )
+        _write_output(None, agents)
+
+
+def _register_agents(output_dir: str) -> None:
+    """Index ``output_dir`` so its agents can be run by name; best effort."""
+    from agentforge.core import agent_registry
 
     try:
-        if args.codex_path:
-            os.environ["AGENTFORGE_CODEX_PATH"] = args.codex_path
+        agent_registry.register(output_dir)
+    except (OSError, RuntimeError) as exc:
+        print(f"Warning: could not index agents in {output_dir}: {exc}", file=sys.stderr)
+
+
+def _command_run(args: argparse.Namespace) -> None:
+    from agentforge.core import executor
+
+    task_text = args.task
+    if args.task_file:
+        task_text = Path(args.task_file).read_text(encoding="utf-8-sig")
+    context = _load_json_file(args.context) if args.context else {}
+    if args.output:
+        chunks = executor.stream_with_agent(args.agent, task_text, context)
+        with open(args.output, "w", encoding="utf-8") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+    elif args.stream:
+        for chunk in executor.stream_with_agent(args.agent, task_text, context):
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+    else:
+        result = executor.run_with_agent(args.agent, task_text, context)
+        print(result)
+
+
+def _command_pipeline(args: argparse.Namespace) -> None:
+    from agentforge.core import pipeline
+
+    nodes = pipeline.load_pipeline(args.config)
+    context = _load_json_file(args.context) if args.context else {}
+
+    def report(event: str, node_id: str) -> None:
+        print(f"[{event}] {node_id}", file=sys.stderr)
+
+    result = pipeline.run_pipeline(
+        nodes,
+        args.task,
+        context,
+        args.output_dir,
+        jobs=args.jobs,
+        force=args.force,
+        on_event=report,
+    )
+    for node_id, message in result.failed.items():
+        print(f"Error: {node_id}: {message}", file=sys.stderr)
+    # Most expensive agents first.
+    costs = sorted(
+        ((sum(usage.cpu_seconds for usage in usages), node_id, usages)
+         for node_id, usages in result.usage.items()),
+        reverse=True,
+    )
+    for cpu_seconds, node_id, usages in costs:
+        peak_mb = max(usage.max_rss_kb for usage in usages) // 1024
+        print(f"[usage] {node_id}: {cpu_seconds:.2f}s CPU, {peak_mb} MB peak RSS", file=sys.stderr)
+    print(
+        f"Pipeline complete: {len(result.executed)} executed, {len(result.reused)} reused, "
+        f"{len(result.failed)} failed, {len(result.skipped)} skipped.",
+        file=sys.stderr,
+    )
+    if result.failed or result.skipped:
+        sys.exit(1)
+
+
+def _command_analyze(args: argparse.Namespace) -> None:
+    from agentforge.core import multi_repo
+
+    if args.repos and args.repos_file:
+        raise ValueError("Pass repository roots as arguments or with --repos-file, not both.")
+    budget = args.sample_budget_ms / 1000 if args.sample_budget_ms is not None else None
+    results = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    source = None
+    try:
+        if args.repos:
+            roots = args.repos
+        elif args.repos_file and args.repos_file != "-":
+            source = open(args.repos_file, encoding="utf-8-sig")
+            roots = multi_repo.iter_roots(source)
+        else:
+            roots = multi_repo.iter_roots(sys.stdin)
+        summary = multi_repo.analyze_repos(
+            roots,
+            results,
+            jobs=args.jobs,
+            full_rescan=args.rescan,
+            workers=args.workers,
+            sample_budget_seconds=budget,
+            sample_max_files=args.sample_max_files,
+        )
+    finally:
+        if source is not None:
+            source.close()
+        if results is not sys.stdout:
+            results.close()
+
+    print(
+        f"Analyze complete: {summary.succeeded} succeeded, {summary.failed} failed.",
+        file=sys.stderr,
+    )
+    if summary.failed:
+        sys.exit(1)
+
+
+def _command_serve(args: argparse.Namespace) -> None:
+    # Everything imported here is already loaded in each forked request.
+    from agentforge.core import agent_generator, daemon, executor, repo_analyzer, spec_parser
+    from agentforge.core import agent_registry, batch, pipeline  # noqa: F401
+
+    spec_parser.enable_memo()
+    executor.enable_memo()
+    repo_analyzer.enable_memo()
+    agent_generator.warm_template()
+    try:
+        daemon.serve(
+            args.socket or daemon.default_socket_path(),
+            _prepare_request,
+            _run_request,
+            collect=repo_analyzer.memo_updates,
+            adopt=repo_analyzer.adopt_memo,
+        )
+    except KeyboardInterrupt:
+        pass
+    except (OSError, RuntimeError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _prepare_request(argv: list[str]) -> argparse.Namespace | None:
+    """Warm the daemon's caches for one request; runs in the daemon process.
+
+    Only quick work belongs here, since the daemon accepts no other request
+    meanwhile. Repository scans run in the forked child, which sends the
+    snapshot it loaded or saved back to the daemon.
+    """
+    import contextlib
+    import io
+
+    parser = _build_parser()
+    # Usage errors are reported by the child, on the client's stderr.
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit:
+            return None
+    if args.command == "serve":
+        return None
+    if args.command == "analyze":
+        return args
+    _configure(args)
+
+    from agentforge.core import agent_generator, executor, spec_parser
+
+    executor.warm()
+    if args.command == "generate":
+        spec_parser.parse_spec(args.spec)
+        agent_generator.warm_template()
+    elif args.command == "run" and args.agent:
+        executor.read_agent(args.agent)
+    return args
+
+
+def _run_request(argv: list[str], args: argparse.Namespace | None) -> None:
+    parser = _build_parser()
+    _run(parser, args if args is not None else parser.parse_args(argv))
+
+
+def _forward_to_daemon(argv: list[str]) -> int | None:
+    if os.environ.get("AGENTFORGE_DAEMON") == "0" or argv[:1] == ["serve"]:
+        return None
+    from agentforge.core import daemon
+
+    try:
+        return daemon.forward(argv)
+    except RuntimeError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+
+def _configure(args: argparse.Namespace) -> None:
+    if args.codex_path:
+        os.environ["AGENTFORGE_CODEX_PATH"] = args.codex_path
+    _configure_cache(args)
+    _configure_prompt(args)
+    _configure_execution(args)
+    if getattr(args, "rescan_agents", False):
+        os.environ["AGENTFORGE_AGENT_RESCAN"] = "1"
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    # Hand the command to a running ``agentforge serve`` daemon when there is one.
+    exit_code = _forward_to_daemon(argv)
+    if exit_code is not None:
+        sys.exit(exit_code)
+    parser = _build_parser()
+    _run(parser, parser.parse_args(argv))
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.command == "serve":
+        _command_serve(args)
+        return
+    if args.command == "run" and not args.batch and not args.agent:
+        parser.error("--agent is required unless --batch is used.")
+
+    try:
+        if args.command == "analyze":
+            _command_analyze(args)
+            return
+        _configure(args)
+        if args.profile or args.profile_output:
+            from agentforge.core import tracing
+
+            tracing.enable()
 
         if args.command == "generate":
-            if args.output_dir:
-                output_dir = Path(args.output_dir)
-                agents = agent_generator.generate_agent_files(
-                    args.spec, args.repo, str(output_dir)
-                )
-                _write_output(str(output_dir / "agents.json"), agents)
-            else:
-                spec = spec_parser.parse_spec(args.spec)
-                repo_meta = repo_analyzer.analyze_repo(args.repo)
-                agents = agent_generator.generate_agents(spec, repo_meta)
-                _write_output(None, agents)
+            _command_generate(args)
+            return
+
+        if args.command == "run" and args.batch:
+            _run_batch(args)
             return
 
         if args.command == "run":
-            task_text = args.task
-            if args.task_file:
-                task_text = Path(args.task_file).read_text(encoding="utf-8-sig")
-            context = _load_json_file(args.context) if args.context else {}
-            result = executor.run_with_agent(args.agent, task_text, context)
-            print(result)
+            _command_run(args)
+            return
+
+        if args.command == "pipeline":
+            _command_pipeline(args)
             return
     except (OSError, ValueError, RuntimeError, subprocess.CalledProcessError) as exc:
         print(f"Error: {exc}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        _flush_cache_stats()
+        _report_profile(args)
 
     print("Error: Unknown command.", file=sys.stderr)
     sys.exit(2)
@@ -3,68 +3,305 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from pathlib import Path
+import hashlib
 import json
 import re
 
-from agentforge.core import executor, repo_analyzer, spec_parser
-from agentforge.core.prompt_builder import build_agent_generation_prompt
+from agentforge.core import (
+    executor,
+    output_writer,
+    prompt_budget,
+    repo_analyzer,
+    spec_parser,
+    tracing,
+)
+from agentforge.core.json_stream import AgentArrayParser
+from agentforge.core.output_writer import WriteSummary
+from agentforge.core.prompt_builder import (
+    PROMPT_TEMPLATE_VERSION,
+    build_agent_generation_prompt,
+)
 
 
 _REQUIRED_FIELDS = {"name", "role", "responsibilities", "constraints"}
 _OPTIONAL_FIELDS = {"exclusions", "communication_style"}
+_LIST_FIELDS = {"responsibilities", "constraints", "exclusions"}
 _TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "templates" / "agent.md.j2"
 
+AGENTS_FILE = "agents.json"
+FINGERPRINT_FILE = ".agentforge-fingerprint"
 
-def generate_agents(spec: dict, repo_meta: dict) -> list[dict]:
-    prompt = build_agent_generation_prompt(spec, repo_meta)
-    response = executor.execute(prompt)
+_compiled_template: tuple[int, object] | None = None
+
+
+def generate_agents(
+    spec: dict,
+    repo_meta: dict,
+    on_agent: Callable[[dict], None] | None = None,
+    sharded: bool = False,
+    jobs: int = 4,
+) -> list[dict]:
+    """Generate normalized agents for ``spec``.
 
-    parsed = json.loads(response)
-    agents = parsed.get("agents") if isinstance(parsed, dict) else parsed
-    if not isinstance(agents, list):
-        raise ValueError("Expected a JSON array of agents or an object with 'agents'.")
+    With ``sharded``, the spec is split by agent entry (see ``spec_parser.split_spec``),
+    up to ``jobs`` shards are sent to codex concurrently, and overlapping
+    candidate agents are merged before normalization.
+    """
+    if sharded:
+        shards = spec_parser.split_spec(spec)
+        if len(shards) > 1:
+            return _generate_sharded(shards, repo_meta, on_agent, jobs)
+
+    prompt = build_agent_generation_prompt(spec, repo_meta)
+    parser = AgentArrayParser()
 
     normalized: list[dict] = []
-    for agent in agents:
-        if not isinstance(agent, dict):
-            raise ValueError("Each agent must be a JSON object.")
-        normalized.append(_normalize_agent(agent))
+    for chunk in executor.stream_execute(prompt):
+        with tracing.span("parse_agents"):
+            agents = [_normalize_agent(agent) for agent in parser.feed(chunk)]
+        for agent in agents:
+            normalized.append(agent)
+            if on_agent is not None:
+                on_agent(agent)
+    parser.close()
 
     return normalized
 
 
-def generate_agent_files(spec_path: str, repo_root: str, output_dir: str) -> list[dict]:
+def _generate_sharded(
+    shards: list[dict],
+    repo_meta: dict,
+    on_agent: Callable[[dict], None] | None,
+    jobs: int,
+) -> list[dict]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1.")
+    with ThreadPoolExecutor(max_workers=min(jobs, len(shards))) as pool:
+        candidates = list(pool.map(lambda shard: _shard_candidates(shard, repo_meta), shards))
+
+    with tracing.span("merge_agents") as span:
+        merged = _merge_agents([agent for shard in candidates for agent in shard])
+        normalized = [_normalize_agent(agent) for agent in merged]
+        if span:
+            span.set(candidates=sum(len(shard) for shard in candidates))
+    if on_agent is not None:
+        for agent in normalized:
+            on_agent(agent)
+    return normalized
+
+
+def _shard_candidates(shard: dict, repo_meta: dict) -> list[dict]:
+    prompt = build_agent_generation_prompt(shard, repo_meta)
+    parser = AgentArrayParser()
+    candidates: list[dict] = []
+    for chunk in executor.stream_execute(prompt):
+        with tracing.span("parse_agents"):
+            candidates.extend(parser.feed(chunk))
+    parser.close()
+    return candidates
+
+
+def _merge_agents(candidates: list[dict]) -> list[dict]:
+    """Fold candidates that share a name or a near-identical role into one agent.
+
+    List fields are unioned (first wording wins); text fields keep the first
+    non-empty value. Candidates without a usable name pass through unchanged.
+    """
+    merged: list[dict] = []
+    by_name: dict[str, dict] = {}
+    roles: list[tuple[set[str], dict]] = []
+    for candidate in candidates:
+        name = candidate.get("name")
+        if not isinstance(name, str) or not name.strip():
+            merged.append(candidate)
+            continue
+        role_words = _role_words(candidate.get("role"))
+        target = by_name.get(output_writer.slugify(name))
+        if target is None and role_words:
+            target = next(
+                (agent for words, agent in roles if _overlap(words, role_words) >= 0.6),
+                None,
+            )
+        if target is None:
+            target = dict(candidate)
+            merged.append(target)
+            roles.append((role_words, target))
+        else:
+            _merge_into(target, candidate)
+        by_name.setdefault(output_writer.slugify(name), target)
+    return merged
+
+
+def _merge_into(target: dict, candidate: dict) -> None:
+    for field, value in candidate.items():
+        current = target.get(field)
+        if field in _LIST_FIELDS:
+            items: dict[str, str] = {}
+            for item in _candidate_items(current) + _candidate_items(value):
+                items.setdefault(item.casefold(), item)
+            target[field] = list(items.values())
+        elif current is None or (isinstance(current, str) and not current.strip()):
+            target[field] = value
+
+
+def _candidate_items(value: object) -> list[str]:
+    if isinstance(value, str):
+        return _split_list_text(value)
+    if isinstance(value, list):
+        return [item.strip() for item in value if isinstance(item, str) and item.strip()]
+    return []
+
+
+def _role_words(role: object) -> set[str]:
+    if not isinstance(role, str):
+        return set()
+    return {word for word in re.findall(r"[a-z0-9]+", role.lower()) if len(word) > 2}
+
+
+def _overlap(left: set[str], right: set[str]) -> float:
+    return len(left & right) / len(left | right)
+
+
+def generate_agent_files(
+    spec_path: str,
+    repo_root: str,
+    output_dir: str,
+    repo_meta: dict | None = None,
+    force: bool = False,
+    prune: bool = False,
+    on_write: Callable[[WriteSummary], None] | None = None,
+    sharded: bool = False,
+    jobs: int = 4,
+) -> list[dict]:
+    """Generate agents into ``output_dir``, writing ``agents.json`` and one agent.md each.
+
+    The output directory keeps a fingerprint of the spec, repository metadata, and
+    prompt/agent templates. When it matches, the existing ``agents.json`` is
+    returned without calling codex; ``force`` regenerates regardless.
+
+    Agents are rendered as codex streams them but only written once the whole
+    array has parsed, and unchanged files are not rewritten. ``prune`` removes
+    agent directories that are no longer generated; ``on_write`` receives the
+    written/unchanged/removed counts. ``sharded`` and ``jobs`` are passed to
+    ``generate_agents``.
+    """
     spec = spec_parser.parse_spec(spec_path)
-    repo_meta = repo_analyzer.analyze_repo(repo_root)
-    agents = generate_agents(spec, repo_meta)
+    if repo_meta is None:
+        repo_meta = repo_analyzer.analyze_repo(repo_root)
     output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    _render_agent_files(agents, output_path)
+    fingerprint = generation_fingerprint(spec, repo_meta, sharded)
+    fingerprint_path = output_path / FINGERPRINT_FILE
+    if not force:
+        existing = _load_fingerprinted_agents(output_path, fingerprint)
+        if existing is not None:
+            return existing
+
+    renderer = _AgentFileRenderer()
+    agents = generate_agents(
+        spec, repo_meta, on_agent=renderer.render, sharded=sharded, jobs=jobs
+    )
+    renderer.files[AGENTS_FILE] = (
+        json.dumps(agents, indent=2, sort_keys=True, ensure_ascii=True) + "\n"
+    )
+    # Drop the old fingerprint first so an interrupted write is never reused.
+    fingerprint_path.unlink(missing_ok=True)
+    with tracing.span("write_agents") as span:
+        summary = output_writer.write_files(output_path, renderer.files, prune=prune)
+        if span:
+            span.set(written=summary.written, unchanged=summary.unchanged)
+    fingerprint_path.write_text(fingerprint + "\n", encoding="utf-8")
+    if on_write is not None:
+        on_write(summary)
     return agents
 
 
-def _render_agent_files(agents: list[dict], output_path: Path) -> None:
-    template = _load_template()
-    used_slugs: set[str] = set()
+def generation_fingerprint(spec: dict, repo_meta: dict, sharded: bool = False) -> str:
+    digest = hashlib.sha256()
+    payload = {
+        "spec": spec,
+        "repo_meta": repo_meta,
+        "prompt_template_version": PROMPT_TEMPLATE_VERSION,
+        "prompt_settings": prompt_budget.settings(),
+    }
+    if sharded:
+        payload["sharded"] = True
+    digest.update(json.dumps(payload, sort_keys=True, ensure_ascii=True).encode("utf-8"))
+    digest.update(_TEMPLATE_PATH.read_bytes())
+    return digest.hexdigest()
+
+
+def _load_fingerprinted_agents(output_path: Path, fingerprint: str) -> list[dict] | None:
+    try:
+        stored = (output_path / FINGERPRINT_FILE).read_text(encoding="utf-8").strip()
+        if stored != fingerprint:
+            return None
+        agents = json.loads((output_path / AGENTS_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return agents if isinstance(agents, list) else None
+
+
+def _render_agent_files(
+    agents: list[dict], output_path: Path, prune: bool = False
+) -> WriteSummary:
+    renderer = _AgentFileRenderer()
     for agent in agents:
-        slug = _unique_slug(_slugify(agent.get("name", "")), used_slugs)
-        used_slugs.add(slug)
-        agent_dir = output_path / slug
-        agent_dir.mkdir(parents=True, exist_ok=True)
-        rendered = template.render(_build_template_context(agent))
-        (agent_dir / "agent.md").write_text(rendered.rstrip() + "\n", encoding="utf-8")
+        renderer.render(agent)
+    return output_writer.write_files(output_path, renderer.files, prune=prune)
+
+
+class _AgentFileRenderer:
+    """Renders agent.md text one agent at a time, keeping slugs unique across a run."""
+
+    def __init__(self) -> None:
+        self.used_slugs: set[str] = set()
+        self.files: dict[str, str] = {}
+        self._template = None
+
+    def render(self, agent: dict) -> str:
+        with tracing.span("render_agent") as span:
+            if self._template is None:
+                self._template = _load_template()
+            slug = output_writer.unique_slug(
+                output_writer.slugify(agent.get("name", "")), self.used_slugs
+            )
+            self.used_slugs.add(slug)
+            rendered = self._template.render(_build_template_context(agent)).rstrip() + "\n"
+            relative = f"{slug}/{output_writer.AGENT_FILE}"
+            self.files[relative] = rendered
+            if span:
+                span.set(output_bytes=len(rendered.encode("utf-8")))
+        return relative
+
+
+def warm_template() -> None:
+    """Compile the agent template ahead of time (used by ``agentforge serve``)."""
+    try:
+        _load_template()
+    except RuntimeError:
+        pass
 
 
 def _load_template():
+    global _compiled_template
     try:
         from jinja2 import Environment, BaseLoader
     except ImportError as exc:
         raise RuntimeError("Jinja2 is required to render agent templates.") from exc
 
+    # Recompile only when the template file changes.
+    mtime_ns = _TEMPLATE_PATH.stat().st_mtime_ns
+    if _compiled_template is not None and _compiled_template[0] == mtime_ns:
+        return _compiled_template[1]
     template_text = _TEMPLATE_PATH.read_text(encoding="utf-8")
     env = Environment(loader=BaseLoader(), autoescape=False)
-    return env.from_string(template_text)
+    template = env.from_string(template_text)
+    _compiled_template = (mtime_ns, template)
+    return template
 
 
 def _build_template_context(agent: dict) -> dict:
@@ -165,18 +402,3 @@ def _format_section(value: object) -> str:
     if value is None:
         return ""
     return str(value).strip()
-
-
-def _slugify(value: str) -> str:
-    cleaned = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower())
-    cleaned = cleaned.strip("-")
-    return cleaned or "agent"
-
-
-def _unique_slug(slug: str, used: set[str]) -> str:
-    if slug not in used:
-        return slug
-    suffix = 2
-    while f"{slug}-{suffix}" in used:
-        suffix += 1
-    return f"{slug}-{suffix}"
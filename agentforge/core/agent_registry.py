@@ -0,0 +1,352 @@
+"""SQLite index of generated agents, so ``run --agent`` can take a name.
+
+Agent directories (``<root>/<slug>/agent.md``) are indexed by slug, agent
+name and role. Roots are the ``generate --output-dir`` directories the CLI
+registers plus those listed in ``AGENTFORGE_AGENT_PATH``. Lookups are answered
+from the index and only the matched agent files and their roots are checked
+against disk; a stale match re-reads its root. A miss rechecks root mtimes, which every
+regeneration changes because ``agents.json`` is replaced atomically, and a
+changed root only re-reads the agent files whose mtime or size changed.
+``AGENTFORGE_AGENT_RESCAN=1`` rescans every root before the lookup.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import threading
+
+from agentforge.core import cache, output_writer
+
+
+REGISTRY_FILE = "agents.sqlite"
+SCHEMA_VERSION = 1
+# The name and role headings sit near the top of agent.md.
+_HEADER_BYTES = 16 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    registered INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS agents (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    role TEXT NOT NULL,
+    role_key TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS agents_root ON agents (root);
+CREATE INDEX IF NOT EXISTS agents_slug ON agents (slug);
+CREATE INDEX IF NOT EXISTS agents_name ON agents (name_key);
+CREATE INDEX IF NOT EXISTS agents_role ON agents (role_key);
+"""
+
+_LOOKUPS = (
+    ("slug", lambda reference: reference),
+    ("name_key", lambda reference: _key(reference)),
+    ("slug", lambda reference: output_writer.slugify(reference)),
+    ("role_key", lambda reference: _key(reference)),
+)
+
+
+def default_registry_path() -> Path:
+    value = os.environ.get("AGENTFORGE_REGISTRY")
+    return Path(value) if value else cache.default_cache_root() / REGISTRY_FILE
+
+
+def search_roots() -> list[str]:
+    value = os.environ.get("AGENTFORGE_AGENT_PATH", "")
+    return [_normalize_root(part) for part in value.split(os.pathsep) if part.strip()]
+
+
+class AgentRegistry:
+    __slots__ = ("path", "_connection", "_pid", "_lock", "_searched")
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # The AGENTFORGE_AGENT_PATH roots last synced into the index.
+        self._searched = None
+
+    def register(self, root: str | Path) -> None:
+        """Add ``root`` (a ``generate --output-dir``) to the index."""
+        self._locked(self._refresh_root, _normalize_root(root), True)
+
+    def resolve(self, reference: str) -> str:
+        """Return the agent.md path for an agent slug, name or role.
+
+        Slugs win over names and names over roles. When agents in several roots
+        match, the root holding (or inside) the working directory wins, then the
+        most recently generated one. Raises ValueError when the reference
+        matches nothing or more than one agent of that root.
+        """
+        paths = self._locked(self._resolve, reference)
+        if not paths:
+            raise ValueError(
+                f"Unknown agent: {reference!r}. Pass a path to agent.md, or register its "
+                "directory with 'generate --output-dir' or AGENTFORGE_AGENT_PATH."
+            )
+        if len(paths) > 1:
+            listed = ", ".join(paths[:5])
+            raise ValueError(
+                f"Agent reference {reference!r} is ambiguous ({listed}); pass a path instead."
+            )
+        return paths[0]
+
+    def agents(self) -> list[dict]:
+        rows = self._locked(self._list)
+        return [{"path": row[0], "slug": row[1], "name": row[2], "role": row[3]} for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _locked(self, function, *args):
+        import sqlite3
+
+        with self._lock:
+            try:
+                return function(*args)
+            except sqlite3.Error as exc:
+                raise RuntimeError(f"Agent registry {self.path} failed: {exc}") from exc
+
+    def _resolve(self, reference: str) -> list[str]:
+        if os.environ.get("AGENTFORGE_AGENT_RESCAN") == "1":
+            self._refresh(force=True)
+        else:
+            self._sync_search_roots()
+        rows = self._lookup(reference)
+        if not rows:
+            # New or regenerated agents change their root's mtime.
+            self._refresh()
+            rows = self._lookup(reference)
+        rows = _preferred(rows)
+        stale = [row[1] for row in rows if not self._is_current(*row)]
+        if stale:
+            # Edited in place, or its root changed, since it was indexed.
+            self._refresh_root(stale[0], False, force=True)
+            rows = _preferred(self._lookup(reference))
+        return [row[0] for row in rows]
+
+    def _list(self) -> list[tuple]:
+        self._refresh(force=True)
+        return self._execute(
+            "SELECT path, slug, name, role FROM agents ORDER BY root, slug"
+        ).fetchall()
+
+    def _lookup(self, reference: str) -> list[tuple[str, str, int]]:
+        reference = reference.strip()
+        for column, transform in _LOOKUPS:
+            rows = self._execute(
+                "SELECT agents.path, agents.root, roots.mtime_ns FROM agents "
+                f"JOIN roots ON roots.path = agents.root WHERE agents.{column} = ? "
+                "ORDER BY agents.path",
+                (transform(reference),),
+            ).fetchall()
+            if rows:
+                return rows
+        return []
+
+    def _is_current(self, path: str, root: str, root_mtime_ns: int) -> bool:
+        row = self._execute("SELECT mtime_ns, size FROM agents WHERE path = ?", (path,)).fetchone()
+        try:
+            stat = os.stat(path)
+            root_stat = os.stat(root)
+        except OSError:
+            return False
+        return (
+            row is not None
+            and (row[0], row[1]) == (stat.st_mtime_ns, stat.st_size)
+            and root_stat.st_mtime_ns == root_mtime_ns
+        )
+
+    def _sync_search_roots(self) -> None:
+        """Index new AGENTFORGE_AGENT_PATH roots and drop the ones it no longer lists."""
+        searched = search_roots()
+        if searched == self._searched:
+            return
+        for (root,) in self._execute("SELECT path FROM roots WHERE registered = 0").fetchall():
+            if root not in searched:
+                self._drop_root(root)
+        for root in searched:
+            if self._execute("SELECT 1 FROM roots WHERE path = ?", (root,)).fetchone() is None:
+                self._refresh_root(root, False)
+        self._searched = searched
+
+    def _refresh(self, force: bool = False) -> None:
+        roots = dict(self._execute("SELECT path, registered FROM roots").fetchall())
+        searched = search_roots()
+        for root, registered in roots.items():
+            # Roots that only came from AGENTFORGE_AGENT_PATH leave with it.
+            if not registered and root not in searched:
+                self._drop_root(root)
+        active = [root for root, registered in roots.items() if registered]
+        for root in dict.fromkeys([*active, *searched]):
+            self._refresh_root(root, bool(roots.get(root)), force=force)
+        self._searched = searched
+
+    def _refresh_root(self, root: str, registered: bool, force: bool = False) -> None:
+        connection = self._connect()
+        try:
+            mtime_ns = os.stat(root).st_mtime_ns
+        except OSError:
+            self._drop_root(root)
+            return
+        row = connection.execute(
+            "SELECT mtime_ns, registered FROM roots WHERE path = ?", (root,)
+        ).fetchone()
+        registered = registered or bool(row and row[1])
+        if row is not None and row == (mtime_ns, registered) and not force:
+            return
+        indexed = {
+            path: (mtime, size)
+            for path, mtime, size in connection.execute(
+                "SELECT path, mtime_ns, size FROM agents WHERE root = ?", (root,)
+            )
+        }
+        updates = []
+        for path, slug, stat in _agent_files(root):
+            if indexed.pop(path, None) == (stat.st_mtime_ns, stat.st_size):
+                continue
+            try:
+                name, role = _read_headings(path)
+            except OSError:
+                continue
+            updates.append(
+                (
+                    path,
+                    root,
+                    slug,
+                    name or slug,
+                    _key(name or slug),
+                    role,
+                    _key(role),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+            )
+        with connection:
+            connection.executemany(
+                "DELETE FROM agents WHERE path = ?", [(path,) for path in indexed]
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", updates
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO roots VALUES (?, ?, ?)", (root, mtime_ns, registered)
+            )
+
+    def _drop_root(self, root: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM roots WHERE path = ?", (root,))
+            connection.execute("DELETE FROM agents WHERE root = ?", (root,))
+
+    def _execute(self, sql: str, parameters: tuple = ()):
+        return self._connect().execute(sql, parameters)
+
+    def _connect(self):
+        # SQLite connections must not cross a fork (``agentforge serve``).
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        import sqlite3
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            connection = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                connection.executescript(
+                    "DROP TABLE IF EXISTS agents; DROP TABLE IF EXISTS roots;"
+                )
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.executescript(_SCHEMA)
+        except sqlite3.Error as exc:
+            raise RuntimeError(f"Could not open the agent registry {self.path}: {exc}") from exc
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+
+_registries: dict[Path, AgentRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry() -> AgentRegistry:
+    """The registry at ``default_registry_path()``, shared within the process."""
+    path = default_registry_path()
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = _registries[path] = AgentRegistry(path)
+        return registry
+
+
+def resolve(reference: str) -> str:
+    return get_registry().resolve(reference)
+
+
+def register(root: str | Path) -> None:
+    get_registry().register(root)
+
+
+def _preferred(rows: list[tuple[str, str, int]]) -> list[tuple[str, str, int]]:
+    """The rows from the root nearest the working directory, else the newest root."""
+    if len({row[1] for row in rows}) < 2:
+        return rows
+    cwd = os.getcwd()
+
+    def rank(row: tuple[str, str, int]) -> tuple[bool, int]:
+        root = row[1]
+        return (_contains(root, cwd) or _contains(cwd, root), row[2] or 0)
+
+    best = max(rank(row) for row in rows)
+    return [row for row in rows if rank(row) == best]
+
+
+def _contains(parent: str, path: str) -> bool:
+    return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+def _agent_files(root: str):
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            path = os.path.join(entry.path, output_writer.AGENT_FILE)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield path, entry.name, stat
+
+
+def _read_headings(path: str) -> tuple[str, str]:
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        text = handle.read(_HEADER_BYTES)
+    sections: dict[str, str] = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("## "):
+            current = line[3:].strip().lower()
+            continue
+        if current in ("agent name", "role") and current not in sections and line.strip():
+            sections[current] = line.strip()
+    return sections.get("agent name", ""), sections.get("role", "")
+
+
+def _normalize_root(root: str | Path) -> str:
+    return os.path.abspath(os.path.expanduser(str(root).strip()))
+
+
+def _key(value: str) -> str:
+    return " ".join(value.split()).casefold()
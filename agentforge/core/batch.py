@@ -0,0 +1,197 @@
+"""JSONL batch execution of agent tasks for AgentForge."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO
+import hashlib
+import json
+
+from agentforge.core import executor
+
+
+Runner = Callable[[str, str, dict], str]
+
+
+@dataclass
+class BatchTask:
+    key: str
+    line: int
+    agent: str = ""
+    task: str = ""
+    context: dict = field(default_factory=dict)
+    error: str | None = None
+
+
+@dataclass
+class BatchSummary:
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+def run_batch(
+    lines: Iterable[str],
+    output: IO[str],
+    jobs: int = 1,
+    ordered: bool = False,
+    checkpoint_path: str | None = None,
+    runner: Runner | None = None,
+) -> BatchSummary:
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1.")
+    run = runner or executor.run_with_agent
+    completed = load_checkpoint(checkpoint_path) if checkpoint_path else set()
+    checkpoint = (
+        open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    )
+    summary = BatchSummary()
+    # Results waiting to be written; in ordered mode they wait for earlier tasks.
+    pending_results: dict[int, tuple[BatchTask, dict]] = {}
+    in_flight: dict[Future, tuple[int, BatchTask]] = {}
+    window = jobs * 2
+    next_to_emit = 0
+    sequence = 0
+
+    def emit_ready() -> None:
+        nonlocal next_to_emit
+        if ordered:
+            while next_to_emit in pending_results:
+                _emit(*pending_results.pop(next_to_emit), output, checkpoint, summary)
+                next_to_emit += 1
+        else:
+            for seq in list(pending_results):
+                _emit(*pending_results.pop(seq), output, checkpoint, summary)
+
+    def collect(block_until_one: bool) -> None:
+        if not in_flight:
+            return
+        done, _ = wait(
+            in_flight,
+            timeout=None if block_until_one else 0,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            seq, task = in_flight.pop(future)
+            pending_results[seq] = (task, _result_record(task, future))
+        emit_ready()
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for task in iter_tasks(lines):
+                if task.key in completed:
+                    summary.skipped += 1
+                    continue
+                while len(in_flight) + len(pending_results) >= window:
+                    collect(block_until_one=True)
+
+                seq = sequence
+                sequence += 1
+                if task.error is not None:
+                    pending_results[seq] = (task, _error_record(task, task.error))
+                    emit_ready()
+                    continue
+                future = pool.submit(run, task.agent, task.task, task.context)
+                in_flight[future] = (seq, task)
+                collect(block_until_one=False)
+
+            while in_flight:
+                collect(block_until_one=True)
+            emit_ready()
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    return summary
+
+
+def iter_tasks(lines: Iterable[str]) -> Iterator[BatchTask]:
+    for line_number, raw_line in enumerate(lines, start=1):
+        stripped = raw_line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        yield _parse_task(stripped, line_number)
+
+
+def load_checkpoint(path: str) -> set[str]:
+    checkpoint = Path(path)
+    if not checkpoint.exists():
+        return set()
+    return {
+        line.strip()
+        for line in checkpoint.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    }
+
+
+def _parse_task(text: str, line_number: int) -> BatchTask:
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        return BatchTask(key=key, line=line_number, error=f"Invalid JSON: {exc}")
+    if not isinstance(data, dict):
+        return BatchTask(key=key, line=line_number, error="Expected a JSON object.")
+
+    task_id = data.get("id")
+    if task_id is not None:
+        key = str(task_id)
+    task = BatchTask(key=key, line=line_number)
+
+    agent = data.get("agent")
+    if not isinstance(agent, str) or not agent:
+        task.error = "Field 'agent' must be a non-empty string."
+        return task
+    task.agent = agent
+
+    if "task_file" in data:
+        try:
+            task.task = Path(data["task_file"]).read_text(encoding="utf-8-sig")
+        except (OSError, TypeError) as exc:
+            task.error = f"Unable to read task_file: {exc}"
+            return task
+    elif isinstance(data.get("task"), str):
+        task.task = data["task"]
+    else:
+        task.error = "Provide 'task' text or a 'task_file' path."
+        return task
+
+    context = data.get("context", {})
+    if not isinstance(context, dict):
+        task.error = "Field 'context' must be a JSON object."
+        return task
+    task.context = context
+    return task
+
+
+def _result_record(task: BatchTask, future: Future) -> dict:
+    try:
+        result = future.result()
+    except (OSError, ValueError, RuntimeError) as exc:
+        return _error_record(task, str(exc))
+    return {"id": task.key, "line": task.line, "status": "ok", "result": result}
+
+
+def _error_record(task: BatchTask, message: str) -> dict:
+    return {"id": task.key, "line": task.line, "status": "error", "error": message}
+
+
+def _emit(
+    task: BatchTask,
+    record: dict,
+    output: IO[str],
+    checkpoint: IO[str] | None,
+    summary: BatchSummary,
+) -> None:
+    output.write(json.dumps(record, ensure_ascii=True) + "\n")
+    output.flush()
+    if record["status"] != "ok":
+        summary.failed += 1
+        return
+    summary.succeeded += 1
+    if checkpoint is not None:
+        checkpoint.write(task.key + "\n")
+        checkpoint.flush()
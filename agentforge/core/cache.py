@@ -0,0 +1,232 @@
+"""On-disk response cache for codex executions."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+from agentforge.core import singleflight
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+_ENTRY_SUFFIX = ".json"
+_STATS_FILE = "stats.json"
+_VERSIONS_FILE = "codex-versions.json"
+_METADATA_FILES = frozenset({_STATS_FILE, _VERSIONS_FILE})
+# Eviction triggered by ``put`` trims to this fraction of ``max_bytes`` so the
+# directory is not rescanned on every following write.
+_EVICT_LOW_WATER = 0.9
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "evictions")
+
+    def __init__(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+
+
+def default_cache_root() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "agentforge"
+
+
+def default_cache_dir() -> Path:
+    return default_cache_root() / "responses"
+
+
+def make_key(prompt: str, command: list[str], codex_version: str, context: str = "") -> str:
+    """Key for a codex call; ``context`` covers what else codex acts on (cwd, config)."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    for part in (prompt, "\0".join(command), codex_version, context):
+        encoded = part.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.stats = CacheStats()
+        # Estimated bytes on disk, from the last eviction scan plus later puts;
+        # None until the first put scans the directory.
+        self._estimated_bytes: int | None = None
+
+    def get(self, key: str) -> str | None:
+        path = self._entry_path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+
+        if time.time() - stat.st_mtime > self.max_age_seconds:
+            self._remove(path)
+            self.stats.misses += 1
+            return None
+
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            response = payload["response"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self._remove(path)
+            self.stats.misses += 1
+            return None
+
+        # Bump the mtime so eviction treats the entry as recently used.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.stats.hits += 1
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"created": time.time(), "response": response}, ensure_ascii=True)
+        tmp_path = self.directory / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            self._remove(tmp_path)
+            raise
+        if self._estimated_bytes is None:
+            self._trim(self.max_bytes)
+        else:
+            self._estimated_bytes += len(payload)
+            if self._estimated_bytes > self.max_bytes:
+                self._trim(int(self.max_bytes * _EVICT_LOW_WATER))
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used beyond ``max_bytes``."""
+        return self._trim(self.max_bytes)
+
+    def _trim(self, max_bytes: int) -> int:
+        entries: list[tuple[float, int, Path]] = []
+        now = time.time()
+        removed = 0
+        try:
+            scanned = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            self._estimated_bytes = 0
+            return 0
+
+        for entry in scanned:
+            if not entry.name.endswith(_ENTRY_SUFFIX) or entry.name in _METADATA_FILES:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                self._remove(Path(entry.path))
+                removed += 1
+                continue
+            entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+
+        self._estimated_bytes = total
+        self.stats.evictions += removed
+        return removed
+
+    def flush_stats(self) -> dict[str, int]:
+        """Add this instance's counters to the persisted totals and return them."""
+        path = self.directory / _STATS_FILE
+        totals = {"hits": 0, "misses": 0, "evictions": 0}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Other processes flush into the same file; never lose their counts.
+            with self._metadata_lock():
+                stored = _read_json_object(path)
+                for name in totals:
+                    try:
+                        totals[name] = int(stored.get(name, 0))
+                    except (TypeError, ValueError):
+                        pass
+                totals["hits"] += self.stats.hits
+                totals["misses"] += self.stats.misses
+                totals["evictions"] += self.stats.evictions
+                self._write_metadata(path, totals)
+        except OSError:
+            return totals
+        self.stats = CacheStats()
+        return totals
+
+    def stored_version(self, key: str) -> str | None:
+        """Codex version recorded for ``key`` ("<executable>|<stat>")."""
+        version = _read_json_object(self.directory / _VERSIONS_FILE).get(key)
+        return version if isinstance(version, str) else None
+
+    def store_version(self, key: str, version: str) -> None:
+        """Record ``version``, dropping executables that are gone or were replaced."""
+        path = self.directory / _VERSIONS_FILE
+        executable = key.split("|", 1)[0]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._metadata_lock():
+            versions = {
+                stored: value
+                for stored, value in _read_json_object(path).items()
+                if stored.split("|", 1)[0] != executable
+                and os.path.exists(stored.split("|", 1)[0])
+            }
+            versions[key] = version
+            self._write_metadata(path, versions)
+
+    def _metadata_lock(self):
+        if not singleflight.file_locks_supported():
+            import contextlib
+
+            return contextlib.nullcontext()
+        return singleflight.FileLock(self.directory, "metadata")
+
+    def _write_metadata(self, path: Path, data: dict) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(data, sort_keys=True) + "\n", encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            raise
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _read_json_object(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
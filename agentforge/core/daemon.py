@@ -0,0 +1,365 @@
+"""Resident ``agentforge serve`` daemon and the thin client that forwards to it.
+
+The daemon listens on a UNIX socket. A client sends its argv, working
+directory and environment, and passes its stdin/stdout/stderr descriptors
+along. The daemon warms its quick caches for the request, then forks a child
+that runs the command on the client's descriptors and reports the exit code
+back, so slow work such as a repository scan never holds up other clients.
+The child inherits everything the daemon already holds: imported modules,
+parsed specs, the compiled template, resolved codex commands and repository
+snapshots. State the child builds can be sent back over a pipe for the
+daemon to keep. POSIX only.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+import os
+import sys
+
+from agentforge.core import cache
+
+
+SOCKET_NAME = "daemon.sock"
+REAP_INTERVAL_SECONDS = 0.5
+# Time allowed for a client to send its request once connected.
+REQUEST_TIMEOUT_SECONDS = 5.0
+_HEADER_BYTES = 8
+_EXIT_CODE_BYTES = 4
+
+
+def default_socket_path() -> Path:
+    value = os.environ.get("AGENTFORGE_SOCKET")
+    return Path(value) if value else cache.default_cache_root() / SOCKET_NAME
+
+
+def forward(argv: list[str], socket_path: str | Path | None = None) -> int | None:
+    """Run ``argv`` in the daemon and return its exit code.
+
+    Returns None when no daemon is listening, so the caller can run the
+    command itself.
+    """
+    if os.name != "posix":
+        return None
+    path = Path(socket_path) if socket_path else default_socket_path()
+    if not path.exists():
+        return None
+    import json
+    import socket
+
+    if not hasattr(socket, "send_fds"):
+        return None
+    try:
+        for fd in (0, 1, 2):
+            os.fstat(fd)
+    except OSError:
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path))
+    except OSError:
+        # A stale socket file left by a daemon that is gone.
+        client.close()
+        return None
+
+    payload = json.dumps(
+        {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    ).encode("utf-8")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with client:
+        try:
+            socket.send_fds(client, [len(payload).to_bytes(_HEADER_BYTES, "big")], [0, 1, 2])
+            client.sendall(payload)
+            reply = _recv_exactly(client, _EXIT_CODE_BYTES)
+        except OSError as exc:
+            raise RuntimeError(f"Lost the connection to the agentforge daemon: {exc}") from exc
+    if reply is None:
+        raise RuntimeError(
+            "The agentforge daemon closed the connection before the command finished."
+        )
+    return int.from_bytes(reply, "big", signed=True)
+
+
+def serve(
+    socket_path: str | Path,
+    prepare: Callable[[list[str]], object],
+    run: Callable[[list[str], object], int | None],
+    collect: Callable[[], object] | None = None,
+    adopt: Callable[[object], None] | None = None,
+) -> None:
+    """Serve requests on ``socket_path`` until interrupted.
+
+    ``prepare(argv)`` runs in the daemon itself, with the request's working
+    directory and environment, to warm caches and must stay quick; whatever it
+    returns is handed to ``run(argv, prepared)``, which executes the command in
+    a forked child. After the command, the child sends ``collect()`` (JSON) back
+    and the daemon passes it to ``adopt``.
+    """
+    import select
+    import signal
+    import socket
+
+    path = Path(socket_path)
+    _claim_socket_path(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous_umask = os.umask(0o177)
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(previous_umask)
+    server.listen(64)
+    signal.signal(signal.SIGTERM, lambda *_args: sys.exit(0))
+    print(f"agentforge daemon listening on {path}", file=sys.stderr, flush=True)
+    # Read ends of the children's state pipes and what arrived on each so far.
+    results: dict[int, bytearray] = {}
+    try:
+        while True:
+            _reap_children()
+            readable, _writable, _errors = select.select(
+                [server, *results], [], [], REAP_INTERVAL_SECONDS
+            )
+            for fd in readable:
+                if fd is server:
+                    conn, _address = server.accept()
+                    with conn:
+                        result_fd = _handle(conn, server, prepare, run, collect)
+                    if result_fd is not None:
+                        results[result_fd] = bytearray()
+                elif not _read_result(fd, results[fd]):
+                    _adopt(results.pop(fd), adopt)
+                    os.close(fd)
+    finally:
+        server.close()
+        for fd in results:
+            os.close(fd)
+        path.unlink(missing_ok=True)
+
+
+def _claim_socket_path(path: Path) -> None:
+    import socket
+
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        path.unlink(missing_ok=True)
+    else:
+        raise RuntimeError(f"An agentforge daemon is already listening on {path}.")
+    finally:
+        probe.close()
+
+
+def _handle(
+    conn, server, prepare: Callable, run: Callable, collect: Callable | None
+) -> int | None:
+    """Start the request on ``conn``; returns the child's state pipe, if any."""
+    import json
+    import socket
+
+    conn.settimeout(REQUEST_TIMEOUT_SECONDS)
+    fds: list[int] = []
+    try:
+        header, fds, _flags, _address = socket.recv_fds(conn, _HEADER_BYTES, 3)
+        if len(fds) != 3:
+            return
+        rest = _recv_exactly(conn, _HEADER_BYTES - len(header))
+        if rest is None:
+            return
+        payload = _recv_exactly(conn, int.from_bytes(header + rest, "big"))
+        if payload is None:
+            return
+        request = json.loads(payload)
+        argv, cwd, env = request["argv"], request["cwd"], request["env"]
+    except (OSError, ValueError, KeyError, TypeError):
+        for fd in fds:
+            os.close(fd)
+        return None
+
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    result_fd = write_fd = None
+    try:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+        try:
+            prepared = prepare(argv)
+        except Exception:  # Warming is best effort; the child reports real errors.
+            prepared = None
+        if collect is not None:
+            result_fd, write_fd = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        if os.fork() == 0:
+            try:
+                if result_fd is not None:
+                    os.close(result_fd)
+                _run_child(conn, server, fds, argv, prepared, run, collect, write_fd)
+            finally:
+                # The child must never return into the accept loop.
+                os._exit(1)
+    except OSError as exc:
+        os.write(fds[2], f"Error: {exc}\n".encode("utf-8", errors="replace"))
+        _send_exit_code(conn, 1)
+        if result_fd is not None:
+            os.close(result_fd)
+            result_fd = None
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        for fd in fds:
+            os.close(fd)
+        if write_fd is not None:
+            os.close(write_fd)
+    return result_fd
+
+
+def _run_child(
+    conn,
+    server,
+    fds: list[int],
+    argv: list[str],
+    prepared: object,
+    run: Callable,
+    collect: Callable | None,
+    write_fd: int | None,
+) -> None:
+    import signal
+    import threading
+
+    code = 1
+    try:
+        server.close()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        for fd in fds:
+            if fd > 2:
+                os.close(fd)
+        sys.stdin = open(0, encoding="utf-8", closefd=False)
+        # Line-buffer like an interactive process when the client is on a terminal.
+        sys.stdout = open(
+            1, "w", buffering=1 if os.isatty(1) else -1, encoding="utf-8", closefd=False
+        )
+        sys.stderr = open(
+            2, "w", buffering=1, encoding="utf-8", errors="backslashreplace", closefd=False
+        )
+        conn.settimeout(None)
+        threading.Thread(target=_watch_client, args=(conn,), daemon=True).start()
+        code = _exit_code(run, argv, prepared)
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        # Once the client has its exit code it disconnects, which would make
+        # _watch_client interrupt this thread on its way out.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+        _send_exit_code(conn, code)
+        if write_fd is not None:
+            _send_result(write_fd, collect)
+        os._exit(code & 0xFF)
+
+
+def _exit_code(run: Callable, argv: list[str], prepared: object) -> int:
+    try:
+        result = run(argv, prepared)
+    except SystemExit as exc:
+        if exc.code is None:
+            return 0
+        if isinstance(exc.code, int):
+            return exc.code
+        print(exc.code, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        return 1
+    return result or 0
+
+
+def _watch_client(conn) -> None:
+    """Interrupt the command if the client goes away (e.g. on Ctrl-C)."""
+    import signal
+
+    try:
+        data = conn.recv(1)
+    except OSError:
+        data = b""
+    if not data:
+        os.kill(os.getpid(), signal.SIGINT)
+
+
+def _send_result(write_fd: int, collect: Callable) -> None:
+    import json
+
+    try:
+        data = json.dumps(collect(), separators=(",", ":")).encode("utf-8")
+        with open(write_fd, "wb") as pipe:
+            pipe.write(data)
+    except Exception:  # The daemon only loses a cache entry.
+        pass
+
+
+def _read_result(fd: int, buffer: bytearray) -> bool:
+    """Append what is available on ``fd``; False once the child closed it."""
+    try:
+        chunk = os.read(fd, 1 << 16)
+    except OSError:
+        return False
+    buffer += chunk
+    return bool(chunk)
+
+
+def _adopt(data: bytearray, adopt: Callable | None) -> None:
+    import json
+
+    if not data or adopt is None:
+        return
+    try:
+        adopt(json.loads(data))
+    except Exception:  # Keeping a child's state is best effort.
+        pass
+
+
+def _send_exit_code(conn, code: int) -> None:
+    try:
+        conn.sendall(code.to_bytes(_EXIT_CODE_BYTES, "big", signed=True))
+    except OSError:
+        pass
+
+
+def _recv_exactly(conn, size: int) -> bytes | None:
+    chunks = []
+    while size:
+        chunk = conn.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _reap_children() -> None:
+    while True:
+        try:
+            pid, _status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
@@ -3,53 +3,926 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterator
+from functools import lru_cache
 from pathlib import Path
-import shutil
-import json
+import codecs
 import os
 import subprocess
+import threading
+import time
+
+from agentforge.core import cache as response_cache
+from agentforge.core import latency, process_group, prompt_budget, singleflight, tracing
+from agentforge.core.process_group import ResourceUsage
+
+# Type checkers treat this as True; importing typing for it would slow startup.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # Imported lazily at runtime; ``agentforge run`` should not pay for asyncio.
+    import asyncio
 
 
 DEFAULT_TIMEOUT_SECONDS = 300
+VERSION_TIMEOUT_SECONDS = 10
+STREAM_CHUNK_BYTES = 64 * 1024
+# Streamed responses larger than this are not kept in memory for the cache.
+STREAM_CACHE_LIMIT_BYTES = 1024 * 1024
+_STDERR_TAIL_BYTES = 64 * 1024
+_LOCK_POLL_SECONDS = 0.05
+# Agent definitions kept in memory by read_agent; batch and daemon runs reuse them.
+AGENT_TEXT_CACHE_ENTRIES = 256
 
+_UsageCallback = Callable[[ResourceUsage], None] | None
 
-def execute(prompt: str, timeout: int = DEFAULT_TIMEOUT_SECONDS) -> str:
-    executable = os.environ.get("AGENTFORGE_CODEX_PATH") or "codex"
-    command = _build_command(executable) + ["exec", "-"]
-    try:
-        result = subprocess.run(
-            command,
-            input=prompt,
-            text=True,
-            encoding="utf-8",
-            capture_output=True,
-            check=True,
-            timeout=timeout,
-        )
-    except FileNotFoundError as exc:
-        if executable == "codex":
-            message = (
-                "Codex executable not found on PATH. Install the Codex CLI and "
-                "ensure it is available in PATH, or set AGENTFORGE_CODEX_PATH."
+_caches: dict[str, response_cache.ResponseCache] = {}
+# Resolved codex commands by (executable, PATH); None unless ``enable_memo`` was called.
+_command_memo: dict[tuple[str, str], list[str]] | None = None
+_flights = singleflight.SingleFlight()
+# Agent path -> ((mtime_ns, size), text), least recently used first.
+_agent_texts: OrderedDict[str, tuple[tuple[int, int], str]] = OrderedDict()
+_agent_texts_lock = threading.Lock()
+
+
+def execute(
+    prompt: str,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    use_cache: bool = True,
+    on_usage: Callable[[ResourceUsage], None] | None = None,
+) -> str:
+    """Run codex on ``prompt`` and return its stdout.
+
+    ``on_usage`` is called with the CPU time and peak RSS of each codex process
+    this call started (two when a hedge attempt runs; none on a cache hit).
+    """
+    with tracing.span("codex_exec") as span:
+        invocation = _prepare_invocation(prompt, use_cache)
+        cached = _cache_lookup(invocation)
+        shared = False
+        if cached is not None:
+            stdout = cached
+        else:
+            report = _usage_reporter(span or None, on_usage)
+            # Identical concurrent calls share one subprocess and its outcome.
+            stdout, shared = _flights.do(
+                invocation.flight_key, lambda: _execute_once(invocation, timeout, report)
+            )
+        if span:
+            span.set(
+                prompt_bytes=len(prompt.encode("utf-8")),
+                response_bytes=len(stdout.encode("utf-8")),
+                cache_hits=int(cached is not None),
+                coalesced=int(shared),
+            )
+    return stdout
+
+
+def _execute_once(invocation: _Invocation, timeout: int, on_usage: _UsageCallback) -> str:
+    lock_dir = _lock_dir(invocation)
+    if lock_dir is None:
+        return _run_and_store(invocation, timeout, on_usage)
+    with singleflight.FileLock(lock_dir, invocation.flight_key):
+        # Another process may have produced the response while we waited.
+        cached = _cache_lookup(invocation)
+        if cached is not None:
+            return cached
+        return _run_and_store(invocation, timeout, on_usage)
+
+
+def _run_and_store(invocation: _Invocation, timeout: int, on_usage: _UsageCallback) -> str:
+    history = latency.get_history()
+    bucket = latency.bucket_for(len(invocation.prompt.encode("utf-8")))
+    timeout, hedge_after = _latency_policy(history, bucket, timeout)
+    slot = _acquire_slot()
+    try:
+        started = time.monotonic()
+        if hedge_after is None:
+            stdout = _run_codex(
+                invocation.command, invocation.executable, invocation.prompt, timeout, on_usage
             )
         else:
-            message = (
-                "Codex executable not found at AGENTFORGE_CODEX_PATH. "
-                "Update the environment variable or install the Codex CLI."
+            stdout = _run_codex_hedged(
+                invocation.command,
+                invocation.executable,
+                invocation.prompt,
+                timeout,
+                hedge_after,
+                on_usage,
             )
-        raise RuntimeError(message) from exc
-    except subprocess.TimeoutExpired as exc:
-        raise RuntimeError(
-            f"Codex execution exceeded timeout ({timeout}s)."
-        ) from exc
-    except subprocess.CalledProcessError as exc:
-        stderr = (exc.stderr or "").strip()
-        stdout = (exc.stdout or "").strip()
-        detail = stderr or stdout or "No output captured from codex."
-        raise RuntimeError(f"Codex execution failed: {detail}") from exc
+        history.record(bucket, time.monotonic() - started)
+    finally:
+        if slot is not None:
+            slot.release()
+    _cache_store(invocation, stdout)
+    return stdout
+
+
+def _usage_reporter(span: tracing.Span | None, on_usage: _UsageCallback) -> _UsageCallback:
+    """Combine the caller's ``on_usage`` with per-call span attributes."""
+    if span is None and on_usage is None:
+        return None
+
+    # Hedge attempts report from their own threads.
+    lock = threading.Lock()
+
+    def report(usage: ResourceUsage) -> None:
+        if span is not None:
+            with lock:
+                attrs = span.attrs
+                user_ms = round(usage.user_seconds * 1000)
+                system_ms = round(usage.system_seconds * 1000)
+                attrs["cpu_user_ms"] = attrs.get("cpu_user_ms", 0) + user_ms
+                attrs["cpu_system_ms"] = attrs.get("cpu_system_ms", 0) + system_ms
+                attrs["max_rss_kb"] = max(attrs.get("max_rss_kb", 0), usage.max_rss_kb)
+        if on_usage is not None:
+            on_usage(usage)
+
+    return report
+
+
+def _host_governor():
+    # The governor is imported only when a cap is configured.
+    if not os.environ.get("AGENTFORGE_MAX_CONCURRENT"):
+        return None
+    from agentforge.core import governor
+
+    return governor.get_governor()
+
+
+def _acquire_slot():
+    """Wait for a host-wide codex slot when AGENTFORGE_MAX_CONCURRENT is set."""
+    host = _host_governor()
+    if host is None:
+        return None
+    # A separate span keeps queue wait out of codex_exec's self time.
+    with tracing.span("codex_queue") as span:
+        slot = host.acquire()
+        if span:
+            span.set(wait_ms=round(slot.wait_seconds * 1000))
+        return slot
+
+
+async def _acquire_slot_async():
+    host = _host_governor()
+    if host is None:
+        return None
+    with tracing.span("codex_queue") as span:
+        slot = await host.acquire_async()
+        if span:
+            span.set(wait_ms=round(slot.wait_seconds * 1000))
+        return slot
+
+
+def _latency_policy(
+    history: latency.LatencyHistory, bucket: str, timeout: float
+) -> tuple[float, float | None]:
+    """Return the timeout to use and when to start a hedge attempt (None: never)."""
+    if latency.adaptive_timeout_enabled():
+        timeout = history.adaptive_timeout(bucket, timeout)
+    hedge_after = history.hedge_delay(bucket) if latency.hedging_enabled() else None
+    if hedge_after is not None and hedge_after >= timeout:
+        hedge_after = None
+    return timeout, hedge_after
+
+
+async def execute_async(
+    prompt: str,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    use_cache: bool = True,
+    limiter: ConcurrencyLimiter | None = None,
+    on_usage: Callable[[ResourceUsage], None] | None = None,
+) -> str:
+    """Async ``execute``; ``on_usage`` and the ``codex_exec`` span work the same way."""
+    import asyncio
+
+    with tracing.span("codex_exec") as span:
+        invocation = await asyncio.to_thread(_prepare_invocation, prompt, use_cache)
+        cached = _cache_lookup(invocation)
+        shared = False
+        if cached is not None:
+            stdout = cached
+        else:
+            report = _usage_reporter(span or None, on_usage)
+            stdout, shared = await _flights.do_async(
+                invocation.flight_key,
+                lambda: _execute_once_async(invocation, timeout, limiter, report),
+            )
+        if span:
+            span.set(
+                prompt_bytes=len(prompt.encode("utf-8")),
+                response_bytes=len(stdout.encode("utf-8")),
+                cache_hits=int(cached is not None),
+                coalesced=int(shared),
+            )
+    return stdout
+
+
+async def _execute_once_async(
+    invocation: _Invocation,
+    timeout: int,
+    limiter: ConcurrencyLimiter | None,
+    on_usage: _UsageCallback,
+) -> str:
+    import asyncio
+
+    lock_dir = _lock_dir(invocation)
+    lock = singleflight.FileLock(lock_dir, invocation.flight_key) if lock_dir else None
+    if lock is not None:
+        # Poll without blocking so a cancelled caller never strands a held lock.
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(_LOCK_POLL_SECONDS)
+    try:
+        if lock is not None:
+            cached = _cache_lookup(invocation)
+            if cached is not None:
+                return cached
+        if limiter is None:
+            stdout = await _run_governed_async(invocation, timeout, on_usage)
+        else:
+            async with limiter:
+                stdout = await _run_governed_async(invocation, timeout, on_usage)
+        _cache_store(invocation, stdout)
+        return stdout
+    finally:
+        if lock is not None:
+            lock.release()
+
+
+async def _run_governed_async(
+    invocation: _Invocation, timeout: int, on_usage: _UsageCallback
+) -> str:
+    history = latency.get_history()
+    bucket = latency.bucket_for(len(invocation.prompt.encode("utf-8")))
+    timeout, hedge_after = _latency_policy(history, bucket, timeout)
+    slot = await _acquire_slot_async()
+    try:
+        started = time.monotonic()
+        stdout = await _run_codex_async_hedged(invocation, timeout, hedge_after, on_usage)
+        history.record(bucket, time.monotonic() - started)
+    finally:
+        if slot is not None:
+            slot.release()
+    return stdout
+
+
+def stream_execute(
+    prompt: str,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    use_cache: bool = True,
+    on_usage: Callable[[ResourceUsage], None] | None = None,
+) -> Iterator[str]:
+    """Yield codex stdout chunks as they arrive instead of buffering the response."""
+    with tracing.span("codex_exec") as span:
+        if span:
+            span.set(prompt_bytes=len(prompt.encode("utf-8")))
+        response_bytes = 0
+        report = _usage_reporter(span or None, on_usage)
+        for chunk in _stream_codex(prompt, timeout, use_cache, report):
+            if span:
+                response_bytes += len(chunk.encode("utf-8"))
+            yield chunk
+        if span:
+            span.set(response_bytes=response_bytes)
+
+
+def _stream_codex(
+    prompt: str, timeout: int, use_cache: bool, on_usage: _UsageCallback
+) -> Iterator[str]:
+    invocation = _prepare_invocation(prompt, use_cache)
+    cached = _cache_lookup(invocation)
+    if cached is not None:
+        yield cached
+        return
+
+    slot = _acquire_slot()
+    try:
+        yield from _stream_process(invocation, timeout, on_usage)
+    finally:
+        if slot is not None:
+            slot.release()
+
+
+def _stream_process(
+    invocation: _Invocation, timeout: int, on_usage: _UsageCallback
+) -> Iterator[str]:
+    prompt = invocation.prompt
+    try:
+        process = process_group.spawn(invocation.command)
+    except FileNotFoundError as exc:
+        raise RuntimeError(_missing_executable_message(invocation.executable)) from exc
+
+    timed_out = threading.Event()
+
+    def on_timeout() -> None:
+        timed_out.set()
+        process_group.kill_group(process)
+
+    stderr_tail = bytearray()
+    threads = [
+        threading.Thread(target=_feed_stdin, args=(process, prompt), daemon=True),
+        threading.Thread(target=_drain_stderr, args=(process, stderr_tail), daemon=True),
+    ]
+    timer = threading.Timer(timeout, on_timeout)
+    timer.daemon = True
+    for thread in threads:
+        thread.start()
+    timer.start()
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    captured = _CapturedOutput(invocation.cache is not None)
+    try:
+        while True:
+            data = process.stdout.read1(STREAM_CHUNK_BYTES)
+            if not data:
+                break
+            text = decoder.decode(data)
+            captured.add(text, len(data))
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            captured.add(tail, 0)
+            yield tail
+        usage = process_group.wait(process)
+        returncode = process.returncode
+    finally:
+        timer.cancel()
+        if process.returncode is None:
+            process_group.kill_group(process)
+            process_group.wait(process)
+        for thread in threads:
+            thread.join()
+        process.stdout.close()
+
+    if usage is not None and on_usage is not None:
+        on_usage(usage)
+    if timed_out.is_set():
+        raise RuntimeError(f"Codex execution exceeded timeout ({timeout}s).")
+    if returncode:
+        stderr = stderr_tail.decode("utf-8", errors="replace")
+        error = subprocess.CalledProcessError(
+            returncode, invocation.command, stderr=stderr
+        )
+        raise RuntimeError(_failure_message(None, stderr)) from error
+    if captured.parts is not None:
+        _cache_store(invocation, "".join(captured.parts))
+
+
+def execute_to_file(
+    prompt: str,
+    path: str,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    use_cache: bool = True,
+) -> int:
+    """Stream the codex response straight into ``path``; returns characters written."""
+    written = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        for chunk in stream_execute(prompt, timeout, use_cache):
+            handle.write(chunk)
+            written += len(chunk)
+    return written
+
+
+async def stream_execute_async(
+    prompt: str,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    use_cache: bool = True,
+) -> AsyncIterator[str]:
+    import asyncio
+
+    invocation = await asyncio.to_thread(_prepare_invocation, prompt, use_cache)
+    cached = _cache_lookup(invocation)
+    if cached is not None:
+        yield cached
+        return
+
+    slot = await _acquire_slot_async()
+    try:
+        async for chunk in _stream_process_async(invocation, timeout):
+            yield chunk
+    finally:
+        if slot is not None:
+            slot.release()
+
+
+async def _stream_process_async(invocation: _Invocation, timeout: int) -> AsyncIterator[str]:
+    import asyncio
+
+    prompt = invocation.prompt
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *process_group.limited_command(invocation.command),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **process_group.popen_options(),
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError(_missing_executable_message(invocation.executable)) from exc
+
+    async def feed() -> None:
+        try:
+            process.stdin.write(prompt.encode("utf-8"))
+            await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def drain_stderr() -> bytes:
+        tail = bytearray()
+        while chunk := await process.stderr.read(STREAM_CHUNK_BYTES):
+            tail.extend(chunk)
+            del tail[:-_STDERR_TAIL_BYTES]
+        return bytes(tail)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    helpers = [asyncio.ensure_future(feed()), asyncio.ensure_future(drain_stderr())]
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    captured = _CapturedOutput(invocation.cache is not None)
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                data = await asyncio.wait_for(
+                    process.stdout.read(STREAM_CHUNK_BYTES), max(remaining, 0)
+                )
+            except asyncio.TimeoutError as exc:
+                raise RuntimeError(
+                    f"Codex execution exceeded timeout ({timeout}s)."
+                ) from exc
+            if not data:
+                break
+            text = decoder.decode(data)
+            captured.add(text, len(data))
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            captured.add(tail, 0)
+            yield tail
+        await process.wait()
+        stderr = (await helpers[1]).decode("utf-8", errors="replace")
+    finally:
+        await _kill_async(process)
+        for helper in helpers:
+            helper.cancel()
+        await asyncio.gather(*helpers, return_exceptions=True)
+
+    if process.returncode:
+        error = subprocess.CalledProcessError(
+            process.returncode, invocation.command, stderr=stderr
+        )
+        raise RuntimeError(_failure_message(None, stderr)) from error
+    if captured.parts is not None:
+        _cache_store(invocation, "".join(captured.parts))
+
+
+class _CapturedOutput:
+    """Keeps a streamed response for the cache until it grows past the limit."""
+
+    def __init__(self, enabled: bool) -> None:
+        self.parts: list[str] | None = [] if enabled else None
+        self.size = 0
+
+    def add(self, text: str, size: int) -> None:
+        if self.parts is None:
+            return
+        self.size += size
+        if self.size > STREAM_CACHE_LIMIT_BYTES:
+            self.parts = None
+        else:
+            self.parts.append(text)
+
+
+def _feed_stdin(process: subprocess.Popen, prompt: str) -> None:
+    try:
+        process.stdin.write(prompt.encode("utf-8"))
+        process.stdin.close()
+    except (BrokenPipeError, OSError):
+        pass
+
+
+def _drain_stderr(process: subprocess.Popen, tail: bytearray) -> None:
+    while chunk := process.stderr.read1(STREAM_CHUNK_BYTES):
+        tail.extend(chunk)
+        del tail[:-_STDERR_TAIL_BYTES]
+    process.stderr.close()
+
+
+class ConcurrencyLimiter:
+    """Caps the number of codex subprocesses in flight on one event loop."""
+
+    def __init__(self, max_concurrent: int) -> None:
+        import asyncio
+
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1.")
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def __aenter__(self) -> ConcurrencyLimiter:
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+class _Invocation:
+    __slots__ = ("prompt", "executable", "command", "context", "flight_key", "cache", "cache_key")
+
+    def __init__(self, prompt: str, executable: str, command: list[str]) -> None:
+        self.prompt = prompt
+        self.executable = executable
+        self.command = command
+        self.context = _codex_context()
+        self.flight_key = response_cache.make_key(prompt, command, "", self.context)
+        self.cache: response_cache.ResponseCache | None = None
+        self.cache_key: str | None = None
+
+
+def enable_memo() -> None:
+    """Keep resolved codex commands for the life of the process (``agentforge serve``)."""
+    global _command_memo
+    if _command_memo is None:
+        _command_memo = {}
+
+
+def warm() -> None:
+    """Resolve the codex command, and its version when caching, ahead of a call."""
+    _prepare_invocation("", True)
+
+
+def _prepare_invocation(prompt: str, use_cache: bool) -> _Invocation:
+    executable = os.environ.get("AGENTFORGE_CODEX_PATH") or "codex"
+    base_command = _resolve_command(executable)
+    invocation = _Invocation(prompt, executable, base_command + ["exec", "-"])
+
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        invocation.cache = cache
+        invocation.cache_key = response_cache.make_key(
+            prompt,
+            invocation.command,
+            _codex_version(tuple(base_command)),
+            invocation.context,
+        )
+    return invocation
+
+
+def _codex_context() -> str:
+    """What codex acts on besides the prompt: the cwd, CODEX_* settings and its config."""
+    codex_home = os.environ.get("CODEX_HOME") or os.path.join(os.path.expanduser("~"), ".codex")
+    try:
+        stat = os.stat(os.path.join(codex_home, "config.toml"))
+        config = f"{stat.st_mtime_ns}|{stat.st_size}"
+    except OSError:
+        config = ""
+    settings = sorted(
+        f"{name}={value}" for name, value in os.environ.items() if name.startswith("CODEX_")
+    )
+    return "\0".join([os.getcwd(), config, *settings])
+
+
+def _cache_lookup(invocation: _Invocation) -> str | None:
+    if invocation.cache is None or invocation.cache_key is None:
+        return None
+    if _cache_refresh_requested():
+        return None
+    return invocation.cache.get(invocation.cache_key)
+
+
+def _cache_store(invocation: _Invocation, stdout: str) -> None:
+    if invocation.cache is None or invocation.cache_key is None:
+        return
+    try:
+        invocation.cache.put(invocation.cache_key, stdout)
+    except OSError:
+        pass
+
+
+def get_response_cache() -> response_cache.ResponseCache | None:
+    directory = os.environ.get("AGENTFORGE_CACHE_DIR")
+    if not directory:
+        return None
+    cache = _caches.get(directory)
+    if cache is None:
+        cache = response_cache.ResponseCache(
+            directory,
+            max_bytes=_env_number(
+                "AGENTFORGE_CACHE_MAX_BYTES", response_cache.DEFAULT_MAX_BYTES
+            ),
+            max_age_seconds=_env_number(
+                "AGENTFORGE_CACHE_MAX_AGE", response_cache.DEFAULT_MAX_AGE_SECONDS
+            ),
+        )
+        _caches[directory] = cache
+    return cache
+
+
+def _lock_dir(invocation: _Invocation) -> str | None:
+    """Directory for cross-process coalescing locks, if enabled and useful.
+
+    Waiting processes pick up the winner's response from the shared cache, so
+    the locks only apply when the response cache is on.
+    """
+    directory = os.environ.get("AGENTFORGE_LOCK_DIR")
+    if not directory or invocation.cache is None:
+        return None
+    if not singleflight.file_locks_supported():
+        return None
+    return directory
+
+
+def _cache_refresh_requested() -> bool:
+    return os.environ.get("AGENTFORGE_CACHE_REFRESH", "") not in ("", "0")
+
+
+def _env_number(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {value!r}.") from exc
+
+
+@lru_cache(maxsize=None)
+def _codex_version(base_command: tuple[str, ...]) -> str:
+    """The codex version, remembered in the response cache per executable.
+
+    Starting codex (and Node) just to print its version would cost more than
+    a cache hit, so it only runs when the executable's path, mtime or size
+    changed since the version was recorded.
+    """
+    cache = get_response_cache()
+    stamp = _executable_stamp(base_command)
+    if cache is None or stamp is None:
+        return _probe_codex_version(base_command)
+    version = cache.stored_version(stamp)
+    if version is None:
+        version = _probe_codex_version(base_command)
+        if version != "unknown":
+            try:
+                cache.store_version(stamp, version)
+            except OSError:
+                pass
+    return version
+
+
+def _executable_stamp(base_command: tuple[str, ...]) -> str | None:
+    # The script or binary that actually runs is last: [codex], [cmd, /c, codex.cmd], ...
+    import shutil
+
+    target = base_command[-1]
+    resolved = target if os.path.dirname(target) else shutil.which(target)
+    if not resolved:
+        return None
+    try:
+        stat = os.stat(resolved)
+    except OSError:
+        return None
+    return f"{os.path.abspath(resolved)}|{stat.st_mtime_ns}|{stat.st_size}"
+
+
+def _probe_codex_version(base_command: tuple[str, ...]) -> str:
+    try:
+        result = process_group.run(
+            list(base_command) + ["--version"], "", VERSION_TIMEOUT_SECONDS
+        )
+    except OSError:
+        return "unknown"
+    if result.timed_out:
+        return "unknown"
+    return result.stdout.strip() or "unknown"
+
+
+def _run_codex(
+    command: list[str],
+    executable: str,
+    prompt: str,
+    timeout: int,
+    on_usage: _UsageCallback = None,
+) -> str:
+    try:
+        result = process_group.run(command, prompt, timeout)
+    except FileNotFoundError as exc:
+        raise RuntimeError(_missing_executable_message(executable)) from exc
+    if result.usage is not None and on_usage is not None:
+        on_usage(result.usage)
+    if result.timed_out:
+        raise RuntimeError(f"Codex execution exceeded timeout ({timeout}s).")
+    return _checked_stdout(command, result)
+
+
+def _checked_stdout(command: list[str], result: process_group.CompletedRun) -> str:
+    if result.returncode:
+        error = subprocess.CalledProcessError(
+            result.returncode, command, output=result.stdout, stderr=result.stderr
+        )
+        raise RuntimeError(_failure_message(result.stdout, result.stderr)) from error
     return result.stdout
 
 
+async def _run_codex_async(
+    command: list[str],
+    executable: str,
+    prompt: str,
+    timeout: float,
+    on_usage: _UsageCallback = None,
+) -> str:
+    # asyncio reaps its children with waitpid, which loses their rusage, so
+    # codex is reaped with wait4 from a worker thread as on the sync path.
+    import asyncio
+
+    try:
+        process = process_group.spawn(command)
+    except FileNotFoundError as exc:
+        raise RuntimeError(_missing_executable_message(executable)) from exc
+    try:
+        result = await asyncio.to_thread(process_group.communicate, process, prompt, timeout)
+    except asyncio.CancelledError:
+        # The worker thread returns once the group is dead and reaps it.
+        process_group.kill_group(process)
+        raise
+    if result.usage is not None and on_usage is not None:
+        on_usage(result.usage)
+    if result.timed_out:
+        raise RuntimeError(f"Codex execution exceeded timeout ({timeout}s).")
+    return _checked_stdout(command, result)
+
+
+def _run_codex_hedged(
+    command: list[str],
+    executable: str,
+    prompt: str,
+    timeout: float,
+    hedge_after: float,
+    on_usage: _UsageCallback = None,
+) -> str:
+    """Run codex, starting an identical second attempt after ``hedge_after`` seconds.
+
+    The first successful attempt wins and the other is killed; the call fails
+    only when every started attempt has failed or ``timeout`` elapses.
+    """
+    import queue
+
+    deadline = time.monotonic() + timeout
+    outcomes: queue.Queue = queue.Queue()
+    processes: list[subprocess.Popen] = []
+    threads: list[threading.Thread] = []
+    lock = threading.Lock()
+    stopped = False
+
+    def attempt() -> None:
+        try:
+            with lock:
+                if stopped:
+                    return
+                process = process_group.spawn(command)
+                processes.append(process)
+            result = process_group.communicate(process, prompt)
+        except FileNotFoundError:
+            outcomes.put(RuntimeError(_missing_executable_message(executable)))
+            return
+        except (OSError, ValueError) as exc:
+            outcomes.put(RuntimeError(str(exc)))
+            return
+        if result.usage is not None and on_usage is not None:
+            on_usage(result.usage)
+        try:
+            outcomes.put(_checked_stdout(command, result))
+        except RuntimeError as failure:
+            outcomes.put(failure)
+
+    def launch() -> None:
+        thread = threading.Thread(target=attempt, daemon=True)
+        threads.append(thread)
+        thread.start()
+
+    launch()
+    hedge_at = time.monotonic() + hedge_after
+    failures = 0
+    try:
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                raise RuntimeError(f"Codex execution exceeded timeout ({timeout:g}s).")
+            awaiting_hedge = len(threads) == 1
+            wait_until = min(deadline, hedge_at) if awaiting_hedge else deadline
+            try:
+                outcome = outcomes.get(timeout=max(wait_until - now, 0))
+            except queue.Empty:
+                if awaiting_hedge and time.monotonic() >= hedge_at:
+                    launch()
+                continue
+            if isinstance(outcome, str):
+                return outcome
+            failures += 1
+            if failures == len(threads):
+                raise outcome
+    finally:
+        with lock:
+            stopped = True
+            for process in processes:
+                if process.returncode is None:
+                    process_group.kill_group(process)
+        for thread in threads:
+            thread.join()
+
+
+async def _run_codex_async_hedged(
+    invocation: _Invocation,
+    timeout: float,
+    hedge_after: float | None,
+    on_usage: _UsageCallback = None,
+) -> str:
+    import asyncio
+
+    def attempt(remaining: float) -> asyncio.Task:
+        return asyncio.ensure_future(
+            _run_codex_async(
+                invocation.command,
+                invocation.executable,
+                invocation.prompt,
+                remaining,
+                on_usage=on_usage,
+            )
+        )
+
+    if hedge_after is None:
+        return await attempt(timeout)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempts = {attempt(timeout)}
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+        if not done:
+            attempts.add(attempt(max(deadline - loop.time(), 0)))
+        failure: BaseException | None = None
+        while attempts:
+            done, _ = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                attempts.discard(task)
+                if task.exception() is None:
+                    return task.result()
+                failure = task.exception()
+        raise failure
+    finally:
+        # Cancelling an attempt kills its subprocess.
+        for task in attempts:
+            task.cancel()
+        if attempts:
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+
+async def _kill_async(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is None:
+        process_group.kill_group(process)
+    await process.wait()
+
+
+def _missing_executable_message(executable: str) -> str:
+    if executable == "codex":
+        return (
+            "Codex executable not found on PATH. Install the Codex CLI and "
+            "ensure it is available in PATH, or set AGENTFORGE_CODEX_PATH."
+        )
+    return (
+        "Codex executable not found at AGENTFORGE_CODEX_PATH. "
+        "Update the environment variable or install the Codex CLI."
+    )
+
+
+def _failure_message(stdout: str | None, stderr: str | None) -> str:
+    detail = (stderr or "").strip() or (stdout or "").strip() or "No output captured from codex."
+    return f"Codex execution failed: {detail}"
+
+
+def _resolve_command(executable: str) -> list[str]:
+    if _command_memo is None:
+        return _build_command(executable)
+    # Resolution searches PATH, so PATH is part of the key.
+    key = (executable, os.environ.get("PATH", ""))
+    command = _command_memo.get(key)
+    if command is None:
+        command = _build_command(executable)
+        _command_memo[key] = command
+    return list(command)
+
+
 def _build_command(executable: str) -> list[str]:
     lowered = executable.lower()
     if lowered.endswith(".cmd") or lowered.endswith(".bat"):
@@ -104,6 +977,8 @@ def _resolve_cmd_for_ps1(executable: str) -> str | None:
                 return str(candidate)
         return None
 
+    import shutil
+
     for suffix in (".cmd", ".bat"):
         resolved = shutil.which(f"{base}{suffix}")
         if resolved:
@@ -119,14 +994,47 @@ def _resolve_candidate(path: Path, suffix: str) -> str | None:
             return str(candidate)
         return None
 
+    import shutil
+
     return shutil.which(f"{path}{suffix}")
 
 
-def run_with_agent(agent_path: str, task: str, context: dict) -> str:
-    agent_text = Path(agent_path).read_text(encoding="utf-8")
-    context_text = json.dumps(context, indent=2, sort_keys=True, ensure_ascii=True)
+def run_with_agent(
+    agent_path: str,
+    task: str,
+    context: dict,
+    on_usage: Callable[[ResourceUsage], None] | None = None,
+) -> str:
+    return execute(_build_agent_prompt(agent_path, task, context), on_usage=on_usage)
+
 
-    prompt = (
+async def run_with_agent_async(
+    agent_path: str,
+    task: str,
+    context: dict,
+    limiter: ConcurrencyLimiter | None = None,
+    on_usage: Callable[[ResourceUsage], None] | None = None,
+) -> str:
+    import asyncio
+
+    prompt = await asyncio.to_thread(_build_agent_prompt, agent_path, task, context)
+    return await execute_async(prompt, limiter=limiter, on_usage=on_usage)
+
+
+def stream_with_agent(
+    agent_path: str,
+    task: str,
+    context: dict,
+    on_usage: Callable[[ResourceUsage], None] | None = None,
+) -> Iterator[str]:
+    return stream_execute(_build_agent_prompt(agent_path, task, context), on_usage=on_usage)
+
+
+def _build_agent_prompt(agent_path: str, task: str, context: dict) -> str:
+    agent_text = read_agent(agent_path)
+    context_text = prompt_budget.encode(context, prompt_budget.compact_enabled())
+
+    return (
         f"{agent_text}\n\n"
         "Context:\n"
         f"{context_text}\n\n"
@@ -134,4 +1042,35 @@ def run_with_agent(agent_path: str, task: str, context: dict) -> str:
         f"{task}\n"
     )
 
-    return execute(prompt)
+
+def resolve_agent(reference: str) -> str:
+    """Path of the agent ``reference`` names: a path to agent.md, or a slug, name or role."""
+    if os.path.isfile(reference) or _looks_like_path(reference):
+        return reference
+    from agentforge.core import agent_registry
+
+    return agent_registry.resolve(reference)
+
+
+def read_agent(reference: str) -> str:
+    """Agent text for ``reference``, kept in memory until the file's mtime or size changes."""
+    path = os.path.abspath(resolve_agent(reference))
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _agent_texts_lock:
+        cached = _agent_texts.get(path)
+        if cached is not None and cached[0] == version:
+            _agent_texts.move_to_end(path)
+            return cached[1]
+    text = Path(path).read_text(encoding="utf-8")
+    with _agent_texts_lock:
+        _agent_texts[path] = (version, text)
+        _agent_texts.move_to_end(path)
+        while len(_agent_texts) > AGENT_TEXT_CACHE_ENTRIES:
+            _agent_texts.popitem(last=False)
+    return text
+
+
+def _looks_like_path(reference: str) -> bool:
+    separators = (os.sep, os.altsep) if os.altsep else (os.sep,)
+    return reference.endswith(".md") or any(sep in reference for sep in separators)
@@ -0,0 +1,259 @@
+"""Framework and tool signatures, compiled into one matcher for repository analysis.
+
+Signatures live in ``agentforge/data/frameworks.json``; each entry names a
+framework and lists the dependency names, exact file names and file globs that
+identify it. ``AGENTFORGE_FRAMEWORKS_FILE`` points at an extra table in the
+same format whose entries are added to (or merged into) the built-in ones.
+
+Lookups cost the same however large the table grows: dependency names and
+file names are dictionary lookups, ``name.*`` globs are grouped by first
+character and tested with one ``str.startswith`` call, ``*.ext`` globs are
+keyed by extension, any other globs share one combined regex, and free text
+such as ``setup.py`` is scanned in one pass with a regex built from a trie of
+every dependency name.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import threading
+
+
+DEFAULT_TABLE = Path(__file__).resolve().parent.parent / "data" / "frameworks.json"
+_FIELDS = ("dependencies", "files", "globs")
+_WILDCARDS = frozenset("*?[")
+
+_index: SignatureIndex | None = None
+_index_source: str | None = None
+_index_lock = threading.Lock()
+
+
+class SignatureIndex:
+    __slots__ = (
+        "digest",
+        "names",
+        "_dependencies",
+        "_files",
+        "_prefixes",
+        "_prefixes_by_initial",
+        "_suffixes",
+        "_other_globs",
+        "_other_pattern",
+        "_text_pattern",
+        "_walk_filter",
+    )
+
+    def __init__(self, signatures: list[dict]) -> None:
+        canonical = json.dumps(signatures, sort_keys=True, separators=(",", ":"))
+        self.digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+        self.names = [signature["name"] for signature in signatures]
+        self._dependencies: dict[str, list[str]] = {}
+        self._files: dict[str, list[str]] = {}
+        # "next.config.*" is stored as the prefix "next.config.".
+        self._prefixes: dict[str, list[str]] = {}
+        self._prefixes_by_initial: dict[str, tuple[str, ...]] = {}
+        # "*.pkr.hcl" is keyed by ".hcl", the lowercased extension.
+        self._suffixes: dict[str, list[tuple[str, str]]] = {}
+        self._other_globs: list[tuple[str, str]] = []
+        self._other_pattern: re.Pattern[str] | None = None
+        self._text_pattern: re.Pattern[str] | None = None
+        for signature in signatures:
+            name = signature["name"]
+            for dependency in signature.get("dependencies", ()):
+                self._dependencies.setdefault(normalize(dependency), []).append(name)
+            for file_name in signature.get("files", ()):
+                self._files.setdefault(file_name, []).append(name)
+            for glob in signature.get("globs", ()):
+                self._add_glob(glob, name)
+        for prefix in self._prefixes:
+            self._prefixes_by_initial[prefix[0]] = (
+                *self._prefixes_by_initial.get(prefix[0], ()),
+                prefix,
+            )
+        self._walk_filter = None
+        if not self._other_globs:
+            self._walk_filter = (
+                frozenset(self._files),
+                self._prefixes_by_initial,
+                frozenset(self._suffixes),
+            )
+
+    def _add_glob(self, glob: str, name: str) -> None:
+        if not _WILDCARDS.intersection(glob):
+            self._files.setdefault(glob, []).append(name)
+        elif len(glob) > 1 and glob.endswith("*") and not _WILDCARDS.intersection(glob[:-1]):
+            self._prefixes.setdefault(glob[:-1], []).append(name)
+        elif "." in glob and glob[0] == "*" and not _WILDCARDS.intersection(glob[1:]):
+            suffix = glob[1:].lower()
+            self._suffixes.setdefault(suffix[suffix.rfind(".") :], []).append((suffix, name))
+        else:
+            self._other_globs.append((glob, name))
+
+    def walk_filter(
+        self,
+    ) -> tuple[frozenset[str], dict[str, tuple[str, ...]], frozenset[str]] | None:
+        """Lookups a directory walk can inline instead of calling ``is_signature_file``.
+
+        A file is a signature file if its name is in the first set or starts
+        with one of the prefixes listed under its first character. If its
+        extension is in the third set it may be one, and ``is_signature_file``
+        decides. Returns None when a glob fits none of these and every file
+        has to go through ``is_signature_file``.
+        """
+        return self._walk_filter
+
+    def is_signature_file(self, name: str, extension: str) -> bool:
+        if name in self._files:
+            return True
+        prefixes = self._prefixes_by_initial.get(name[:1])
+        if prefixes is not None and name.startswith(prefixes):
+            return True
+        suffixes = self._suffixes.get(extension)
+        if suffixes is not None:
+            lowered = name.lower()
+            if any(lowered.endswith(suffix) for suffix, _ in suffixes):
+                return True
+        return bool(self._other_globs) and bool(self._other_match(name))
+
+    def frameworks_for_file(self, name: str, extension: str) -> set[str]:
+        found = set(self._files.get(name, ()))
+        for prefix in self._prefixes_by_initial.get(name[:1], ()):
+            if name.startswith(prefix):
+                found.update(self._prefixes[prefix])
+        lowered = name.lower()
+        for suffix, framework in self._suffixes.get(extension, ()):
+            if lowered.endswith(suffix):
+                found.add(framework)
+        if self._other_globs and self._other_match(name):
+            import fnmatch
+
+            found.update(
+                framework
+                for glob, framework in self._other_globs
+                if fnmatch.fnmatchcase(name, glob)
+            )
+        return found
+
+    def frameworks_for_dependencies(self, dependencies: Iterable[str]) -> set[str]:
+        found: set[str] = set()
+        for dependency in dependencies:
+            names = self._dependencies.get(normalize(dependency))
+            if names:
+                found.update(names)
+        return found
+
+    def dependencies_in_text(self, text: str) -> set[str]:
+        """Known dependency names that appear quoted anywhere in ``text``."""
+        if self._text_pattern is None:
+            # Compiled on first use; only setup.py files need it.
+            self._text_pattern = _trie_pattern(self._dependencies)
+        return set(self._text_pattern.findall(_normalize_text(text)))
+
+    def _other_match(self, name: str) -> re.Match[str] | None:
+        if self._other_pattern is None:
+            import fnmatch
+
+            self._other_pattern = re.compile(
+                "|".join(fnmatch.translate(glob) for glob, _name in self._other_globs)
+            )
+        return self._other_pattern.match(name)
+
+
+def get_index() -> SignatureIndex:
+    """Return the index for the built-in table plus ``AGENTFORGE_FRAMEWORKS_FILE``."""
+    global _index, _index_source
+    source = os.environ.get("AGENTFORGE_FRAMEWORKS_FILE") or None
+    with _index_lock:
+        if _index is None or _index_source != source:
+            signatures = load_signatures(DEFAULT_TABLE)
+            if source:
+                signatures = merge_signatures(signatures, load_signatures(source))
+            _index = SignatureIndex(signatures)
+            _index_source = source
+        return _index
+
+
+def load_signatures(path: str | Path) -> list[dict]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise ValueError(f"Unable to read framework signatures from {path}: {exc}") from exc
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON in {path}: {exc}") from exc
+    entries = data.get("frameworks") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError(f"Expected a 'frameworks' list in {path}.")
+    signatures = []
+    for position, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+            raise ValueError(f"Framework {position} in {path} needs a 'name' string.")
+        signature = {"name": entry["name"]}
+        for field in _FIELDS:
+            values = entry.get(field, [])
+            if not isinstance(values, list) or not all(
+                isinstance(value, str) and value for value in values
+            ):
+                raise ValueError(
+                    f"Field '{field}' of {entry['name']!r} in {path} must be a list of strings."
+                )
+            if values:
+                signature[field] = values
+        signatures.append(signature)
+    return signatures
+
+
+def merge_signatures(base: list[dict], extra: list[dict]) -> list[dict]:
+    """Append ``extra`` to ``base``; entries with the same name combine their fields."""
+    merged = {signature["name"]: dict(signature) for signature in base}
+    for signature in extra:
+        current = merged.setdefault(signature["name"], {"name": signature["name"]})
+        for field in _FIELDS:
+            values = current.get(field, []) + [
+                value for value in signature.get(field, []) if value not in current.get(field, [])
+            ]
+            if values:
+                current[field] = values
+    return list(merged.values())
+
+
+def normalize(dependency: str) -> str:
+    # PEP 503 style, applied to every ecosystem so one table serves them all.
+    return dependency.split("[", 1)[0].strip().lower().replace("_", "-").replace(".", "-")
+
+
+def _normalize_text(text: str) -> str:
+    return text.lower().replace("_", "-").replace(".", "-")
+
+
+def _trie_pattern(words: Iterable[str]) -> re.Pattern[str]:
+    """Compile ``words`` into one regex whose alternatives share prefixes.
+
+    Each alternation level branches on distinct first characters, so the
+    regex engine rejects a position after one character test per level
+    instead of trying every word in turn.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    if not trie:
+        return re.compile(r"(?!)")
+    return re.compile(r"""(?<=["'])(""" + _trie_regex(trie) + r""")(?=["'\s\[<>=!~;,])""")
+
+
+def _trie_regex(node: dict) -> str:
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_regex(child) for char, child in node.items() if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        return "(?:" + body + ")?"
+    return body
@@ -0,0 +1,192 @@
+"""Host-wide cap on concurrent codex subprocesses.
+
+Every AgentForge process on a host that points at the same directory shares
+``max_concurrent`` slots. A slot is an ``flock`` on ``slot-<n>``, so it is
+released automatically if its holder dies. Waiters queue in FIFO order by
+ticket: only the oldest live ticket may take a free slot. Enable it with
+``AGENTFORGE_MAX_CONCURRENT`` (POSIX only); ``AGENTFORGE_GOVERNOR_DIR`` picks
+the shared directory. Waits longer than ``NOTICE_AFTER_SECONDS`` are noted on
+stderr so a stalled run explains itself.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import sys
+import threading
+import time
+
+from agentforge.core import cache
+from agentforge.core.singleflight import FileLock, file_locks_supported
+
+
+POLL_SECONDS = 0.02
+NOTICE_AFTER_SECONDS = 1.0
+
+_governors: dict[tuple[str, int], Governor] = {}
+_governors_lock = threading.Lock()
+
+
+class Slot:
+    __slots__ = ("index", "wait_seconds", "_fd")
+
+    def __init__(self, index: int, fd: int, wait_seconds: float) -> None:
+        self.index = index
+        self.wait_seconds = wait_seconds
+        self._fd: int | None = fd
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> Slot:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.release()
+
+
+class _Ticket:
+    __slots__ = ("name", "path", "fd")
+
+    def __init__(self, name: str, path: Path, fd: int) -> None:
+        self.name = name
+        self.path = path
+        self.fd = fd
+
+    def release(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        os.close(self.fd)
+
+
+class Governor:
+    def __init__(self, directory: str | Path, max_concurrent: int) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1.")
+        self.directory = Path(directory)
+        self.max_concurrent = max_concurrent
+        self._tickets = self.directory / "tickets"
+        self._tickets.mkdir(parents=True, exist_ok=True)
+
+    def acquire(self) -> Slot:
+        """Block until this caller reaches the head of the queue and a slot is free."""
+        started = time.monotonic()
+        ticket = self._take_ticket()
+        try:
+            while True:
+                slot = self._try_acquire(ticket, started)
+                if slot is not None:
+                    return self._noted(slot)
+                time.sleep(POLL_SECONDS)
+        finally:
+            ticket.release()
+
+    async def acquire_async(self) -> Slot:
+        import asyncio
+
+        started = time.monotonic()
+        ticket = await asyncio.to_thread(self._take_ticket)
+        try:
+            while True:
+                slot = self._try_acquire(ticket, started)
+                if slot is not None:
+                    return self._noted(slot)
+                await asyncio.sleep(POLL_SECONDS)
+        finally:
+            ticket.release()
+
+    def _noted(self, slot: Slot) -> Slot:
+        if slot.wait_seconds >= NOTICE_AFTER_SECONDS:
+            print(
+                f"agentforge: waited {slot.wait_seconds:.1f}s for a codex slot "
+                f"({self.max_concurrent} allowed host-wide by AGENTFORGE_MAX_CONCURRENT).",
+                file=sys.stderr,
+                flush=True,
+            )
+        return slot
+
+    def _take_ticket(self) -> _Ticket:
+        import fcntl
+
+        with FileLock(self.directory, "queue"):
+            counter = self.directory / "counter"
+            try:
+                sequence = int(counter.read_text(encoding="utf-8") or 0) + 1
+            except (FileNotFoundError, ValueError):
+                sequence = 1
+            counter.write_text(str(sequence), encoding="utf-8")
+        name = f"{sequence:020d}"
+        # Lock the ticket before it becomes visible so no waiter mistakes it for dead.
+        pending = self.directory / f".{name}.{os.getpid()}.{threading.get_ident()}"
+        fd = os.open(pending, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        path = self._tickets / name
+        os.replace(pending, path)
+        return _Ticket(name, path, fd)
+
+    def _try_acquire(self, ticket: _Ticket, started: float) -> Slot | None:
+        if not self._is_head(ticket):
+            return None
+        import fcntl
+
+        for index in range(self.max_concurrent):
+            fd = os.open(self.directory / f"slot-{index}", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return Slot(index, fd, time.monotonic() - started)
+        return None
+
+    def _is_head(self, ticket: _Ticket) -> bool:
+        for name in sorted(os.listdir(self._tickets)):
+            if name >= ticket.name:
+                return True
+            if self._alive(name):
+                return False
+        return True
+
+    def _alive(self, name: str) -> bool:
+        import fcntl
+
+        path = self._tickets / name
+        try:
+            fd = os.open(path, os.O_RDWR)
+        except FileNotFoundError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        else:
+            # The owner exited without removing its ticket.
+            path.unlink(missing_ok=True)
+            return False
+        finally:
+            os.close(fd)
+
+
+def get_governor() -> Governor | None:
+    value = os.environ.get("AGENTFORGE_MAX_CONCURRENT")
+    if not value or not file_locks_supported():
+        return None
+    try:
+        max_concurrent = int(value)
+    except ValueError as exc:
+        raise ValueError(f"AGENTFORGE_MAX_CONCURRENT must be an integer, got {value!r}.") from exc
+    directory = os.environ.get("AGENTFORGE_GOVERNOR_DIR") or str(
+        cache.default_cache_root() / "governor"
+    )
+    key = (directory, max_concurrent)
+    with _governors_lock:
+        governor = _governors.get(key)
+        if governor is None:
+            governor = Governor(directory, max_concurrent)
+            _governors[key] = governor
+    return governor
@@ -0,0 +1,151 @@
+"""Incremental extraction of agent objects from streamed codex output."""
+
+from __future__ import annotations
+
+import json
+import re
+
+
+# Either an object key ("agents": [) or a bare array that is empty or starts with an object.
+_ARRAY_START = re.compile(r'"agents"\s*:\s*\[|\[(?=\s*[{\]])')
+_WHITESPACE = " \t\r\n"
+
+_SEEK = "seek"
+_ARRAY = "array"
+_OBJECT = "object"
+_DONE = "done"
+
+
+class AgentArrayParser:
+    """Finds the agents array in noisy text and yields each object once it closes.
+
+    Text before the array (log lines, banners) and after its closing bracket is
+    ignored, so codex chatter around the JSON no longer fails a run.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._state = _SEEK
+        self._object_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.count = 0
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, text: str) -> list[dict]:
+        if self._state == _DONE or not text:
+            return []
+        self._buffer += text
+        found: list[dict] = []
+        while True:
+            if self._state == _SEEK and not self._seek():
+                break
+            if self._state == _ARRAY and not self._scan_array():
+                break
+            if self._state == _OBJECT:
+                obj = self._scan_object()
+                if obj is None:
+                    break
+                found.append(obj)
+            if self._state == _DONE:
+                break
+        self._compact()
+        return found
+
+    def close(self) -> None:
+        if self._state == _DONE:
+            return
+        if self.count == 0 and self._state == _SEEK:
+            raise ValueError("Expected a JSON array of agents or an object with 'agents'.")
+        raise ValueError("Codex output ended before the agents array was closed.")
+
+    def _seek(self) -> bool:
+        match = _ARRAY_START.search(self._buffer, self._pos)
+        if match is None:
+            # Keep a possible partial match at the end of the buffer for the next chunk.
+            keep_from = self._buffer.rfind('"agents"', self._pos)
+            if keep_from == -1:
+                keep_from = max(
+                    self._buffer.rfind('"', self._pos), self._buffer.rfind("[", self._pos)
+                )
+            self._pos = keep_from if keep_from != -1 else len(self._buffer)
+            return False
+        self._pos = match.end()
+        self._state = _ARRAY
+        return True
+
+    def _scan_array(self) -> bool:
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            if char in _WHITESPACE or char == ",":
+                self._pos += 1
+                continue
+            if char == "]":
+                self._pos += 1
+                self._state = _DONE
+                return True
+            if char == "{":
+                self._state = _OBJECT
+                self._object_start = self._pos
+                self._depth = 0
+                self._in_string = False
+                self._escaped = False
+                return True
+            if self.count:
+                raise ValueError("Each agent must be a JSON object.")
+            # Not an agents array after all (e.g. "agents": [1, 2] in a log line).
+            self._state = _SEEK
+            return True
+        return False
+
+    def _scan_object(self) -> dict | None:
+        buffer = self._buffer
+        pos = self._pos
+        end = len(buffer)
+        while pos < end:
+            char = buffer[pos]
+            pos += 1
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = pos
+                    self._state = _ARRAY
+                    return self._decode(buffer[self._object_start:pos])
+        self._pos = pos
+        return None
+
+    def _decode(self, text: str) -> dict:
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid agent JSON in codex output: {exc}") from exc
+        if not isinstance(obj, dict):
+            raise ValueError("Each agent must be a JSON object.")
+        self.count += 1
+        return obj
+
+    def _compact(self) -> None:
+        # Drop consumed text so memory stays proportional to the current object.
+        start = self._object_start if self._state == _OBJECT else self._pos
+        if start > 0:
+            self._buffer = self._buffer[start:]
+            self._pos -= start
+            self._object_start = 0
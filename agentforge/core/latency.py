@@ -0,0 +1,137 @@
+"""Latency history for codex calls, used for hedging and adaptive timeouts.
+
+Samples are grouped by prompt size (buckets grow by a factor of four) so short
+``run`` prompts and large ``generate`` prompts do not share one distribution.
+``AGENTFORGE_LATENCY_FILE`` persists the history across processes;
+``AGENTFORGE_HEDGE=1`` and ``AGENTFORGE_ADAPTIVE_TIMEOUT=1`` enable the policies.
+Each process adds only its new samples to the file, under a lock, so concurrent
+runs keep each other's history.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+import json
+import math
+import os
+import threading
+
+from agentforge.core import singleflight
+
+
+MAX_SAMPLES = 200
+# Percentiles from fewer samples than this are too noisy to act on.
+MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+TIMEOUT_PERCENTILE = 0.99
+TIMEOUT_MULTIPLIER = 3.0
+MIN_TIMEOUT_SECONDS = 10.0
+
+_histories: dict[str, LatencyHistory] = {}
+_histories_lock = threading.Lock()
+
+
+class LatencyHistory:
+    def __init__(self, path: str | Path | None = None, max_samples: int = MAX_SAMPLES) -> None:
+        self.path = Path(path) if path else None
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+        # Samples recorded here but not yet added to the file.
+        self._unsaved: dict[str, deque[float]] = {}
+        if self.path is not None:
+            self._load()
+
+    def record(self, bucket: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(bucket)
+            if samples is None:
+                samples = deque(maxlen=self.max_samples)
+                self._samples[bucket] = samples
+            samples.append(seconds)
+            if self.path is not None:
+                unsaved = self._unsaved.setdefault(bucket, deque(maxlen=self.max_samples))
+                unsaved.append(seconds)
+        if self.path is not None:
+            self._save()
+
+    def percentile(self, bucket: str, fraction: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(bucket, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, math.ceil(fraction * len(samples)) - 1)
+        return samples[index]
+
+    def hedge_delay(self, bucket: str) -> float | None:
+        """Seconds after which a second attempt should start, or None without history."""
+        return self.percentile(bucket, HEDGE_PERCENTILE)
+
+    def adaptive_timeout(self, bucket: str, ceiling: float) -> float:
+        """A timeout of a few times the healthy p99, never above ``ceiling``."""
+        p99 = self.percentile(bucket, TIMEOUT_PERCENTILE)
+        if p99 is None:
+            return ceiling
+        return min(ceiling, max(MIN_TIMEOUT_SECONDS, p99 * TIMEOUT_MULTIPLIER))
+
+    def _load(self) -> None:
+        self._samples = self._read()
+
+    def _read(self) -> dict[str, deque[float]]:
+        try:
+            stored = json.loads(self.path.read_text(encoding="utf-8"))
+            return {
+                bucket: deque((float(value) for value in samples), maxlen=self.max_samples)
+                for bucket, samples in stored["buckets"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _save(self) -> None:
+        tmp_path = self.path.with_name(
+            f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock(), self._lock:
+                # Merge into what other processes wrote since this one last looked.
+                merged = self._read()
+                for bucket, values in self._unsaved.items():
+                    merged.setdefault(bucket, deque(maxlen=self.max_samples)).extend(values)
+                payload = {"buckets": {bucket: list(values) for bucket, values in merged.items()}}
+                tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+                os.replace(tmp_path, self.path)
+                self._samples = merged
+                self._unsaved = {}
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def _file_lock(self):
+        if not singleflight.file_locks_supported():
+            import contextlib
+
+            return contextlib.nullcontext()
+        return singleflight.FileLock(self.path.parent, self.path.name)
+
+
+def bucket_for(prompt_bytes: int) -> str:
+    return str(max(prompt_bytes, 1).bit_length() // 2)
+
+
+def get_history() -> LatencyHistory:
+    path = os.environ.get("AGENTFORGE_LATENCY_FILE", "")
+    with _histories_lock:
+        history = _histories.get(path)
+        if history is None:
+            history = LatencyHistory(path or None)
+            _histories[path] = history
+    return history
+
+
+def hedging_enabled() -> bool:
+    return os.environ.get("AGENTFORGE_HEDGE", "") not in ("", "0")
+
+
+def adaptive_timeout_enabled() -> bool:
+    return os.environ.get("AGENTFORGE_ADAPTIVE_TIMEOUT", "") not in ("", "0")
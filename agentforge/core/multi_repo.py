@@ -0,0 +1,169 @@
+"""Repository analysis across many roots on a process pool, streamed as JSONL."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+import json
+import time
+
+from agentforge.core import repo_analyzer
+
+
+@dataclass
+class AnalyzeSummary:
+    succeeded: int = 0
+    failed: int = 0
+
+
+def analyze_repos(
+    roots: Iterable[str],
+    output: IO[str],
+    jobs: int = 1,
+    snapshots: bool = True,
+    full_rescan: bool = False,
+    workers: int = 1,
+    sample_budget_seconds: float | None = None,
+    sample_max_files: int | None = None,
+) -> AnalyzeSummary:
+    """Analyze each root in its own worker process and write one record per root.
+
+    Records are written as soon as each repository finishes, so their order
+    follows completion rather than input. A repository that fails gets an
+    ``error`` record and does not stop the rest; one whose worker process dies
+    is retried once in a process of its own first.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1.")
+    options = {
+        "snapshots": snapshots,
+        "full_rescan": full_rescan,
+        "workers": workers,
+        "sample_budget_seconds": sample_budget_seconds,
+        "sample_max_files": sample_max_files,
+    }
+    summary = AnalyzeSummary()
+    in_flight: dict[Future, str] = {}
+    # Roots whose worker died are retried one per process, in their own pool.
+    retries: dict[Future, tuple[str, ProcessPoolExecutor]] = {}
+    # Bounds how far ahead of the results we read roots, e.g. from stdin.
+    window = jobs * 2
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    submitted_to_current_pool: set[Future] = set()
+
+    def collect(block_until_one: bool) -> None:
+        nonlocal pool
+        done, _ = wait(
+            [*in_flight, *retries],
+            timeout=None if block_until_one else 0,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            if future in retries:
+                root, solo = retries.pop(future)
+                solo.shutdown(wait=False)
+                _emit(_record(root, future), output, summary)
+                continue
+            root = in_flight.pop(future)
+            on_current_pool = future in submitted_to_current_pool
+            submitted_to_current_pool.discard(future)
+            if not isinstance(future.exception(), BrokenProcessPool):
+                _emit(_record(root, future), output, summary)
+                continue
+            # A crashed worker fails every task on its pool, not only its own,
+            # so later roots go to a fresh pool and this one is retried alone.
+            if on_current_pool:
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(max_workers=jobs)
+                submitted_to_current_pool.clear()
+            solo = ProcessPoolExecutor(max_workers=1)
+            retries[solo.submit(analyze_one, root, options)] = (root, solo)
+
+    try:
+        for root in roots:
+            while len(in_flight) + len(retries) >= window:
+                collect(block_until_one=True)
+            future = pool.submit(analyze_one, root, options)
+            in_flight[future] = root
+            submitted_to_current_pool.add(future)
+            collect(block_until_one=False)
+        while in_flight or retries:
+            collect(block_until_one=True)
+    finally:
+        pool.shutdown(cancel_futures=True)
+        for _root, solo in retries.values():
+            solo.shutdown(cancel_futures=True)
+    return summary
+
+
+def analyze_one(root: str, options: dict) -> dict:
+    """Analyze one repository and return its JSONL record; runs in a worker process."""
+    started = time.perf_counter()
+    try:
+        if not Path(root).is_dir():
+            raise ValueError(f"Not a directory: {root}")
+        snapshot_path = None
+        if options["snapshots"]:
+            snapshot_path = str(repo_analyzer.default_snapshot_path(root))
+        metadata = repo_analyzer.analyze_repo(
+            root,
+            snapshot_path=snapshot_path,
+            full_rescan=options["full_rescan"],
+            workers=options["workers"],
+            sample_budget_seconds=options["sample_budget_seconds"],
+            sample_max_files=options["sample_max_files"],
+        )
+    except (OSError, ValueError, RuntimeError) as exc:
+        return _error_record(root, str(exc), time.perf_counter() - started)
+    except Exception as exc:  # A bug on one repository must not cost the others.
+        return _error_record(root, _describe(exc), time.perf_counter() - started)
+    return {
+        "repo": root,
+        "status": "ok",
+        "elapsed_ms": _milliseconds(time.perf_counter() - started),
+        "metadata": metadata,
+    }
+
+
+def _record(root: str, future: Future) -> dict:
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        return _error_record(root, "The worker process exited unexpectedly.", None)
+    except Exception as exc:  # e.g. a result that could not be sent back
+        return _error_record(root, _describe(exc), None)
+
+
+def _describe(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def iter_roots(lines: Iterable[str]) -> Iterator[str]:
+    for raw_line in lines:
+        stripped = raw_line.strip()
+        if stripped and not stripped.startswith("#"):
+            yield stripped
+
+
+def _error_record(root: str, message: str, elapsed: float | None) -> dict:
+    record = {"repo": root, "status": "error", "error": message}
+    if elapsed is not None:
+        record["elapsed_ms"] = _milliseconds(elapsed)
+    return record
+
+
+def _milliseconds(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _emit(record: dict, output: IO[str], summary: AnalyzeSummary) -> None:
+    output.write(json.dumps(record, ensure_ascii=True) + "\n")
+    output.flush()
+    if record["status"] == "ok":
+        summary.succeeded += 1
+    else:
+        summary.failed += 1
@@ -0,0 +1,105 @@
+"""Atomic, change-detecting writes of generated agent files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import hashlib
+import os
+import re
+import threading
+
+
+AGENT_FILE = "agent.md"
+
+
+class WriteSummary:
+    __slots__ = ("written", "unchanged", "removed")
+
+    def __init__(self, written: int = 0, unchanged: int = 0, removed: int = 0) -> None:
+        self.written = written
+        self.unchanged = unchanged
+        self.removed = removed
+
+
+def write_files(output_dir: str | Path, files: dict[str, str], prune: bool = False) -> WriteSummary:
+    """Write ``files`` (relative path -> text) under ``output_dir``.
+
+    Files whose content already matches are left untouched, so their mtimes do
+    not change; the rest are written to a temporary file and renamed into place.
+    With ``prune``, agent directories (those holding an ``agent.md``) that are
+    not part of ``files`` have their ``agent.md`` removed.
+    """
+    output_path = Path(output_dir)
+    summary = WriteSummary()
+    for relative, text in files.items():
+        target = output_path / relative
+        data = text.encode("utf-8")
+        if _matches(target, data):
+            summary.unchanged += 1
+            continue
+        _atomic_write(target, data)
+        summary.written += 1
+
+    if prune:
+        summary.removed = _prune_agent_dirs(output_path, files)
+    return summary
+
+
+def slugify(value: str) -> str:
+    """Directory name for an agent called ``value``."""
+    cleaned = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower())
+    cleaned = cleaned.strip("-")
+    return cleaned or "agent"
+
+
+def unique_slug(slug: str, used: set[str]) -> str:
+    if slug not in used:
+        return slug
+    suffix = 2
+    while f"{slug}-{suffix}" in used:
+        suffix += 1
+    return f"{slug}-{suffix}"
+
+
+def _matches(target: Path, data: bytes) -> bool:
+    try:
+        if target.stat().st_size != len(data):
+            return False
+        existing = target.read_bytes()
+    except OSError:
+        return False
+    return hashlib.sha256(existing).digest() == hashlib.sha256(data).digest()
+
+
+def _atomic_write(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, target)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _prune_agent_dirs(output_path: Path, files: dict[str, str]) -> int:
+    kept = {Path(relative).parts[0] for relative in files}
+    removed = 0
+    try:
+        entries = list(os.scandir(output_path))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if entry.name in kept or not entry.is_dir(follow_symlinks=False):
+            continue
+        agent_file = Path(entry.path) / AGENT_FILE
+        if not agent_file.is_file():
+            continue
+        agent_file.unlink()
+        removed += 1
+        # Leave the directory if it holds anything besides the generated file.
+        try:
+            os.rmdir(entry.path)
+        except OSError:
+            pass
+    return removed
@@ -0,0 +1,264 @@
+"""Dependency-aware execution of multi-agent pipelines for AgentForge."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+
+from agentforge.core import executor
+from agentforge.core.process_group import ResourceUsage
+
+
+STATE_FILE = ".pipeline-state.json"
+
+Runner = Callable[[str, str, dict], str]
+
+
+@dataclass
+class PipelineNode:
+    id: str
+    name: str
+    description: str
+    agent_path: Path
+    task: str | None = None
+    depends_on: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PipelineResult:
+    outputs: dict[str, str] = field(default_factory=dict)
+    executed: list[str] = field(default_factory=list)
+    reused: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    # Codex processes started per node; only filled by the default runner.
+    usage: dict[str, list[ResourceUsage]] = field(default_factory=dict)
+
+
+def load_pipeline(config_path: str) -> list[PipelineNode]:
+    """Read a pipeline config: a JSON list (or {"agents": [...]}) of agent entries.
+
+    Each entry needs an ``id``; ``agent`` defaults to ``<id>.md`` next to the
+    config, and ``depends_on`` lists the ids whose outputs the agent consumes.
+    Nodes are returned in a valid execution (topological) order.
+    """
+    path = Path(config_path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON in {config_path}: {exc}") from exc
+    entries = data.get("agents") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError("Pipeline config must be a JSON list of agents or an object with 'agents'.")
+
+    nodes: dict[str, PipelineNode] = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), str):
+            raise ValueError("Each pipeline entry must be an object with a string 'id'.")
+        node_id = entry["id"]
+        if node_id in nodes:
+            raise ValueError(f"Duplicate pipeline id: {node_id}")
+        depends_on = entry.get("depends_on", [])
+        if not isinstance(depends_on, list) or not all(isinstance(dep, str) for dep in depends_on):
+            raise ValueError(f"Pipeline entry '{node_id}' has an invalid 'depends_on' list.")
+        nodes[node_id] = PipelineNode(
+            id=node_id,
+            name=entry.get("name", node_id),
+            description=entry.get("description", ""),
+            agent_path=path.parent / entry.get("agent", f"{node_id}.md"),
+            task=entry.get("task"),
+            depends_on=depends_on,
+        )
+
+    for node in nodes.values():
+        unknown = [dep for dep in node.depends_on if dep not in nodes]
+        if unknown:
+            raise ValueError(f"Pipeline entry '{node.id}' depends on unknown ids: {unknown}")
+    return _topological_order(nodes)
+
+
+def run_pipeline(
+    nodes: list[PipelineNode],
+    task: str,
+    context: dict,
+    output_dir: str,
+    jobs: int = 4,
+    force: bool = False,
+    runner: Runner | None = None,
+    on_event: Callable[[str, str], None] | None = None,
+) -> PipelineResult:
+    """Run nodes as soon as their dependencies finish, up to ``jobs`` at a time.
+
+    Each node receives its upstream outputs under ``context["upstream"]``.
+    Outputs are written to ``<output_dir>/<id>.md`` together with a hash of
+    the node's inputs; a later run reuses any node whose inputs are unchanged.
+    The hashes are saved as each node finishes, so an interrupted run keeps
+    the work it completed.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1.")
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    state = {} if force else _load_state(output_path)
+    result = PipelineResult()
+    by_id = {node.id: node for node in nodes}
+    remaining = {node.id: set(node.depends_on) for node in nodes}
+    in_flight: dict[Future, tuple[PipelineNode, str]] = {}
+
+    usage_lock = threading.Lock()
+
+    def submit(node: PipelineNode, node_task: str, node_context: dict) -> Future:
+        if runner is not None:
+            return pool.submit(runner, str(node.agent_path), node_task, node_context)
+
+        def record(usage: ResourceUsage) -> None:
+            with usage_lock:
+                result.usage.setdefault(node.id, []).append(usage)
+
+        return pool.submit(
+            executor.run_with_agent, str(node.agent_path), node_task, node_context, record
+        )
+
+    def notify(event: str, node_id: str) -> None:
+        if on_event is not None:
+            on_event(event, node_id)
+
+    def finish(node_id: str) -> None:
+        for deps in remaining.values():
+            deps.discard(node_id)
+
+    def ready_nodes() -> list[PipelineNode]:
+        ready = [by_id[node_id] for node_id, deps in remaining.items() if not deps]
+        for node in ready:
+            del remaining[node.id]
+        return ready
+
+    def fail(node: PipelineNode, exc: Exception) -> None:
+        # Dependents of a failed node are skipped when they come up.
+        result.failed[node.id] = str(exc)
+        state.pop(node.id, None)
+        notify("failed", node.id)
+        finish(node.id)
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            pending = ready_nodes()
+            while pending or in_flight:
+                for node in pending:
+                    blocked = [dep for dep in node.depends_on if dep not in result.outputs]
+                    if blocked:
+                        result.skipped.append(node.id)
+                        notify("skipped", node.id)
+                        finish(node.id)
+                        continue
+                    node_context = dict(context)
+                    node_context["upstream"] = {
+                        dep: result.outputs[dep] for dep in node.depends_on
+                    }
+                    node_task = _node_task(node, task)
+                    try:
+                        key = _input_key(node, node_task, node_context)
+                    except OSError as exc:
+                        fail(node, exc)
+                        continue
+                    cached = _reuse_output(output_path, node.id, key, state)
+                    if cached is not None:
+                        result.outputs[node.id] = cached
+                        result.reused.append(node.id)
+                        notify("reused", node.id)
+                        finish(node.id)
+                        continue
+                    notify("started", node.id)
+                    future = submit(node, node_task, node_context)
+                    in_flight[future] = (node, key)
+
+                if in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node, key = in_flight.pop(future)
+                        try:
+                            output = future.result()
+                            (output_path / f"{node.id}.md").write_text(output, encoding="utf-8")
+                        except (OSError, ValueError, RuntimeError) as exc:
+                            fail(node, exc)
+                            continue
+                        state[node.id] = key
+                        _save_state(output_path, state)
+                        result.outputs[node.id] = output
+                        result.executed.append(node.id)
+                        notify("finished", node.id)
+                        finish(node.id)
+                pending = ready_nodes()
+    finally:
+        _save_state(output_path, state)
+    return result
+
+
+def _topological_order(nodes: dict[str, PipelineNode]) -> list[PipelineNode]:
+    order: list[PipelineNode] = []
+    indegree = {node_id: len(node.depends_on) for node_id, node in nodes.items()}
+    dependents: dict[str, list[str]] = {node_id: [] for node_id in nodes}
+    for node in nodes.values():
+        for dep in node.depends_on:
+            dependents[dep].append(node.id)
+
+    ready = [node_id for node_id, count in indegree.items() if count == 0]
+    while ready:
+        node_id = ready.pop(0)
+        order.append(nodes[node_id])
+        for child in dependents[node_id]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+
+    if len(order) != len(nodes):
+        cyclic = sorted(node_id for node_id, count in indegree.items() if count > 0)
+        raise ValueError(f"Pipeline dependencies contain a cycle: {cyclic}")
+    return order
+
+
+def _node_task(node: PipelineNode, task: str) -> str:
+    if node.task:
+        return f"{task}\n\n{node.task}" if task else node.task
+    return task or f"Perform your role as {node.name}: {node.description}"
+
+
+def _input_key(node: PipelineNode, task: str, context: dict) -> str:
+    digest = hashlib.sha256()
+    digest.update(node.agent_path.read_bytes())
+    digest.update(b"\0")
+    digest.update(task.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(context, sort_keys=True, ensure_ascii=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _reuse_output(output_path: Path, node_id: str, key: str, state: dict) -> str | None:
+    if state.get(node_id) != key:
+        return None
+    try:
+        return (output_path / f"{node_id}.md").read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def _load_state(output_path: Path) -> dict:
+    try:
+        data = json.loads((output_path / STATE_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_state(output_path: Path, state: dict) -> None:
+    # Replaced atomically: an interrupt mid-write must not lose earlier nodes.
+    path = output_path / STATE_FILE
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
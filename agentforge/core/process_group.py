@@ -0,0 +1,222 @@
+"""Codex child processes: own session, whole-group kills, limits and usage.
+
+On POSIX every codex process starts in a new session, so a timeout or
+cancellation kills everything it spawned rather than just the direct child.
+``AGENTFORGE_CODEX_CPU_SECONDS`` and ``AGENTFORGE_CODEX_MEMORY_MB`` cap each
+process with ``RLIMIT_CPU`` and ``RLIMIT_AS``. Processes reaped here report
+their CPU time and peak RSS from ``wait4``.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+
+class ResourceUsage:
+    __slots__ = ("user_seconds", "system_seconds", "max_rss_kb")
+
+    def __init__(self, user_seconds: float, system_seconds: float, max_rss_kb: int) -> None:
+        self.user_seconds = user_seconds
+        self.system_seconds = system_seconds
+        self.max_rss_kb = max_rss_kb
+
+    @property
+    def cpu_seconds(self) -> float:
+        return self.user_seconds + self.system_seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"ResourceUsage(user_seconds={self.user_seconds:.3f}, "
+            f"system_seconds={self.system_seconds:.3f}, max_rss_kb={self.max_rss_kb})"
+        )
+
+
+class CompletedRun:
+    __slots__ = ("returncode", "stdout", "stderr", "timed_out", "usage")
+
+    def __init__(
+        self,
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        timed_out: bool = False,
+        usage: ResourceUsage | None = None,
+    ) -> None:
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+        self.usage = usage
+
+
+# Sets the limits given as argv[1:3] ("" for none), then becomes argv[3:].
+_LIMIT_WRAPPER = (
+    "import os, resource, sys\n"
+    "for name, value in zip(('RLIMIT_CPU', 'RLIMIT_AS'), sys.argv[1:3]):\n"
+    "    if value:\n"
+    "        resource.setrlimit(getattr(resource, name), (int(value), int(value)))\n"
+    "os.execvp(sys.argv[3], sys.argv[3:])\n"
+)
+
+
+def popen_options() -> dict:
+    """Keyword arguments for ``Popen``/``create_subprocess_exec`` on this platform."""
+    if os.name != "posix":
+        return {}
+    return {"start_new_session": True}
+
+
+def limited_command(command: list[str]) -> list[str]:
+    """``command``, run through a wrapper that applies the codex resource limits.
+
+    ``preexec_fn`` is unsafe when the parent has threads, which batch, pipeline,
+    hedged and sharded runs all do, so the limits are set by a small Python
+    process that then execs ``command`` under the same pid. Without limits the
+    command is returned unchanged.
+    """
+    if os.name != "posix":
+        return command
+    cpu_seconds = _env_limit("AGENTFORGE_CODEX_CPU_SECONDS")
+    memory_mb = _env_limit("AGENTFORGE_CODEX_MEMORY_MB")
+    if cpu_seconds is None and memory_mb is None:
+        return command
+    import shutil
+
+    # Report a missing executable the same way an unwrapped spawn would.
+    if shutil.which(command[0]) is None:
+        raise FileNotFoundError(f"No such file or directory: {command[0]!r}")
+    return [
+        sys.executable,
+        "-I",
+        "-S",
+        "-c",
+        _LIMIT_WRAPPER,
+        "" if cpu_seconds is None else str(cpu_seconds),
+        "" if memory_mb is None else str(memory_mb * 1024 * 1024),
+        *command,
+    ]
+
+
+def spawn(command: list[str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        limited_command(command),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        **popen_options(),
+    )
+
+
+def run(command: list[str], input_text: str, timeout: float | None) -> CompletedRun:
+    """Run ``command`` to completion, killing its whole group after ``timeout``."""
+    return communicate(spawn(command), input_text, timeout)
+
+
+def communicate(
+    process: subprocess.Popen, input_text: str, timeout: float | None = None
+) -> CompletedRun:
+    """Feed ``input_text``, collect output and reap ``process`` with its usage.
+
+    Unlike ``Popen.communicate`` this reaps the child itself, so its resource
+    usage is available; another thread may end the call early with ``kill_group``.
+    """
+    timed_out = threading.Event()
+
+    def on_timeout() -> None:
+        timed_out.set()
+        kill_group(process)
+
+    stderr_parts: list[bytes] = []
+    threads = [
+        threading.Thread(
+            target=_feed, args=(process, input_text.encode("utf-8")), daemon=True
+        ),
+        threading.Thread(
+            target=lambda: stderr_parts.append(process.stderr.read()), daemon=True
+        ),
+    ]
+    timer = threading.Timer(timeout, on_timeout) if timeout is not None else None
+    for thread in threads:
+        thread.start()
+    if timer is not None:
+        timer.daemon = True
+        timer.start()
+    try:
+        stdout = process.stdout.read()
+        usage = wait(process)
+    finally:
+        if timer is not None:
+            timer.cancel()
+        if process.returncode is None:
+            kill_group(process)
+            wait(process)
+        for thread in threads:
+            thread.join()
+        process.stdout.close()
+        process.stderr.close()
+
+    return CompletedRun(
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        b"".join(stderr_parts).decode("utf-8", errors="replace"),
+        timed_out.is_set(),
+        usage,
+    )
+
+
+def wait(process: subprocess.Popen) -> ResourceUsage | None:
+    """Reap ``process`` and return its resource usage (None where unsupported)."""
+    if os.name != "posix" or process.returncode is not None:
+        process.wait()
+        return None
+    try:
+        _pid, status, rusage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        # Reaped elsewhere already; Popen recovers the status itself.
+        process.wait()
+        return None
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is kilobytes on Linux but bytes on macOS.
+    max_rss = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    return ResourceUsage(rusage.ru_utime, rusage.ru_stime, max_rss)
+
+
+def kill_group(process: subprocess.Popen) -> None:
+    """Kill ``process`` and, on POSIX, every process in its session's group."""
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+
+def _feed(process: subprocess.Popen, data: bytes) -> None:
+    try:
+        process.stdin.write(data)
+        process.stdin.close()
+    except (BrokenPipeError, OSError):
+        pass
+
+
+def _env_limit(name: str) -> int | None:
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        limit = int(value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {value!r}.") from exc
+    if limit < 1:
+        raise ValueError(f"{name} must be at least 1, got {limit}.")
+    return limit
+
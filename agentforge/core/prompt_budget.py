@@ -0,0 +1,111 @@
+"""Prompt size controls: compact encoding, spec deduplication, and budget trimming.
+
+Settings come from the environment so every entry point shares them:
+``AGENTFORGE_PROMPT_COMPACT=1`` enables compact encoding and
+``AGENTFORGE_PROMPT_BUDGET`` caps the estimated prompt size in tokens.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+
+
+# Optional spec parts in the order they are dropped to meet a budget; sections
+# not listed here (custom headings) go first. Goals and Constraints are never dropped.
+_TRIM_ORDER = (
+    "preamble",
+    "Context",
+    "Deliverables",
+    "Out of Scope",
+    "Responsibilities",
+    "Agents",
+)
+_PROTECTED_SECTIONS = {"Goals", "Constraints"}
+_RULE_LINE = re.compile(r"(?:\n\s*(?:-{3,}|\*{3,}|_{3,})\s*)+$")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+
+def compact_enabled() -> bool:
+    return os.environ.get("AGENTFORGE_PROMPT_COMPACT", "") not in ("", "0")
+
+
+def token_budget() -> int | None:
+    value = os.environ.get("AGENTFORGE_PROMPT_BUDGET")
+    if not value:
+        return None
+    try:
+        budget = int(value)
+    except ValueError as exc:
+        raise ValueError(f"AGENTFORGE_PROMPT_BUDGET must be an integer, got {value!r}.") from exc
+    if budget < 1:
+        raise ValueError("AGENTFORGE_PROMPT_BUDGET must be at least 1.")
+    return budget
+
+
+def settings() -> dict:
+    return {"compact": compact_enabled(), "budget": token_budget()}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: about four characters per token for English and JSON."""
+    return (len(text) + 3) // 4
+
+
+def encode(value: object, compact: bool) -> str:
+    if compact:
+        return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    return json.dumps(value, indent=2, sort_keys=True, ensure_ascii=True)
+
+
+def compact_spec(spec: dict) -> dict:
+    """Drop ``raw`` (it repeats the preamble and sections) and tidy section text."""
+    if "sections" not in spec:
+        return dict(spec)
+    compacted = {key: value for key, value in spec.items() if key != "raw"}
+    compacted["sections"] = {
+        name: _tidy(text) for name, text in spec["sections"].items()
+    }
+    if compacted.get("preamble"):
+        compacted["preamble"] = _tidy(compacted["preamble"])
+    return compacted
+
+
+def trim_spec(spec: dict, max_tokens: int, compact: bool = True) -> tuple[dict, list[str]]:
+    """Drop low-priority spec parts until its encoding fits ``max_tokens``.
+
+    Returns the trimmed spec and the names of the dropped parts. Goals and
+    Constraints are kept even if the spec still exceeds the budget.
+    """
+    trimmed = dict(spec)
+    trimmed["sections"] = dict(spec.get("sections", {}))
+    trimmed.pop("raw", None)
+    dropped: list[str] = []
+    for part in _trim_candidates(trimmed):
+        if estimate_tokens(encode(trimmed, compact)) <= max_tokens:
+            break
+        if part == "preamble":
+            if not trimmed.get("preamble"):
+                continue
+            trimmed["preamble"] = ""
+        else:
+            del trimmed["sections"][part]
+        dropped.append(part)
+    return trimmed, dropped
+
+
+def _trim_candidates(spec: dict) -> list[str]:
+    sections = list(spec["sections"])
+    custom = [
+        name
+        for name in reversed(sections)
+        if name not in _TRIM_ORDER and name not in _PROTECTED_SECTIONS
+    ]
+    known = [part for part in _TRIM_ORDER if part == "preamble" or part in sections]
+    return custom + known
+
+
+def _tidy(text: str) -> str:
+    lines = "\n".join(line.rstrip() for line in text.splitlines())
+    return _BLANK_RUNS.sub("\n\n", _RULE_LINE.sub("", lines)).strip()
@@ -1,12 +1,46 @@
 """Prompt construction utilities for AgentForge."""
 # TODO: Implement prompt building for agent outputs.
 
-import json
+from agentforge.core import prompt_budget, tracing
+
+
+# Bump whenever the prompt text changes so cached generation fingerprints expire.
+PROMPT_TEMPLATE_VERSION = 1
 
 
 def build_agent_generation_prompt(spec: dict, repo_meta: dict) -> str:
-    spec_text = json.dumps(spec, indent=2, sort_keys=True, ensure_ascii=True)
-    repo_text = json.dumps(repo_meta, indent=2, sort_keys=True, ensure_ascii=True)
+    """Build the generation prompt, applying the prompt-budget settings.
+
+    Compact mode (or a token budget) drops the spec's ``raw`` copy and encodes
+    JSON without indentation; a budget then trims optional spec sections.
+    """
+    compact = prompt_budget.compact_enabled()
+    budget = prompt_budget.token_budget()
+    with tracing.span("build_prompt") as span:
+        prompt_spec = prompt_budget.compact_spec(spec) if compact or budget else spec
+        prompt = _build_agent_generation_prompt(prompt_spec, repo_meta, compact)
+        dropped: list[str] = []
+        if budget is not None and prompt_budget.estimate_tokens(prompt) > budget:
+            spec_tokens = prompt_budget.estimate_tokens(prompt_budget.encode(prompt_spec, compact))
+            overhead = prompt_budget.estimate_tokens(prompt) - spec_tokens
+            prompt_spec, dropped = prompt_budget.trim_spec(prompt_spec, budget - overhead, compact)
+            prompt = _build_agent_generation_prompt(prompt_spec, repo_meta, compact)
+        if span:
+            span.set(
+                prompt_bytes=len(prompt.encode("utf-8")),
+                prompt_bytes_before=len(
+                    _build_agent_generation_prompt(spec, repo_meta, False).encode("utf-8")
+                ),
+                prompt_tokens=prompt_budget.estimate_tokens(prompt),
+                trimmed_sections=len(dropped),
+                trimmed=",".join(dropped),
+            )
+    return prompt
+
+
+def _build_agent_generation_prompt(spec: dict, repo_meta: dict, compact: bool = False) -> str:
+    spec_text = prompt_budget.encode(spec, compact)
+    repo_text = prompt_budget.encode(repo_meta, compact)
 
     return (
         "You are designing role-based AI agents.\n"
@@ -40,8 +74,20 @@ def build_agent_generation_prompt(spec: dict, repo_meta: dict) -> str:
         "}\n"
         "Required fields: name, role, responsibilities, constraints.\n"
         "Optional fields: exclusions, communication_style.\n\n"
+        f"{_shard_note(spec)}"
         "Specification:\n"
         f"{spec_text}\n\n"
         "Repository Metadata:\n"
         f"{repo_text}\n"
     )
+
+
+def _shard_note(spec: dict) -> str:
+    focus = spec.get("focus")
+    if not focus:
+        return ""
+    return (
+        "This specification is one shard of a larger spec. Design agents only for the "
+        f"work under its focus ({', '.join(focus)}); the other sections are shared context. "
+        "Agents from other shards are merged afterwards, so reuse clear role names.\n\n"
+    )
@@ -3,12 +3,21 @@
 
 from __future__ import annotations
 
-from collections import Counter
+from collections import Counter, deque
 from pathlib import Path
-import configparser
+import hashlib
 import json
+import math
 import os
-import tomllib
+import threading
+import time
+
+from agentforge.core import cache, tracing
+
+# Type checkers treat this as True; importing typing for it would slow startup.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from agentforge.core.framework_signatures import SignatureIndex
 
 
 _EXTENSION_LANGUAGE = {
@@ -39,17 +48,6 @@ _EXTENSION_LANGUAGE = {
     ".yml": "YAML",
 }
 
-_FRAMEWORK_DEPENDENCIES = {
-    "fastapi": "FastAPI",
-    "django": "Django",
-    "flask": "Flask",
-    "react": "React",
-    "next": "Next.js",
-    "vue": "Vue",
-    "svelte": "Svelte",
-    "express": "Express",
-}
-
 _IGNORE_DIRS = {
     ".git",
     ".beads",
@@ -65,41 +63,132 @@ _IGNORE_DIRS = {
 }
 
 
-def analyze_repo(root: str) -> dict:
+_TEST_DIR_NAMES = {"tests", "test", "__tests__"}
+_TEST_FILE_SUFFIXES = ("_test.py", ".spec.js", ".test.js", ".spec.ts", ".test.ts")
+
+# Manifests whose dependencies are parsed; other signature files (marker
+# files and config globs) come from the framework table in framework_signatures.py.
+_DEPENDENCY_MANIFESTS = frozenset(
+    {
+        "requirements.txt",
+        "pyproject.toml",
+        "setup.cfg",
+        "setup.py",
+        "Pipfile",
+        "package.json",
+        "Cargo.toml",
+        "go.mod",
+        "Gemfile",
+        "composer.json",
+    }
+)
+# Parsed dependency manifests by (file name, content digest, signature table
+# digest), shared across calls so identical manifests in a monorepo or a warm
+# daemon parse once.
+_PARSED_MANIFESTS: dict[tuple[str, str, str], list[str]] = {}
+_PARSED_MANIFESTS_LIMIT = 4096
+
+_SIZE_BOUNDARIES = (50, 200)
+_SAMPLE_DIRS_PER_DEPTH = 256
+# The fewest directories per level that still give a variance estimate.
+_SAMPLE_MIN_DIRS_PER_DEPTH = 2
+# Only an exact scan reports full confidence.
+_SAMPLE_MAX_CONFIDENCE = 0.99
+
+SNAPSHOT_VERSION = 3
+# Loaded snapshots by (resolved repository, snapshot path) with the (mtime,
+# size) of the snapshot file they match; None unless ``enable_memo`` was called.
+_memo: dict[tuple[str, str], tuple[tuple[int, int], dict]] | None = None
+# Memo keys this process loaded or saved, for ``memo_updates``.
+_memo_changed: set[tuple[str, str]] = set()
+# Directories modified this close to the previous scan may have changed within
+# the same mtime tick, so they are always rescanned.
+_MTIME_SAFETY_NS = 2_000_000_000
+
+
+def enable_memo() -> None:
+    """Keep snapshots in memory until their file changes (used by ``agentforge serve``)."""
+    global _memo
+    if _memo is None:
+        _memo = {}
+
+
+def memo_updates() -> list:
+    """Snapshots this process loaded or saved, as JSON for ``adopt_memo``."""
+    if _memo is None:
+        return []
+    updates = [
+        [list(key), list(_memo[key][0]), _memo[key][1]] for key in _memo_changed if key in _memo
+    ]
+    _memo_changed.clear()
+    return updates
+
+
+def adopt_memo(updates: list) -> None:
+    """Take over snapshots that a forked request loaded or saved."""
+    if _memo is None:
+        return
+    for key, version, data in updates:
+        _memo[tuple(key)] = (tuple(version), data)
+
+
+@tracing.traced("analyze_repo")
+def analyze_repo(
+    root: str,
+    snapshot_path: str | None = None,
+    full_rescan: bool = False,
+    workers: int = 1,
+    sample_budget_seconds: float | None = None,
+    sample_max_files: int | None = None,
+) -> dict:
     root_path = Path(root)
+    if sample_budget_seconds is not None or sample_max_files is not None:
+        return _analyze_sampled(root_path, sample_budget_seconds, sample_max_files)
+
+    signatures = _signatures()
+    previous = None
+    if snapshot_path and not full_rescan:
+        previous = _load_snapshot(Path(snapshot_path), root_path)
+    if previous is not None and previous.get("signatures") != signatures.digest:
+        # Directory entries list the signature files of the table they were scanned with.
+        previous = None
+
+    scan_started_ns = time.time_ns()
+    directories = _collect_directories(root_path, previous, workers)
+
+    trusted_before = previous.get("scanned_at_ns", 0) - _MTIME_SAFETY_NS if previous else 0
+    manifests = _parse_manifests(
+        root_path,
+        _manifest_paths(directories.items()),
+        previous.get("manifests", {}) if previous else {},
+        trusted_before,
+        workers,
+    )
+
+    if snapshot_path:
+        _save_snapshot(
+            Path(snapshot_path),
+            {
+                "version": SNAPSHOT_VERSION,
+                "root": str(root_path.resolve()),
+                "signatures": signatures.digest,
+                "scanned_at_ns": scan_started_ns,
+                "dirs": directories,
+                "manifests": manifests,
+            },
+        )
+
+    return _summarize(root_path, directories, manifests)
+
+
+def _summarize(root_path: Path, directories: dict[str, dict], manifests: dict) -> dict:
     extension_counts: Counter[str] = Counter()
     total_files = 0
     tests_exist = False
-    frameworks: set[str] = set()
-
-    for dirpath, dirnames, filenames in os.walk(root_path):
-        dirnames[:] = [d for d in dirnames if d not in _IGNORE_DIRS]
-
-        for filename in filenames:
-            total_files += 1
-            ext = Path(filename).suffix.lower()
-            if ext in _EXTENSION_LANGUAGE:
-                extension_counts[ext] += 1
-
-            lower_name = filename.lower()
-            if (
-                lower_name.startswith("test_")
-                or lower_name.endswith("_test.py")
-                or lower_name.endswith(".spec.js")
-                or lower_name.endswith(".test.js")
-                or lower_name.endswith(".spec.ts")
-                or lower_name.endswith(".test.ts")
-            ):
-                tests_exist = True
-
-        if not tests_exist:
-            for dirname in dirnames:
-                if dirname.lower() in {"tests", "test", "__tests__"}:
-                    tests_exist = True
-                    break
-
-    frameworks.update(_detect_frameworks_from_files(root_path))
-    frameworks.update(_detect_frameworks_from_dependencies(root_path))
+    for entry in directories.values():
+        total_files += entry["files"]
+        extension_counts.update(entry["ext"])
+        tests_exist = tests_exist or entry["tests"]
 
     languages: Counter[str] = Counter()
     for ext, count in extension_counts.items():
@@ -108,69 +197,558 @@ def analyze_repo(root: str) -> dict:
 
     size = _classify_size(total_files)
 
-    return {
+    frameworks, packages = _frameworks_by_package(manifests)
+    metadata = {
         "root": str(root_path),
         "primary_languages": primary_languages,
         "languages": dict(languages),
-        "frameworks": sorted(frameworks),
+        "frameworks": frameworks,
         "tests": tests_exist,
         "size": size,
     }
+    if packages:
+        metadata["packages"] = packages
+    return metadata
+
+
+def _collect_directories(
+    root_path: Path, previous: dict | None, workers: int = 1
+) -> dict[str, dict]:
+    """Return per-directory stats keyed by relative path, in os.walk order.
+
+    Directories whose mtime matches the previous snapshot reuse their stored
+    listing; only their subdirectories still need a ``stat`` call.
+    """
+    old_dirs = previous.get("dirs", {}) if previous else {}
+    trusted_before = previous.get("scanned_at_ns", 0) - _MTIME_SAFETY_NS if previous else 0
+    if workers > 1:
+        return _collect_directories_parallel(root_path, old_dirs, trusted_before, workers)
+
+    directories: dict[str, dict] = {}
+    stack = ["."]
+    while stack:
+        rel = stack.pop()
+        entry = _visit_directory(root_path, rel, old_dirs, trusted_before)
+        if entry is None:
+            continue
+        directories[rel] = entry
+        stack.extend(reversed(_child_paths(rel, entry)))
+    return directories
+
+
+def _collect_directories_parallel(
+    root_path: Path, old_dirs: dict, trusted_before: int, workers: int
+) -> dict[str, dict]:
+    # Each worker pushes and pops its own deque (LIFO, depth-first) and steals
+    # from the far end of another worker's deque when it runs dry.
+    queues = [deque() for _ in range(workers)]
+    queues[0].append(".")
+    found: list[dict[str, dict]] = [{} for _ in range(workers)]
+    errors: list[BaseException] = []
+    condition = threading.Condition()
+    outstanding = 1
+
+    def take(index: int) -> str | None:
+        try:
+            return queues[index].pop()
+        except IndexError:
+            pass
+        for offset in range(1, workers):
+            try:
+                return queues[(index + offset) % workers].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def work(index: int) -> None:
+        nonlocal outstanding
+        while True:
+            rel = take(index)
+            if rel is None:
+                with condition:
+                    if outstanding == 0 or errors:
+                        return
+                    condition.wait(0.005)
+                continue
+            try:
+                entry = _visit_directory(root_path, rel, old_dirs, trusted_before)
+            except BaseException as exc:  # surface worker failures to the caller
+                with condition:
+                    errors.append(exc)
+                    condition.notify_all()
+                return
+            children = _child_paths(rel, entry) if entry is not None else []
+            if entry is not None:
+                found[index][rel] = entry
+            with condition:
+                outstanding += len(children) - 1
+                queues[index].extend(reversed(children))
+                condition.notify_all()
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+    merged: dict[str, dict] = {}
+    for partial in found:
+        merged.update(partial)
+
+    # Reassemble os.walk order so the summary matches the serial scan exactly.
+    directories: dict[str, dict] = {}
+    stack = ["."]
+    while stack:
+        rel = stack.pop()
+        entry = merged.get(rel)
+        if entry is None:
+            continue
+        directories[rel] = entry
+        stack.extend(reversed(_child_paths(rel, entry)))
+    return directories
+
+
+def _visit_directory(
+    root_path: Path, rel: str, old_dirs: dict, trusted_before: int
+) -> dict | None:
+    path = root_path if rel == "." else root_path / rel
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    entry = old_dirs.get(rel)
+    if entry is None or entry.get("mtime_ns") != mtime_ns or mtime_ns >= trusted_before:
+        entry = _scan_directory(path, mtime_ns)
+    return entry
+
+
+def _child_paths(rel: str, entry: dict) -> list[str]:
+    if rel == ".":
+        return list(entry["subdirs"])
+    return [os.path.join(rel, name) for name in entry["subdirs"]]
+
+
+def _scan_directory(path: Path, mtime_ns: int) -> dict | None:
+    ext_counts: dict[str, int] = {}
+    files = 0
+    tests = False
+    subdirs: list[str] = []
+    manifests: list[str] = []
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return None
+    signatures = _signatures()
+    walk_filter = signatures.walk_filter()
+    signature_names, signature_prefixes, signature_extensions = walk_filter or (
+        frozenset(),
+        {},
+        frozenset(),
+    )
+
+    for dir_entry in entries:
+        name = dir_entry.name
+        try:
+            is_dir = dir_entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            if name in _IGNORE_DIRS:
+                continue
+            if name.lower() in _TEST_DIR_NAMES:
+                tests = True
+            # Like os.walk, list symlinked directories but do not descend into them.
+            if not dir_entry.is_symlink():
+                subdirs.append(name)
+            continue
 
+        files += 1
+        ext = _suffix(name)
+        if ext in _EXTENSION_LANGUAGE:
+            ext_counts[ext] = ext_counts.get(ext, 0) + 1
+        if not tests and _is_test_file(name):
+            tests = True
+        # is_signature_file, inlined: this loop runs for every file in the tree.
+        prefixes = signature_prefixes.get(name[0])
+        if (
+            name in _DEPENDENCY_MANIFESTS
+            or name in signature_names
+            or (prefixes is not None and name.startswith(prefixes))
+            or (
+                (walk_filter is None or ext in signature_extensions)
+                and signatures.is_signature_file(name, ext)
+            )
+        ):
+            manifests.append(name)
+
+    entry = {
+        "mtime_ns": mtime_ns,
+        "files": files,
+        "ext": ext_counts,
+        "tests": tests,
+        "subdirs": subdirs,
+    }
+    if manifests:
+        entry["manifests"] = manifests
+    return entry
+
+
+def _suffix(name: str) -> str:
+    # Same rule as pathlib.PurePath.suffix, without building a Path per file.
+    index = name.rfind(".")
+    if 0 < index < len(name) - 1:
+        return name[index:].lower()
+    return ""
+
+
+def _is_test_file(name: str) -> bool:
+    lower_name = name.lower()
+    return lower_name.startswith("test_") or lower_name.endswith(_TEST_FILE_SUFFIXES)
+
+
+def _load_snapshot(path: Path, root_path: Path) -> dict | None:
+    key = (str(root_path.resolve()), str(path))
+    version = _snapshot_version(path) if _memo is not None else None
+    if version is not None:
+        cached = _memo.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    if data.get("root") != key[0]:
+        return None
+    if version is not None:
+        _memo[key] = (version, data)
+        _memo_changed.add(key)
+    return data
+
+
+def _save_snapshot(path: Path, data: dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    version = _snapshot_version(path) if _memo is not None else None
+    if version is not None:
+        key = (data["root"], str(path))
+        _memo[key] = (version, data)
+        _memo_changed.add(key)
+
+
+def _snapshot_version(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def default_snapshot_path(root: str) -> Path:
+    digest = hashlib.sha256(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache.default_cache_root() / "snapshots" / f"{digest}.json"
+
+
+def _analyze_sampled(
+    root_path: Path, budget_seconds: float | None, max_files: int | None
+) -> dict:
+    """Estimate repository metadata from a depth-stratified sample of directories.
+
+    Each depth level is sampled uniformly (up to ``_SAMPLE_DIRS_PER_DEPTH``
+    directories) and every sampled directory is weighted by the inverse of its
+    inclusion probability, so counts are unbiased estimates of the full scan.
+    Every level down to the deepest one gets half of the budget left when it is
+    reached, and at least ``_SAMPLE_MIN_DIRS_PER_DEPTH`` directories even once
+    the budget is spent, so no level goes unobserved. Small trees are scanned
+    completely and reported as exact.
+    """
+    import random
+
+    seed = int(hashlib.sha256(str(root_path).encode("utf-8")).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+
+    def level_budget() -> tuple[float | None, float | None]:
+        level_deadline = level_max_files = None
+        if deadline is not None:
+            now = time.monotonic()
+            level_deadline = now + max(deadline - now, 0.0) / 2
+        if max_files is not None:
+            level_max_files = files_examined + max(max_files - files_examined, 0) / 2
+        return level_deadline, level_max_files
+
+    def exhausted(level_deadline: float | None, level_max_files: float | None) -> bool:
+        if level_deadline is not None and time.monotonic() >= level_deadline:
+            return True
+        return level_max_files is not None and files_examined >= level_max_files
+
+    extension_estimates: Counter[str] = Counter()
+    files_estimate = 0.0
+    variance = 0.0
+    tests_exist = False
+    exact = True
+    directories_scanned = 0
+    files_examined = 0
+    estimated_directories = 0.0
+    depth = 0
+    sampled_manifests: list[tuple[str, dict]] = []
+
+    frontier: list[tuple[str, float]] = [(".", 1.0)]
+    while frontier:
+        population = len(frontier)
+        estimated_directories += sum(weight for _, weight in frontier)
+        rng.shuffle(frontier)
+        scanned: list[tuple[str, float, dict]] = []
+        limits = level_budget()
+        for rel, weight in frontier[:_SAMPLE_DIRS_PER_DEPTH]:
+            if len(scanned) >= _SAMPLE_MIN_DIRS_PER_DEPTH and exhausted(*limits):
+                break
+            entry = _scan_directory(root_path if rel == "." else root_path / rel, 0)
+            if entry is None:
+                continue
+            scanned.append((rel, weight, entry))
+            files_examined += entry["files"]
 
-def analyze_repository(path: str) -> dict:
-    return analyze_repo(path)
-
-
-def _classify_size(total_files: int) -> str:
-    if total_files < 50:
-        return "small"
-    if total_files < 200:
-        return "medium"
-    return "large"
-
-
-def _detect_frameworks_from_files(root_path: Path) -> set[str]:
-    frameworks: set[str] = set()
-
-    if (root_path / "manage.py").exists():
-        frameworks.add("Django")
+        sampled = len(scanned)
+        directories_scanned += sampled
+        if sampled == 0:
+            break
+        if sampled < population:
+            exact = False
+        scale = population / sampled
+
+        values = [weight * entry["files"] for _, weight, entry in scanned]
+        files_estimate += scale * sum(values)
+        if 1 < sampled < population:
+            mean = sum(values) / sampled
+            sample_variance = sum((value - mean) ** 2 for value in values) / (sampled - 1)
+            variance += population**2 * (1 - sampled / population) * sample_variance / sampled
+
+        next_frontier: list[tuple[str, float]] = []
+        for rel, weight, entry in scanned:
+            sampled_manifests.append((rel, entry))
+            tests_exist = tests_exist or entry["tests"]
+            for ext, count in entry["ext"].items():
+                extension_estimates[ext] += scale * weight * count
+            next_frontier.extend((child, weight * scale) for child in _child_paths(rel, entry))
+
+        depth += 1
+        frontier = next_frontier
+
+    manifests = _parse_manifests(root_path, _manifest_paths(sampled_manifests), {}, 0)
 
-    if (root_path / "next.config.js").exists() or (root_path / "next.config.mjs").exists():
-        frameworks.add("Next.js")
+    languages: Counter[str] = Counter()
+    for ext, count in extension_estimates.items():
+        languages[_EXTENSION_LANGUAGE[ext]] += count
+    languages = Counter({name: round(count) for name, count in languages.items()})
+    total_files = round(files_estimate)
+    standard_error = math.sqrt(variance)
 
-    if (root_path / "vite.config.js").exists() or (root_path / "vite.config.ts").exists():
-        frameworks.add("Vite")
+    frameworks, packages = _frameworks_by_package(manifests)
+    metadata = {
+        "root": str(root_path),
+        "primary_languages": [name for name, _ in languages.most_common()],
+        "languages": dict(languages),
+        "frameworks": frameworks,
+        "tests": tests_exist,
+        "size": _classify_size(total_files),
+    }
+    if packages:
+        metadata["packages"] = packages
+    metadata["sampling"] = {
+        "exact": exact,
+        "depth_reached": depth,
+        "directories_scanned": directories_scanned,
+        "files_examined": files_examined,
+        "estimated_directories": round(estimated_directories),
+        "estimated_files": total_files,
+        "files_standard_error": round(standard_error, 1),
+        "size_confidence": 1.0
+        if exact
+        else min(_size_confidence(files_estimate, standard_error), _SAMPLE_MAX_CONFIDENCE),
+        "tests_confidence": 1.0
+        if exact or tests_exist
+        else round(directories_scanned / max(estimated_directories, 1.0), 3),
+    }
+    return metadata
 
-    return frameworks
 
+def _size_confidence(estimate: float, standard_error: float) -> float:
+    # Normal approximation of the chance the estimate falls in the true bucket.
+    if standard_error == 0:
+        return 1.0
+    distance = min(abs(estimate - boundary) for boundary in _SIZE_BOUNDARIES)
+    probability = 0.5 * (1 + math.erf(distance / (standard_error * math.sqrt(2))))
+    return round(probability, 3)
 
-def _detect_frameworks_from_dependencies(root_path: Path) -> set[str]:
-    frameworks: set[str] = set()
-    dependency_names = set()
 
-    dependency_names.update(_read_requirements_txt(root_path))
-    dependency_names.update(_read_pyproject_dependencies(root_path))
-    dependency_names.update(_read_setup_cfg_dependencies(root_path))
-    dependency_names.update(_read_setup_py_dependencies(root_path))
-    dependency_names.update(_read_pipfile_dependencies(root_path))
-    dependency_names.update(_read_package_json_dependencies(root_path))
+def analyze_repository(path: str) -> dict:
+    return analyze_repo(path)
 
-    for dep in dependency_names:
-        key = dep.lower()
-        if key in _FRAMEWORK_DEPENDENCIES:
-            frameworks.add(_FRAMEWORK_DEPENDENCIES[key])
 
-    return frameworks
+def _classify_size(total_files: int) -> str:
+    if total_files < _SIZE_BOUNDARIES[0]:
+        return "small"
+    if total_files < _SIZE_BOUNDARIES[1]:
+        return "medium"
+    return "large"
 
 
-def _read_requirements_txt(root_path: Path) -> set[str]:
+def _manifest_paths(directories) -> list[str]:
+    """Relative paths of the manifests found while walking ``directories``."""
+    paths = []
+    for rel, entry in directories:
+        for name in entry.get("manifests", ()):
+            paths.append(name if rel == "." else os.path.join(rel, name))
+    return paths
+
+
+def _parse_manifests(
+    root_path: Path,
+    paths: list[str],
+    previous: dict[str, dict],
+    trusted_before: int,
+    workers: int = 1,
+) -> dict[str, dict]:
+    """Return the frameworks each manifest implies, keyed by relative path.
+
+    A manifest whose size and mtime match ``previous`` is not read again; one
+    whose content digest matches is not parsed again. Dependency manifests are
+    read and parsed on up to ``workers`` threads.
+    """
+    signatures = _signatures()
+    results: dict[str, dict] = {}
+    pending: list[str] = []
+    for rel in paths:
+        name = os.path.basename(rel)
+        if name not in _DEPENDENCY_MANIFESTS:
+            found = signatures.frameworks_for_file(name, _suffix(name))
+            results[rel] = {"frameworks": sorted(found)}
+            continue
+        try:
+            stat = os.stat(root_path / rel)
+        except OSError:
+            continue
+        old = previous.get(rel)
+        if (
+            old is not None
+            and old.get("mtime_ns") == stat.st_mtime_ns
+            and old.get("size") == stat.st_size
+            and stat.st_mtime_ns < trusted_before
+        ):
+            results[rel] = old
+        else:
+            pending.append(rel)
+
+    def parse(rel: str) -> dict | None:
+        path = root_path / rel
+        try:
+            stat = os.stat(path)
+            data = path.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        old = previous.get(rel)
+        if old is not None and old.get("sha256") == digest:
+            found = old["frameworks"]
+        else:
+            found = _manifest_frameworks(os.path.basename(rel), data, digest, signatures)
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "frameworks": found,
+        }
+
+    for rel, record in zip(pending, _map_threads(parse, pending, workers)):
+        if record is not None:
+            results[rel] = record
+    return {rel: results[rel] for rel in paths if rel in results}
+
+
+def _map_threads(function, items: list, workers: int) -> list:
+    if workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    results: list = [None] * len(items)
+    positions = iter(range(len(items)))
+    lock = threading.Lock()
+    errors: list[BaseException] = []
+
+    def work() -> None:
+        while True:
+            with lock:
+                index = next(positions, None)
+            if index is None:
+                return
+            try:
+                results[index] = function(items[index])
+            except BaseException as exc:  # surface worker failures to the caller
+                errors.append(exc)
+                return
+
+    threads = [threading.Thread(target=work) for _ in range(min(workers, len(items)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def _signatures() -> SignatureIndex:
+    # Imported on first use so that loading the analyzer stays cheap.
+    from agentforge.core import framework_signatures
+
+    return framework_signatures.get_index()
+
+
+def _manifest_frameworks(
+    name: str, data: bytes, digest: str, signatures: SignatureIndex
+) -> list[str]:
+    key = (name, digest, signatures.digest)
+    cached = _PARSED_MANIFESTS.get(key)
+    if cached is not None:
+        return cached
+    try:
+        dependency_names = _MANIFEST_READERS[name](data.decode("utf-8-sig"))
+    except ValueError:
+        # Unreadable manifests (bad encoding, TOML or JSON) imply nothing.
+        dependency_names = set()
+    found = signatures.frameworks_for_dependencies(dependency_names)
+    found.update(signatures.frameworks_for_file(name, _suffix(name)))
+    result = sorted(found)
+    if len(_PARSED_MANIFESTS) >= _PARSED_MANIFESTS_LIMIT:
+        _PARSED_MANIFESTS.clear()
+    _PARSED_MANIFESTS[key] = result
+    return result
+
+
+def _frameworks_by_package(manifests: dict[str, dict]) -> tuple[list[str], dict[str, list[str]]]:
+    """Return all frameworks, and per directory when any is below the root."""
+    by_package: dict[str, set[str]] = {}
+    for rel, record in manifests.items():
+        if record["frameworks"]:
+            package = os.path.dirname(rel) or "."
+            by_package.setdefault(package, set()).update(record["frameworks"])
+    frameworks = sorted(set().union(*by_package.values()))
+    if set(by_package) <= {"."}:
+        return frameworks, {}
+    return frameworks, {package: sorted(by_package[package]) for package in sorted(by_package)}
+
+
+def _requirements_txt_dependencies(text: str) -> set[str]:
     reqs = set()
-    path = root_path / "requirements.txt"
-    if not path.exists():
-        return reqs
-
-    for line in path.read_text(encoding="utf-8").splitlines():
+    for line in text.splitlines():
         cleaned = line.strip()
         if not cleaned or cleaned.startswith("#"):
             continue
@@ -179,34 +757,32 @@ def _read_requirements_txt(root_path: Path) -> set[str]:
     return reqs
 
 
-def _read_pyproject_dependencies(root_path: Path) -> set[str]:
-    deps = set()
-    path = root_path / "pyproject.toml"
-    if not path.exists():
-        return deps
+def _pyproject_dependencies(text: str) -> set[str]:
+    import tomllib
 
-    data = tomllib.loads(path.read_text(encoding="utf-8"))
-    project = data.get("project", {})
-    for item in project.get("dependencies", []) or []:
-        deps.add(_normalize_dep_name(item))
+    deps = set()
+    data = tomllib.loads(text)
+    project = _table(data.get("project"))
+    requirements = project.get("dependencies")
+    if isinstance(requirements, list):
+        deps.update(_normalize_dep_name(item) for item in requirements if isinstance(item, str))
 
-    poetry = data.get("tool", {}).get("poetry", {})
-    for name in (poetry.get("dependencies", {}) or {}).keys():
-        deps.add(name)
-    for name in (poetry.get("group", {}) or {}).get("dev", {}).get("dependencies", {}).keys():
-        deps.add(name)
+    poetry = _table(_table(data.get("tool")).get("poetry"))
+    deps.update(_table(poetry.get("dependencies")))
+    deps.update(_table(_table(_table(poetry.get("group")).get("dev")).get("dependencies")))
 
     return deps
 
 
-def _read_setup_cfg_dependencies(root_path: Path) -> set[str]:
-    deps = set()
-    path = root_path / "setup.cfg"
-    if not path.exists():
-        return deps
+def _setup_cfg_dependencies(text: str) -> set[str]:
+    import configparser
 
+    deps = set()
     parser = configparser.ConfigParser()
-    parser.read(path, encoding="utf-8")
+    try:
+        parser.read_string(text)
+    except configparser.Error as exc:
+        raise ValueError(str(exc)) from exc
     for section in ("options", "options.extras_require"):
         if not parser.has_section(section):
             continue
@@ -218,27 +794,14 @@ def _read_setup_cfg_dependencies(root_path: Path) -> set[str]:
     return deps
 
 
-def _read_setup_py_dependencies(root_path: Path) -> set[str]:
-    deps = set()
-    path = root_path / "setup.py"
-    if not path.exists():
-        return deps
-
-    content = path.read_text(encoding="utf-8").lower()
-    for dep_name in _FRAMEWORK_DEPENDENCIES.keys():
-        if dep_name in content:
-            deps.add(dep_name)
-    return deps
+def _setup_py_dependencies(text: str) -> set[str]:
+    # setup.py is code, so look for quoted names of known dependencies instead.
+    return _signatures().dependencies_in_text(text)
 
 
-def _read_pipfile_dependencies(root_path: Path) -> set[str]:
+def _pipfile_dependencies(text: str) -> set[str]:
     deps = set()
-    path = root_path / "Pipfile"
-    if not path.exists():
-        return deps
-
-    content = path.read_text(encoding="utf-8")
-    for line in content.splitlines():
+    for line in text.splitlines():
         cleaned = line.strip()
         if cleaned.startswith("[") or cleaned.startswith("#") or "=" not in cleaned:
             continue
@@ -248,18 +811,82 @@ def _read_pipfile_dependencies(root_path: Path) -> set[str]:
     return deps
 
 
-def _read_package_json_dependencies(root_path: Path) -> set[str]:
+def _package_json_dependencies(text: str) -> set[str]:
     deps = set()
-    path = root_path / "package.json"
-    if not path.exists():
+    data = json.loads(text)
+    if not isinstance(data, dict):
         return deps
-
-    data = json.loads(path.read_text(encoding="utf-8"))
     for section in ("dependencies", "devDependencies", "peerDependencies"):
-        deps.update((data.get(section, {}) or {}).keys())
+        deps.update(_table(data.get(section)))
+    return deps
+
+
+def _cargo_toml_dependencies(text: str) -> set[str]:
+    import tomllib
+
+    data = tomllib.loads(text)
+    deps = set()
+    for table in (data, _table(data.get("workspace"))):
+        for section in ("dependencies", "dev-dependencies", "build-dependencies"):
+            deps.update(_table(table.get(section)))
+    return deps
+
+
+def _go_mod_dependencies(text: str) -> set[str]:
+    deps = set()
+    in_block = False
+    for line in text.splitlines():
+        fields = line.split("//", 1)[0].split()
+        if not fields:
+            continue
+        if in_block:
+            if fields[0] == ")":
+                in_block = False
+            else:
+                deps.add(fields[0])
+        elif fields[0] == "require":
+            if fields[1:] == ["("]:
+                in_block = True
+            elif len(fields) > 1:
+                deps.add(fields[1])
     return deps
 
 
+def _gemfile_dependencies(text: str) -> set[str]:
+    import re
+
+    return set(re.findall(r"""^\s*gem\s+["']([^"']+)["']""", text, re.MULTILINE))
+
+
+def _composer_json_dependencies(text: str) -> set[str]:
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        return set()
+    deps = set()
+    for section in ("require", "require-dev"):
+        deps.update(_table(data.get(section)))
+    return deps
+
+
+def _table(value: object) -> dict:
+    # Manifests anywhere in the tree may be fixtures with any shape; ignore odd sections.
+    return value if isinstance(value, dict) else {}
+
+
+_MANIFEST_READERS = {
+    "requirements.txt": _requirements_txt_dependencies,
+    "pyproject.toml": _pyproject_dependencies,
+    "setup.cfg": _setup_cfg_dependencies,
+    "setup.py": _setup_py_dependencies,
+    "Pipfile": _pipfile_dependencies,
+    "package.json": _package_json_dependencies,
+    "Cargo.toml": _cargo_toml_dependencies,
+    "go.mod": _go_mod_dependencies,
+    "Gemfile": _gemfile_dependencies,
+    "composer.json": _composer_json_dependencies,
+}
+
+
 def _normalize_dep_name(raw: str) -> str:
     cleaned = raw.strip().split(";")[0].strip()
     if not cleaned:
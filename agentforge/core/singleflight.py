@@ -0,0 +1,152 @@
+"""Coalescing of identical in-flight codex executions.
+
+Concurrent calls with the same key share one execution and its result or
+exception. ``FileLock`` extends this across processes: the first process to
+lock a key runs codex, the others wait and then read its response from the
+shared response cache.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+import os
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: object = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; duplicates wait for its outcome."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        # Async calls are keyed by event loop too, since tasks are loop-bound.
+        self._tasks: dict[tuple[int, str], list] = {}
+
+    def do(self, key: str, func: Callable[[], object]) -> tuple[object, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for callers that waited."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def do_async(
+        self, key: str, factory: Callable[[], Awaitable[object]]
+    ) -> tuple[object, bool]:
+        """Async counterpart of ``do``.
+
+        The shared work runs in its own task, so one caller being cancelled does
+        not cancel it for the others; it is cancelled when the last caller goes.
+        """
+        import asyncio
+
+        loop_key = (id(asyncio.get_running_loop()), key)
+        entry = self._tasks.get(loop_key)
+        shared = entry is not None
+        if entry is None:
+            task = asyncio.ensure_future(factory())
+            entry = [task, 0]
+            self._tasks[loop_key] = entry
+
+            def forget(_task: asyncio.Future) -> None:
+                if self._tasks.get(loop_key) is entry:
+                    del self._tasks[loop_key]
+
+            task.add_done_callback(forget)
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+
+class FileLock:
+    """Exclusive advisory lock on ``<directory>/<key>.lock`` (POSIX only).
+
+    The lock file is removed on release; acquirers re-check the inode so a
+    waiter never holds a lock on an already unlinked file.
+    """
+
+    def __init__(self, directory: str | Path, key: str) -> None:
+        self.path = Path(directory) / f"{key}.lock"
+        self._fd: int | None = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        import fcntl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, flags)
+                current = os.stat(self.path)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            except FileNotFoundError:
+                os.close(fd)
+                continue
+            except BaseException:
+                os.close(fd)
+                raise
+            if os.fstat(fd).st_ino == current.st_ino:
+                self._fd = fd
+                return True
+            os.close(fd)
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.release()
+
+
+def file_locks_supported() -> bool:
+    # fcntl.flock is the locking primitive; it exists on POSIX only.
+    return os.name == "posix"
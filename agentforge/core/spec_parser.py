@@ -4,6 +4,9 @@
 from __future__ import annotations
 
 from pathlib import Path
+import re
+
+from agentforge.core import tracing
 
 
 REQUIRED_SECTIONS = {"Goals", "Constraints"}
@@ -14,10 +17,43 @@ OPTIONAL_SECTIONS = {
     "Agents",
     "Responsibilities",
 }
+# Sections whose entries (bullets or ``## `` subsections) describe separate agents;
+# sharding splits these and shares every other section.
+_ENTRY_SECTIONS = ("Agents", "Responsibilities")
+_SUBHEADING = re.compile(r"^##\s+(.*)$")
+_TOP_LEVEL_BULLET = re.compile(r"^[-*]\s+(.*)$")
+
+# Parsed specs by resolved path with the (mtime, size) they were parsed at;
+# None unless ``enable_memo`` was called.
+_memo: dict[str, tuple[tuple[int, int], dict]] | None = None
+
 
+def enable_memo() -> None:
+    """Reuse parsed specs until their file changes (used by ``agentforge serve``)."""
+    global _memo
+    if _memo is None:
+        _memo = {}
 
+
+@tracing.traced("parse_spec")
 def parse_spec(path: str) -> dict:
-    spec_path = Path(path)
+    if _memo is None:
+        return _parse_spec(Path(path))
+    resolved = Path(path).resolve()
+    try:
+        stat = resolved.stat()
+    except OSError:
+        return _parse_spec(Path(path))
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _memo.get(str(resolved))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    spec = _parse_spec(Path(path))
+    _memo[str(resolved)] = (version, spec)
+    return spec
+
+
+def _parse_spec(spec_path: Path) -> dict:
     if not spec_path.exists():
         raise FileNotFoundError(f"Spec file not found: {spec_path}")
     if spec_path.is_dir():
@@ -66,3 +102,93 @@ def parse_spec(path: str) -> dict:
         "preamble": preamble_text,
         "sections": sections,
     }
+
+
+def split_spec(spec: dict, max_shards: int = 8) -> list[dict]:
+    """Split a parsed spec into smaller specs that can be generated independently.
+
+    Only the entries of ``Agents``/``Responsibilities`` (bullets or ``## ``
+    subsections) are divided; entries with the same title in both sections
+    stay together. Every other section, and any text in those two sections
+    before their first entry, is repeated in every shard as shared context.
+    Shards carry a ``focus`` label and no ``raw`` text. Specs with fewer than
+    two entries come back as ``[spec]``.
+    """
+    if max_shards < 1:
+        raise ValueError("max_shards must be at least 1.")
+    sections = spec["sections"]
+
+    # Units keyed by casefolded entry title; each maps a section to its entry text.
+    units: dict[str, tuple[str, dict[str, str]]] = {}
+    intros: dict[str, str] = {}
+    for name in _ENTRY_SECTIONS:
+        if name not in sections:
+            continue
+        intro, entries = _split_entries(sections[name])
+        if len(entries) < 2:
+            continue
+        intros[name] = intro
+        for title, entry_text in entries:
+            _, unit = units.setdefault(title.casefold(), (title, {}))
+            unit[name] = f"{unit[name]}\n{entry_text}" if name in unit else entry_text
+
+    if len(units) < 2:
+        return [spec]
+
+    shards = []
+    for group in _pack(list(units.values()), min(max_shards, len(units))):
+        shard_sections: dict[str, str] = {}
+        for name, text in sections.items():
+            if name not in intros:
+                shard_sections[name] = text
+                continue
+            parts = [intros[name]] if intros[name] else []
+            parts.extend(unit[name] for _, unit in group if name in unit)
+            if parts:
+                shard_sections[name] = "\n".join(parts)
+        shards.append(
+            {
+                "preamble": spec.get("preamble", ""),
+                "sections": shard_sections,
+                "focus": [title for title, _ in group],
+            }
+        )
+    return shards
+
+
+def _split_entries(text: str) -> tuple[str, list[tuple[str, str]]]:
+    """Split into the text before the first entry and (title, text) entries.
+
+    Entries are ``## `` subsections when there are any, else top-level bullets.
+    """
+    lines = text.splitlines()
+    pattern = _SUBHEADING if any(_SUBHEADING.match(line) for line in lines) else _TOP_LEVEL_BULLET
+
+    intro: list[str] = []
+    entries: list[tuple[str, list[str]]] = []
+    for line in lines:
+        match = pattern.match(line)
+        if match:
+            entries.append((match.group(1).strip(), [line]))
+        elif entries:
+            entries[-1][1].append(line)
+        else:
+            intro.append(line)
+    titled = [(title, "\n".join(body).strip()) for title, body in entries if title]
+    return "\n".join(intro).strip(), titled
+
+
+def _pack(
+    units: list[tuple[str, dict[str, str]]], bins: int
+) -> list[list[tuple[str, dict[str, str]]]]:
+    # Largest-first into the lightest bin keeps the biggest shard, and so the
+    # slowest codex call, as small as possible.
+    sizes = [sum(len(text) for text in unit.values()) for _, unit in units]
+    groups: list[list[int]] = [[] for _ in range(bins)]
+    loads = [0] * bins
+    for index in sorted(range(len(units)), key=lambda i: sizes[i], reverse=True):
+        lightest = loads.index(min(loads))
+        groups[lightest].append(index)
+        loads[lightest] += sizes[index]
+    ordered = sorted((sorted(group) for group in groups if group), key=lambda group: group[0])
+    return [[units[index] for index in group] for group in ordered]
@@ -0,0 +1,198 @@
+"""Lightweight phase tracing for AgentForge runs.
+
+Tracing is off by default; ``span`` then returns a shared no-op object, so
+instrumented code pays for one function call and a flag check.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextvars import ContextVar
+from functools import wraps
+import json
+import os
+import threading
+import time
+
+
+_enabled = False
+_lock = threading.Lock()
+_records: list[SpanRecord] = []
+# Open spans, innermost last. A ContextVar keeps concurrent asyncio tasks from
+# nesting under each other's spans; new threads start with an empty stack.
+_open_spans: ContextVar[tuple[Span, ...]] = ContextVar("agentforge_open_spans", default=())
+_origin_ns = 0
+
+
+class SpanRecord:
+    __slots__ = ("name", "start_ns", "duration_ns", "child_ns", "thread_id", "attrs")
+
+    def __init__(
+        self,
+        name: str,
+        start_ns: int,
+        duration_ns: int,
+        child_ns: int,
+        thread_id: int,
+        attrs: dict,
+    ) -> None:
+        self.name = name
+        self.start_ns = start_ns
+        self.duration_ns = duration_ns
+        self.child_ns = child_ns
+        self.thread_id = thread_id
+        self.attrs = attrs
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start_ns", "child_ns")
+
+    def __init__(self, name: str, attrs: dict) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+        self.child_ns = 0
+
+    def __bool__(self) -> bool:
+        return True
+
+    def set(self, **attrs: object) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> Span:
+        _open_spans.set(_open_spans.get() + (self,))
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        duration = time.perf_counter_ns() - self.start_ns
+        stack = tuple(span for span in _open_spans.get() if span is not self)
+        _open_spans.set(stack)
+        if stack:
+            stack[-1].child_ns += duration
+        record = SpanRecord(
+            self.name,
+            self.start_ns,
+            duration,
+            self.child_ns,
+            threading.get_ident(),
+            self.attrs,
+        )
+        with _lock:
+            _records.append(record)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def set(self, **_attrs: object) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def enable() -> None:
+    global _enabled, _origin_ns
+    with _lock:
+        _records.clear()
+    _origin_ns = time.perf_counter_ns()
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **attrs: object) -> Span | _NoopSpan:
+    """Time a phase; the returned object is falsy when tracing is off."""
+    if not _enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def records() -> list[SpanRecord]:
+    with _lock:
+        return list(_records)
+
+
+def summarize() -> list[dict]:
+    """Aggregate spans by name; ``self_ms`` excludes time spent in nested spans."""
+    phases: dict[str, dict] = {}
+    for record in records():
+        phase = phases.setdefault(
+            record.name, {"phase": record.name, "calls": 0, "total_ms": 0.0, "self_ms": 0.0}
+        )
+        phase["calls"] += 1
+        phase["total_ms"] += record.duration_ns / 1e6
+        phase["self_ms"] += (record.duration_ns - record.child_ns) / 1e6
+        for key, value in record.attrs.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                phase[key] = phase.get(key, 0) + value
+    return sorted(phases.values(), key=lambda phase: phase["self_ms"], reverse=True)
+
+
+def format_summary() -> str:
+    phases = summarize()
+    total_self = sum(phase["self_ms"] for phase in phases) or 1.0
+    lines = [f"{'phase':<28} {'calls':>6} {'total ms':>10} {'self ms':>10} {'self %':>7}"]
+    for phase in phases:
+        extras = " ".join(
+            f"{key}={phase[key]}"
+            for key in sorted(phase)
+            if key not in {"phase", "calls", "total_ms", "self_ms"}
+        )
+        lines.append(
+            f"{phase['phase']:<28} {phase['calls']:>6} {phase['total_ms']:>10.1f} "
+            f"{phase['self_ms']:>10.1f} {100 * phase['self_ms'] / total_self:>6.1f}%"
+            + (f"  {extras}" if extras else "")
+        )
+    return "\n".join(lines)
+
+
+def write_chrome_trace(path: str) -> None:
+    """Write spans in the Chrome trace-event format (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    events = [
+        {
+            "name": record.name,
+            "ph": "X",
+            "ts": (record.start_ns - _origin_ns) / 1000,
+            "dur": record.duration_ns / 1000,
+            "pid": pid,
+            "tid": record.thread_id,
+            "args": record.attrs,
+        }
+        for record in records()
+    ]
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle, default=str)
+
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Stand-in for the codex CLI used by the benchmark suite.
+
+Point AGENTFORGE_CODEX_PATH at this file. Behaviour is controlled by env vars:
+
+    AGENTFORGE_FAKE_CODEX_LATENCY   seconds to sleep before answering (default 0)
+    AGENTFORGE_FAKE_CODEX_MODE      "agents" (JSON agent list) or "echo" (default agents)
+    AGENTFORGE_FAKE_CODEX_AGENTS    number of agents to emit in agents mode (default 3)
+    AGENTFORGE_FAKE_CODEX_BYTES     approximate response size in bytes for echo mode
+    AGENTFORGE_FAKE_CODEX_CHUNKS    number of flushed writes the response is split into
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+
+def _agents_payload(count: int) -> str:
+    agents = [
+        {
+            "name": f"Agent {index}",
+            "role": f"Synthetic role {index}",
+            "responsibilities": [
+                f"Input: shard {index}",
+                "Output: report.md",
+                "Process: review",
+            ],
+            "constraints": [
+                "Prohibited: scope creep",
+                "Quality gate: tests",
+                "Escalate on conflict",
+            ],
+            "exclusions": [],
+            "communication_style": "Concise",
+        }
+        for index in range(count)
+    ]
+    return "Reading prompt from stdin...\n" + json.dumps({"agents": agents}, indent=2) + "\n"
+
+
+def _echo_payload(prompt: str, size: int) -> str:
+    header = f"Received {len(prompt)} characters.\n"
+    filler = "lorem ipsum dolor sit amet " * (max(size - len(header), 0) // 27 + 1)
+    return header + filler[: max(size - len(header), 0)]
+
+
+def main() -> None:
+    if "--version" in sys.argv[1:]:
+        print("codex-fake 0.0.0")
+        return
+
+    prompt = sys.stdin.read()
+    time.sleep(float(os.environ.get("AGENTFORGE_FAKE_CODEX_LATENCY", "0")))
+
+    mode = os.environ.get("AGENTFORGE_FAKE_CODEX_MODE", "agents")
+    if mode == "echo":
+        payload = _echo_payload(prompt, int(os.environ.get("AGENTFORGE_FAKE_CODEX_BYTES", "1024")))
+    else:
+        payload = _agents_payload(int(os.environ.get("AGENTFORGE_FAKE_CODEX_AGENTS", "3")))
+
+    chunks = max(int(os.environ.get("AGENTFORGE_FAKE_CODEX_CHUNKS", "1")), 1)
+    step = max(len(payload) // chunks, 1)
+    for start in range(0, len(payload), step):
+        sys.stdout.write(payload[start:start + step])
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
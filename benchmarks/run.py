@@ -0,0 +1,265 @@
+"""Benchmark suite for AgentForge.
+
+Each case runs in its own child process so peak RSS is isolated per case.
+Results are printed (or written) as JSON and can be compared against a stored
+baseline to flag regressions.
+
+Usage:
+    python benchmarks/run.py                       # quick profile, JSON to stdout
+    python benchmarks/run.py --profile full        # adds 100k and 1M file repos
+    python benchmarks/run.py --compare benchmarks/baseline.json
+    python benchmarks/run.py --output benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+FAKE_CODEX = BENCH_DIR / "fake_codex.py"
+
+PROFILES = {
+    "quick": {"repo_sizes": [1_000, 10_000], "spec_sections": [20, 200], "iterations": 5},
+    "full": {
+        "repo_sizes": [1_000, 10_000, 100_000, 1_000_000],
+        "spec_sections": [20, 200, 2_000],
+        "iterations": 5,
+    },
+}
+
+# A metric must get this much worse relative to the baseline to count as a regression.
+DEFAULT_THRESHOLD = 0.25
+
+
+def _cases(profile: dict) -> list[dict]:
+    cases = []
+    for files in profile["repo_sizes"]:
+        base = {"kind": "analyze", "files": files}
+        cases.append({**base, "name": f"analyze_repo/full/{files}"})
+        cases.append({**base, "name": f"analyze_repo/workers8/{files}", "workers": 8})
+        cases.append({**base, "name": f"analyze_repo/snapshot/{files}", "snapshot": True})
+    for sections in profile["spec_sections"]:
+        for kind in ("parse_spec", "build_prompt"):
+            cases.append({"name": f"{kind}/{sections}", "kind": kind, "sections": sections})
+    cases.append({"name": "generate_agent_files/fake", "kind": "generate", "agents": 8})
+    cases.append({"name": "run_with_agent/fake/1KB", "kind": "run", "bytes": 1_024})
+    cases.append({"name": "run_with_agent/fake/4MB", "kind": "run", "bytes": 4 * 1024 * 1024})
+    return cases
+
+
+def _run_child(case: dict, workdir: Path, iterations: int) -> dict:
+    """Executed in the child process: time ``iterations`` calls of one case."""
+    sys.path.insert(0, str(BENCH_DIR))
+    import synthetic
+
+    os.environ["AGENTFORGE_CODEX_PATH"] = str(FAKE_CODEX)
+    os.environ.pop("AGENTFORGE_CACHE_DIR", None)
+    kind = case["kind"]
+    units = 1
+    call = None
+
+    if kind == "analyze":
+        from agentforge.core import repo_analyzer
+
+        repo = synthetic.make_repo(workdir / f"repo-{case['files']}", case["files"])
+        snapshot = None
+        if case.get("snapshot"):
+            snapshot = str(workdir / f"snapshot-{case['files']}.json")
+            repo_analyzer.analyze_repo(str(repo), snapshot_path=snapshot)
+        units = case["files"]
+
+        def call() -> None:
+            repo_analyzer.analyze_repo(
+                str(repo), snapshot_path=snapshot, workers=case.get("workers", 1)
+            )
+
+    elif kind in ("parse_spec", "build_prompt"):
+        from agentforge.core import prompt_builder, spec_parser
+
+        spec_path = synthetic.make_spec(workdir / f"spec-{case['sections']}.md", case["sections"])
+        units = spec_path.stat().st_size
+        spec = spec_parser.parse_spec(str(spec_path))
+        repo_meta = {"languages": {"Python": 10}, "frameworks": [], "size": "small"}
+        if kind == "parse_spec":
+            def call() -> None:
+                spec_parser.parse_spec(str(spec_path))
+        else:
+            def call() -> None:
+                prompt_builder.build_agent_generation_prompt(spec, repo_meta)
+
+    elif kind == "generate":
+        try:
+            import jinja2  # noqa: F401
+        except ImportError:
+            return {"skipped": "Jinja2 is not installed"}
+        from agentforge.core import agent_generator
+
+        os.environ["AGENTFORGE_FAKE_CODEX_AGENTS"] = str(case["agents"])
+        spec_path = synthetic.make_spec(workdir / "spec-20.md", 20)
+        repo = synthetic.make_repo(workdir / "repo-1000", 1_000)
+        units = case["agents"]
+
+        def call() -> None:
+            agent_generator.generate_agent_files(
+                str(spec_path), str(repo), str(workdir / "out"), force=True
+            )
+
+    elif kind == "run":
+        from agentforge.core import executor
+
+        os.environ["AGENTFORGE_FAKE_CODEX_MODE"] = "echo"
+        os.environ["AGENTFORGE_FAKE_CODEX_BYTES"] = str(case["bytes"])
+        agent_path = workdir / "agent.md"
+        agent_path.write_text("# Benchmark agent\n", encoding="utf-8")
+        units = case["bytes"]
+
+        def call() -> None:
+            executor.run_with_agent(str(agent_path), "Summarize the input.", {"n": 1})
+
+    else:
+        raise ValueError(f"Unknown benchmark kind: {kind}")
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return {"samples": samples, "units": units, "peak_rss_kb": _peak_rss_kb()}
+
+
+def _peak_rss_kb() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _measure(case: dict, workdir: Path, iterations: int) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--child",
+            json.dumps(case),
+            "--workdir",
+            str(workdir),
+            "--iterations",
+            str(iterations),
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+    raw = json.loads(result.stdout)
+    if "samples" not in raw:
+        return raw
+
+    samples = raw["samples"]
+    p50 = statistics.median(samples)
+    return {
+        "iterations": len(samples),
+        "p50_ms": round(p50 * 1000, 3),
+        "p90_ms": round(_percentile(samples, 0.9) * 1000, 3),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 3),
+        "throughput_per_s": round(raw["units"] / p50, 1) if p50 else None,
+        "peak_rss_kb": raw["peak_rss_kb"],
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or "p50_ms" not in current or "p50_ms" not in previous:
+            continue
+        for metric in ("p50_ms", "peak_rss_kb"):
+            old, new = previous.get(metric), current.get(metric)
+            if old and new and new > old * (1 + threshold):
+                regressions.append(
+                    {
+                        "case": name,
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(new / old - 1, 3),
+                    }
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AgentForge benchmark suite.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--iterations", type=int, help="Override samples per case.")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text.")
+    parser.add_argument("--workdir", help="Reuse synthetic data in this directory.")
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_run_child(json.loads(args.child), Path(args.workdir), args.iterations)))
+        return
+
+    profile = PROFILES[args.profile]
+    iterations = args.iterations or profile["iterations"]
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="agentforge-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    for case in _cases(profile):
+        if args.filter and args.filter not in case["name"]:
+            continue
+        results[case["name"]] = _measure(case, workdir, iterations)
+        print(f"{case['name']}: {results[case['name']]}", file=sys.stderr)
+
+    report = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "profile": args.profile,
+        "results": results,
+    }
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        report["regressions"] = compare(results, baseline.get("results", {}), args.threshold)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
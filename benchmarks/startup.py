@@ -0,0 +1,127 @@
+"""Startup import budget for the AgentForge CLI.
+
+Runs ``python -X importtime`` for the modules each subcommand loads, sums the
+self time of every module that a bare interpreter does not already import, and
+compares the median against a budget. Exits non-zero when a budget is exceeded
+or a scenario imports a module it should not need.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Median import time budgets in milliseconds, as reported by -X importtime on a
+# warm page cache. Before imports were made lazy, "cli" alone took ~120 ms.
+# Budgets are ceilings, not targets: keep each median at least a quarter under
+# its budget so slower machines and CI runners still pass.
+SCENARIOS = {
+    "cli": {
+        "imports": ["agentforge.cli"],
+        "budget_ms": 50,
+    },
+    "run": {
+        "imports": ["agentforge.cli", "agentforge.core.executor"],
+        "budget_ms": 80,
+    },
+    "generate": {
+        "imports": [
+            "agentforge.cli",
+            "agentforge.core.agent_generator",
+            "agentforge.core.repo_analyzer",
+        ],
+        "budget_ms": 100,
+    },
+}
+
+# Modules that no scenario's import phase should pay for.
+_HEAVY = {"asyncio", "tomllib", "configparser", "jinja2", "concurrent.futures", "dataclasses"}
+# Only needed once a codex call is actually made (cache keys, PATH lookups).
+_CALL_TIME = {"hashlib", "shutil", "typing"}
+FORBIDDEN = {
+    "cli": _HEAVY | _CALL_TIME,
+    "run": _HEAVY | _CALL_TIME,
+    # The signature table is compiled on the first analysis, not at import.
+    "generate": _HEAVY | {"agentforge.core.framework_signatures"},
+}
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def measure(runs: int) -> dict[str, dict]:
+    interpreter_modules = set(_import_times("pass"))
+    report: dict[str, dict] = {}
+    for scenario, config in SCENARIOS.items():
+        statement = "; ".join(f"import {module}" for module in config["imports"])
+        samples = []
+        loaded: set[str] = set()
+        for _ in range(runs):
+            times = _import_times(statement)
+            loaded = set(times)
+            samples.append(
+                sum(us for name, us in times.items() if name not in interpreter_modules) / 1000
+            )
+        median = statistics.median(samples)
+        forbidden = sorted(loaded & FORBIDDEN[scenario])
+        report[scenario] = {
+            "median_ms": round(median, 2),
+            "min_ms": round(min(samples), 2),
+            "budget_ms": config["budget_ms"],
+            "forbidden_imports": forbidden,
+            "ok": median <= config["budget_ms"] and not forbidden,
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="Samples per scenario (default: 7).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    report = measure(args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    else:
+        for scenario, result in report.items():
+            status = "ok" if result["ok"] else "OVER BUDGET"
+            print(
+                f"{scenario:<10} median {result['median_ms']:>7.2f} ms "
+                f"(budget {result['budget_ms']} ms) {status}"
+            )
+            if result["forbidden_imports"]:
+                print(f"           unexpected imports: {', '.join(result['forbidden_imports'])}")
+    if not all(result["ok"] for result in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Synthetic repositories and specs for the AgentForge benchmark suite."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import os
+import random
+
+
+# Weighted toward the extensions analyze_repo recognises, plus noise it must skip.
+_EXTENSIONS = [
+    (".py", 20), (".ts", 12), (".js", 10), (".tsx", 6), (".go", 5), (".rs", 4),
+    (".java", 4), (".md", 8), (".json", 6), (".yaml", 4), (".css", 3), (".html", 3),
+    (".c", 2), (".h", 2), (".txt", 5), (".png", 4), (".lock", 1), ("", 1),
+]
+_MANIFESTS = {
+    "package.json": json.dumps({"dependencies": {"react": "^18.0.0", "express": "^4.0.0"}}),
+    "pyproject.toml": '[project]\nname = "pkg"\ndependencies = ["fastapi>=0.100"]\n',
+    "requirements.txt": "django==4.2\nflask>=2.0\n",
+}
+_MARKER = ".agentforge-bench.json"
+
+
+def make_repo(
+    root: Path,
+    files: int,
+    depth: int = 6,
+    fanout: int = 6,
+    manifest_every: int = 5,
+    seed: int = 0,
+) -> Path:
+    """Create (or reuse) a tree of empty files under ``root``.
+
+    Directories form a tree of the given depth and fanout; files are spread
+    over all levels with a skew toward deeper directories, and every
+    ``manifest_every``-th top-level package gets nested manifests.
+    """
+    params = {
+        "files": files,
+        "depth": depth,
+        "fanout": fanout,
+        "manifest_every": manifest_every,
+        "seed": seed,
+    }
+    marker = root / _MARKER
+    if marker.exists() and json.loads(marker.read_text(encoding="utf-8")) == params:
+        return root
+
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    directories = [root]
+    frontier = [root]
+    for level in range(depth):
+        next_frontier = []
+        for parent in frontier:
+            for index in range(rng.randint(max(fanout // 2, 1), fanout)):
+                name = "tests" if level == 1 and index == 0 else f"d{level}_{index}"
+                child = parent / name
+                child.mkdir(exist_ok=True)
+                next_frontier.append(child)
+        directories.extend(next_frontier)
+        frontier = next_frontier
+        if len(directories) * 4 > files:
+            break
+
+    extensions = [ext for ext, _ in _EXTENSIONS]
+    weights = [weight for _, weight in _EXTENSIONS]
+    last = len(directories) - 1
+    for index in range(files):
+        directory = directories[min(int(rng.random() ** 0.5 * len(directories)), last)]
+        ext = rng.choices(extensions, weights)[0]
+        prefix = "test_" if index % 50 == 0 else "file_"
+        fd = os.open(directory / f"{prefix}{index}{ext}", os.O_CREAT | os.O_WRONLY, 0o644)
+        os.close(fd)
+
+    top_level = [path for path in directories if path.parent == root]
+    for position, package in enumerate(top_level):
+        if position % manifest_every:
+            continue
+        for name, content in _MANIFESTS.items():
+            (package / name).write_text(content, encoding="utf-8")
+    (root / "requirements.txt").write_text("flask==3.0\n", encoding="utf-8")
+
+    marker.write_text(json.dumps(params), encoding="utf-8")
+    return root
+
+
+def make_spec(path: Path, sections: int = 20, lines_per_section: int = 40, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    words = (
+        "agent", "deliver", "review", "pipeline", "contract", "schema", "quality",
+        "deploy", "report", "owner", "latency", "budget", "handoff", "scope",
+    )
+    headings = ["Goals", "Constraints", "Context", "Deliverables", "Agents", "Responsibilities"]
+    headings += [f"Area {index}" for index in range(max(sections - len(headings), 0))]
+
+    lines = ["Synthetic specification for benchmarking.", ""]
+    for heading in headings[:max(sections, 2)]:
+        lines.append(f"# {heading}")
+        for _ in range(lines_per_section):
+            lines.append("- " + " ".join(rng.choice(words) for _ in range(12)))
+        lines.append("")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
@@ -1,3 +1,7 @@
+import json
+import threading
+from pathlib import Path
+
 import pytest
 
 from agentforge.core import agent_generator
@@ -45,3 +49,95 @@ def test_normalize_agent_requires_entries() -> None:
 
     with pytest.raises(ValueError, match="responsibilities"):
         agent_generator._normalize_agent(agent)
+
+
+def test_generate_agents_streams_normalized_agents(monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = (
+        'Reading prompt...\n{"agents": [{"name": " A ", "role": "R", '
+        '"responsibilities": "- one", "constraints": ["two"]}]}\nDone.'
+    )
+
+    def fake_stream(_prompt: str):
+        yield from (payload[i:i + 10] for i in range(0, len(payload), 10))
+
+    monkeypatch.setattr(agent_generator.executor, "stream_execute", fake_stream)
+    seen: list[dict] = []
+
+    agents = agent_generator.generate_agents({}, {}, on_agent=seen.append)
+
+    assert agents == seen
+    assert agents[0]["name"] == "A"
+    assert agents[0]["responsibilities"] == ["one"]
+
+
+def test_generate_agent_files_skips_codex_when_fingerprint_matches(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    calls: list[str] = []
+
+    def fake_stream(prompt: str):
+        calls.append(prompt)
+        yield '[{"name": "A", "role": "R", "responsibilities": ["one"], "constraints": ["two"]}]'
+
+    class Template:
+        def render(self, context: dict) -> str:
+            return context["agent_name"]
+
+    monkeypatch.setattr(agent_generator.executor, "stream_execute", fake_stream)
+    monkeypatch.setattr(agent_generator, "_load_template", Template)
+    spec_path = tmp_path / "spec.md"
+    spec_path.write_text("# Goals\nShip it.\n# Constraints\nNone.\n", encoding="utf-8")
+    output_dir = tmp_path / "out"
+
+    first = agent_generator.generate_agent_files(str(spec_path), "", str(output_dir), {"a": 1})
+    second = agent_generator.generate_agent_files(str(spec_path), "", str(output_dir), {"a": 1})
+    assert len(calls) == 1
+    assert first == second
+    assert (output_dir / "a" / "agent.md").exists()
+
+    agent_generator.generate_agent_files(str(spec_path), "", str(output_dir), {"a": 2})
+    agent_generator.generate_agent_files(
+        str(spec_path), "", str(output_dir), {"a": 2}, force=True
+    )
+    assert len(calls) == 3
+
+
+def test_merge_agents_folds_shared_names_and_overlapping_roles() -> None:
+    merged = agent_generator._merge_agents(
+        [
+            {"name": "Writer", "role": "Writes page copy", "responsibilities": ["Draft"]},
+            {"name": "Router", "role": "Routes tasks", "responsibilities": ["Route"]},
+            {"name": "writer", "role": "", "responsibilities": "- draft\n- Edit"},
+            {"name": "Copy Agent", "role": "Writes the page copy", "constraints": ["Plain"]},
+        ]
+    )
+
+    assert [agent["name"] for agent in merged] == ["Writer", "Router"]
+    assert merged[0]["responsibilities"] == ["Draft", "Edit"]
+    assert merged[0]["constraints"] == ["Plain"]
+
+
+def test_generate_agents_sharded_runs_shards_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_stream(prompt: str):
+        barrier.wait()
+        name = "Router" if "focus (Router)" in prompt else "Writer"
+        yield json.dumps(
+            [
+                {"name": name, "role": name, "responsibilities": ["a"], "constraints": ["b"]},
+                {"name": "Lead", "role": "Leads", "responsibilities": [name], "constraints": ["c"]},
+            ]
+        )
+
+    monkeypatch.setattr(agent_generator.executor, "stream_execute", fake_stream)
+    spec = {
+        "raw": "",
+        "preamble": "",
+        "sections": {"Goals": "g", "Constraints": "c", "Agents": "- Router\n- Writer"},
+    }
+
+    agents = agent_generator.generate_agents(spec, {}, sharded=True, jobs=2)
+
+    assert [agent["name"] for agent in agents] == ["Router", "Lead", "Writer"]
+    assert agents[1]["responsibilities"] == ["Router", "Writer"]
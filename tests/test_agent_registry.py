@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import agent_registry, executor
+
+
+def _write_agent(root: Path, slug: str, name: str, role: str) -> Path:
+    path = root / slug / "agent.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"# AgentForge Agent Definition\n\n## Agent Name\n{name}\n\n## Role\n{role}\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.fixture
+def registry(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> agent_registry.AgentRegistry:
+    monkeypatch.setenv("AGENTFORGE_REGISTRY", str(tmp_path / "agents.sqlite"))
+    monkeypatch.delenv("AGENTFORGE_AGENT_PATH", raising=False)
+    registry = agent_registry.get_registry()
+    yield registry
+    registry.close()
+
+
+def test_resolve_by_slug_name_and_role(tmp_path: Path, registry, monkeypatch) -> None:
+    output = tmp_path / "output"
+    backend = _write_agent(output, "backend-engineer", "Backend Engineer", "Builds the API")
+    qa = _write_agent(output, "qa-lead", "QA Lead", "Owns the test plan")
+    registry.register(output)
+
+    assert registry.resolve("backend-engineer") == str(backend)
+    assert registry.resolve("qa lead") == str(qa)
+    assert registry.resolve("Owns the test plan") == str(qa)
+
+    # The same agent in two generate runs: the newer run wins, or the one being worked in.
+    other = _write_agent(tmp_path / "other", "qa-lead", "QA Lead", "Tests another service")
+    os.utime(output, ns=(1, 1))
+    registry.register(output)
+    registry.register(tmp_path / "other")
+    assert registry.resolve("QA Lead") == str(other)
+    monkeypatch.chdir(qa.parent)
+    assert registry.resolve("QA Lead") == str(qa)
+
+    _write_agent(output, "test-writer", "Test Writer", "Owns the test plan")
+    with pytest.raises(ValueError, match="ambiguous"):
+        registry.resolve("Owns the test plan")
+    with pytest.raises(ValueError, match="Unknown agent"):
+        registry.resolve("Designer")
+
+
+def test_index_follows_file_changes(tmp_path: Path, registry, monkeypatch) -> None:
+    output = tmp_path / "output"
+    path = _write_agent(output, "writer", "Technical Writer", "Writes docs")
+    searched = _write_agent(tmp_path / "extra", "reviewer", "Reviewer", "Reviews changes")
+    registry.register(output)
+    assert registry.resolve("Technical Writer") == str(path)
+
+    # Renamed in place: the stale match re-reads its root; other names need a rescan.
+    _write_agent(output, "writer", "Documentation Lead", "Writes all the docs")
+    with pytest.raises(ValueError, match="Unknown agent"):
+        registry.resolve("Technical Writer")
+    assert registry.resolve("Documentation Lead") == str(path)
+    _write_agent(output, "writer", "Release Manager", "Ships releases")
+    with pytest.raises(ValueError, match="Unknown agent"):
+        registry.resolve("Release Manager")
+    monkeypatch.setenv("AGENTFORGE_AGENT_RESCAN", "1")
+    assert registry.resolve("Release Manager") == str(path)
+    monkeypatch.delenv("AGENTFORGE_AGENT_RESCAN")
+
+    monkeypatch.setenv("AGENTFORGE_AGENT_PATH", str(tmp_path / "extra"))
+    assert registry.resolve("reviewer") == str(searched)
+    monkeypatch.delenv("AGENTFORGE_AGENT_PATH")
+    with pytest.raises(ValueError, match="Unknown agent"):
+        registry.resolve("reviewer")
+
+    path.unlink()
+    with pytest.raises(ValueError, match="Unknown agent"):
+        registry.resolve("writer")
+    assert registry.agents() == []
+
+
+def test_run_with_agent_accepts_a_name(tmp_path: Path, registry, monkeypatch) -> None:
+    output = tmp_path / "output"
+    path = _write_agent(output, "planner", "Planner", "Plans the work")
+    registry.register(output)
+    prompts: list[str] = []
+    monkeypatch.setattr(executor, "execute", lambda prompt, **_kwargs: prompts.append(prompt))
+
+    # A directory named like the agent is not mistaken for its definition.
+    monkeypatch.chdir(output)
+    executor.run_with_agent("planner", "plan", {})
+    path.write_text("## Agent Name\nPlanner\n\n## Role\nPlans everything\n", encoding="utf-8")
+    executor.run_with_agent("planner", "plan", {})
+
+    assert prompts[0].startswith("# AgentForge Agent Definition")
+    assert "Plans everything" in prompts[1]
+    assert executor.read_agent(str(path)) is executor.read_agent("Planner")
@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import batch
+
+
+def _lines(*records: dict) -> list[str]:
+    return [json.dumps(record) + "\n" for record in records]
+
+
+def test_run_batch_writes_results_and_errors() -> None:
+    output = io.StringIO()
+    lines = _lines(
+        {"id": "a", "agent": "agent.md", "task": "one"},
+        {"id": "b", "task": "missing agent"},
+    ) + ["not json\n"]
+
+    summary = batch.run_batch(lines, output, runner=lambda agent, task, ctx: task.upper())
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert records[0] == {"id": "a", "line": 1, "status": "ok", "result": "ONE"}
+    assert records[1]["status"] == "error" and "agent" in records[1]["error"]
+    assert records[2]["status"] == "error" and records[2]["line"] == 3
+    assert (summary.succeeded, summary.failed) == (1, 2)
+
+
+def test_run_batch_ordered_mode_preserves_input_order() -> None:
+    def runner(agent: str, task: str, context: dict) -> str:
+        time.sleep(context["delay"])
+        return task
+
+    lines = _lines(
+        *(
+            {"id": str(i), "agent": "a.md", "task": str(i), "context": {"delay": d}}
+            for i, d in enumerate((0.05, 0.0, 0.02, 0.0))
+        )
+    )
+    output = io.StringIO()
+
+    batch.run_batch(lines, output, jobs=4, ordered=True, runner=runner)
+
+    ids = [json.loads(line)["id"] for line in output.getvalue().splitlines()]
+    assert ids == ["0", "1", "2", "3"]
+
+
+def test_run_batch_limits_concurrency() -> None:
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def runner(agent: str, task: str, context: dict) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return task
+
+    lines = _lines(*({"agent": "a.md", "task": str(i)} for i in range(12)))
+    batch.run_batch(lines, io.StringIO(), jobs=3, runner=runner)
+
+    assert peak <= 3
+
+
+def test_run_batch_resumes_from_checkpoint(tmp_path: Path) -> None:
+    checkpoint = tmp_path / "tasks.checkpoint"
+    calls: list[str] = []
+
+    def flaky(agent: str, task: str, context: dict) -> str:
+        calls.append(task)
+        if task == "b":
+            raise RuntimeError("codex failed")
+        return task
+
+    lines = _lines(
+        {"id": "1", "agent": "a.md", "task": "a"},
+        {"id": "2", "agent": "a.md", "task": "b"},
+    )
+    first = batch.run_batch(
+        lines, io.StringIO(), checkpoint_path=str(checkpoint), runner=flaky
+    )
+    assert (first.succeeded, first.failed) == (1, 1)
+
+    def healthy(agent: str, task: str, context: dict) -> str:
+        calls.append(task)
+        return task
+
+    calls.clear()
+    second = batch.run_batch(
+        lines, io.StringIO(), checkpoint_path=str(checkpoint), runner=healthy
+    )
+    assert calls == ["b"]
+    assert (second.succeeded, second.skipped) == (1, 1)
+
+
+def test_cli_resume_keeps_earlier_results_and_clears_the_checkpoint(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from agentforge import cli
+    from agentforge.core import executor
+
+    tasks = tmp_path / "tasks.jsonl"
+    tasks.write_text(
+        "".join(_lines(*({"id": key, "agent": "a.md", "task": key} for key in "123"))),
+        encoding="utf-8",
+    )
+    output = tmp_path / "out.jsonl"
+    failing = {"3"}
+
+    def run(agent: str, task: str, context: dict, **_kwargs) -> str:
+        if task in failing:
+            raise RuntimeError("codex failed")
+        return task
+
+    monkeypatch.setattr(executor, "run_with_agent", run)
+    # The CLI configures itself through os.environ; keep that out of other tests.
+    monkeypatch.setattr(os, "environ", os.environ.copy())
+    monkeypatch.setenv("AGENTFORGE_DAEMON", "0")
+    argv = ["agentforge", "run", "--batch", str(tasks), "--output", str(output), "--no-cache"]
+    monkeypatch.setattr("sys.argv", argv)
+    with pytest.raises(SystemExit):
+        cli.main()
+
+    failing.clear()
+    cli.main()
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted(record["id"] for record in records if record["status"] == "ok") == ["1", "2", "3"]
+    assert not Path(f"{tasks}.checkpoint").exists()
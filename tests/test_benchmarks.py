@@ -0,0 +1,47 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import agent_generator, executor, repo_analyzer
+
+
+BENCH_DIR = Path(__file__).resolve().parent.parent / "benchmarks"
+sys.path.insert(0, str(BENCH_DIR))
+
+import synthetic  # noqa: E402
+
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake codex relies on a shebang")
+
+
+@pytest.fixture
+def fake_codex(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(BENCH_DIR / "fake_codex.py"))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+
+
+def test_synthetic_repo_is_analyzable(tmp_path: Path) -> None:
+    repo = synthetic.make_repo(tmp_path / "repo", 300, depth=3, fanout=4)
+
+    metadata = repo_analyzer.analyze_repo(str(repo))
+
+    assert metadata["size"] == "large"
+    assert metadata["tests"] is True
+    assert "Flask" in metadata["frameworks"]
+
+
+def test_fake_codex_round_trips(
+    fake_codex, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("AGENTFORGE_FAKE_CODEX_AGENTS", "4")
+    monkeypatch.setenv("AGENTFORGE_FAKE_CODEX_CHUNKS", "5")
+    agents = agent_generator.generate_agents({"sections": {}}, {})
+    assert [agent["name"] for agent in agents] == [f"Agent {index}" for index in range(4)]
+
+    monkeypatch.setenv("AGENTFORGE_FAKE_CODEX_MODE", "echo")
+    monkeypatch.setenv("AGENTFORGE_FAKE_CODEX_BYTES", "2048")
+    agent = tmp_path / "agent.md"
+    agent.write_text("# Agent\n", encoding="utf-8")
+    assert len(executor.run_with_agent(str(agent), "task", {})) == 2048
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+from agentforge.core import cache
+
+
+def test_make_key_depends_on_all_inputs() -> None:
+    base = cache.make_key("prompt", ["codex", "exec", "-"], "1.0")
+
+    assert base == cache.make_key("prompt", ["codex", "exec", "-"], "1.0")
+    assert base != cache.make_key("prompt!", ["codex", "exec", "-"], "1.0")
+    assert base != cache.make_key("prompt", ["cmd", "/c", "codex", "exec", "-"], "1.0")
+    assert base != cache.make_key("prompt", ["codex", "exec", "-"], "1.1")
+
+
+def test_cache_round_trip_and_expiry(tmp_path: Path) -> None:
+    store = cache.ResponseCache(tmp_path, max_age_seconds=60)
+    store.put("abc", "response")
+
+    assert store.get("abc") == "response"
+    assert store.get("missing") is None
+
+    old = time.time() - 120
+    os.utime(tmp_path / "abc.json", (old, old))
+    assert store.get("abc") is None
+    assert (store.stats.hits, store.stats.misses) == (1, 2)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    store = cache.ResponseCache(tmp_path, max_bytes=10**9)
+    for index, key in enumerate(("a", "b", "c")):
+        store.put(key, "x" * 100)
+        stamp = time.time() - 100 + index
+        os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+    store.get("a")
+
+    store.max_bytes = sum((tmp_path / f"{key}.json").stat().st_size for key in ("a", "c"))
+    assert store.evict() == 1
+
+    assert not (tmp_path / "b.json").exists()
+    assert (tmp_path / "a.json").exists()
+    assert (tmp_path / "c.json").exists()
+
+
+def test_flush_stats_accumulates(tmp_path: Path) -> None:
+    store = cache.ResponseCache(tmp_path)
+    store.get("missing")
+    assert store.flush_stats()["misses"] == 1
+
+    store.get("missing")
+    assert store.flush_stats()["misses"] == 2
+
+
+def test_flush_stats_keeps_concurrent_counts(tmp_path: Path) -> None:
+    def flush_many() -> None:
+        store = cache.ResponseCache(tmp_path)
+        for _ in range(20):
+            store.get("missing")
+            store.flush_stats()
+
+    threads = [threading.Thread(target=flush_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.ResponseCache(tmp_path).flush_stats()["misses"] == 160
+
+
+def test_put_scans_the_directory_only_past_the_size_limit(tmp_path: Path, monkeypatch) -> None:
+    store = cache.ResponseCache(tmp_path, max_bytes=10_000)
+    scans = []
+    original = os.scandir
+
+    def counting_scandir(path):
+        scans.append(path)
+        return original(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    for index in range(20):
+        store.put(f"k{index}", "x" * 100)
+    assert len(scans) == 1
+
+    for index in range(100):
+        store.put(f"big{index}", "x" * 1000)
+    assert 1 < len(scans) < 100
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.json")) <= 10_000 + 1100
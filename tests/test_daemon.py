@@ -0,0 +1,120 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import daemon
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="UNIX sockets and fork")
+
+
+def _write_fake_codex(tmp_path: Path) -> Path:
+    script = tmp_path / "fake-codex"
+    script.write_text(
+        f"#!{sys.executable}\nimport sys\nprint('handled:', sys.stdin.read().splitlines()[-1])\n",
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    return script
+
+
+@pytest.fixture
+def served(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    socket_path = tmp_path / "d.sock"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(_write_fake_codex(tmp_path)))
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from agentforge.cli import main; main()",
+            "serve",
+            "--socket",
+            str(socket_path),
+        ],
+        cwd=REPO_ROOT,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while not socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield socket_path
+    server.terminate()
+    server.wait(timeout=10)
+
+
+def test_forward_runs_commands_in_the_daemon(served, tmp_path: Path, capfd) -> None:
+    socket_path = served
+    agent = tmp_path / "agent.md"
+    agent.write_text("You are a test agent.", encoding="utf-8")
+
+    argv = ["run", "--agent", str(agent), "--task", "summarize", "--no-cache"]
+    assert daemon.forward(argv, socket_path) == 0
+    assert capfd.readouterr().out.strip() == "handled: summarize"
+
+    assert daemon.forward(["run", "--task", "task"], socket_path) == 2
+    assert "--agent is required" in capfd.readouterr().err
+
+
+def test_forward_falls_back_without_a_listening_daemon(tmp_path: Path) -> None:
+    assert daemon.forward(["run"], tmp_path / "missing.sock") is None
+
+    stale = tmp_path / "stale.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(stale))
+    listener.close()
+    assert stale.exists()
+    assert daemon.forward(["run"], stale) is None
+
+
+def test_slow_requests_do_not_block_others_and_children_report_state(tmp_path: Path) -> None:
+    socket_path = tmp_path / "d.sock"
+    adopted = tmp_path / "adopted"
+    script = (
+        "import sys, time\n"
+        "from agentforge.core import daemon\n"
+        "def run(argv, prepared):\n"
+        "    time.sleep(float(argv[0]))\n"
+        "def adopt(state):\n"
+        "    open(sys.argv[2], 'a').write(state + '\\n')\n"
+        "daemon.serve(sys.argv[1], lambda argv: None, run, lambda: 'done', adopt)\n"
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-c", script, str(socket_path), str(adopted)],
+        cwd=REPO_ROOT,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        slow = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from agentforge.core import daemon; "
+                "sys.exit(daemon.forward(['3'], sys.argv[1]))",
+                str(socket_path),
+            ],
+            cwd=REPO_ROOT,
+        )
+        time.sleep(0.3)
+        started = time.monotonic()
+        assert daemon.forward(["0"], socket_path) == 0
+        assert time.monotonic() - started < 2
+        assert slow.wait(timeout=10) == 0
+
+        deadline = time.monotonic() + 5
+        while not adopted.exists() or len(adopted.read_text(encoding="utf-8").split()) < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert adopted.read_text(encoding="utf-8").split() == ["done", "done"]
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
@@ -1,43 +1,49 @@
+import asyncio
+import json
 import os
-import subprocess
 import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from agentforge.core import executor
+from agentforge.core import executor, latency, process_group
+from agentforge.core.process_group import CompletedRun
 
 
 def test_execute_success(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_run(*_args, **_kwargs):
-        return subprocess.CompletedProcess(args=["codex"], returncode=0, stdout="ok\n")
+    def fake_run(_command, _input_text, _timeout):
+        return CompletedRun(0, "ok\n", "")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     assert executor.execute("prompt") == "ok\n"
 
 
 def test_execute_missing_binary(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_run(*_args, **_kwargs):
+    def fake_run(_command, _input_text, _timeout):
         raise FileNotFoundError("codex")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     with pytest.raises(RuntimeError, match="executable not found"):
         executor.execute("prompt")
 
 
 def test_execute_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_run(*_args, **_kwargs):
-        raise subprocess.TimeoutExpired(cmd=["codex"], timeout=1)
+    def fake_run(_command, _input_text, _timeout):
+        return CompletedRun(-9, "", "", timed_out=True)
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     with pytest.raises(RuntimeError, match="timeout"):
         executor.execute("prompt", timeout=1)
 
 
 def test_execute_called_process_error_uses_stderr(monkeypatch: pytest.MonkeyPatch) -> None:
-    def fake_run(*_args, **_kwargs):
-        raise subprocess.CalledProcessError(1, ["codex"], output="out", stderr="err")
+    def fake_run(_command, _input_text, _timeout):
+        return CompletedRun(1, "out", "err")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     with pytest.raises(RuntimeError, match="err"):
         executor.execute("prompt")
 
@@ -45,11 +51,11 @@ def test_execute_called_process_error_uses_stderr(monkeypatch: pytest.MonkeyPatc
 def test_execute_wraps_cmd_executable(monkeypatch: pytest.MonkeyPatch) -> None:
     seen = {}
 
-    def fake_run(args, **_kwargs):
+    def fake_run(args, _input_text, _timeout):
         seen["args"] = args
-        return subprocess.CompletedProcess(args=args, returncode=0, stdout="ok")
+        return CompletedRun(0, "ok", "")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     monkeypatch.setenv("AGENTFORGE_CODEX_PATH", r"C:\tools\codex.cmd")
 
     executor.execute("prompt")
@@ -62,11 +68,11 @@ def test_execute_wraps_cmd_executable(monkeypatch: pytest.MonkeyPatch) -> None:
 def test_execute_wraps_powershell_script(monkeypatch: pytest.MonkeyPatch) -> None:
     seen = {}
 
-    def fake_run(args, **_kwargs):
+    def fake_run(args, _input_text, _timeout):
         seen["args"] = args
-        return subprocess.CompletedProcess(args=args, returncode=0, stdout="ok")
+        return CompletedRun(0, "ok", "")
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     monkeypatch.setenv("AGENTFORGE_CODEX_PATH", r"C:\tools\codex.ps1")
 
     executor.execute("prompt")
@@ -80,9 +86,9 @@ def test_execute_wraps_powershell_script(monkeypatch: pytest.MonkeyPatch) -> Non
 def test_execute_prefers_cmd_when_available(monkeypatch: pytest.MonkeyPatch) -> None:
     seen = {}
 
-    def fake_run(args, **_kwargs):
+    def fake_run(args, _input_text, _timeout):
         seen["args"] = args
-        return subprocess.CompletedProcess(args=args, returncode=0, stdout="ok")
+        return CompletedRun(0, "ok", "")
 
     def fake_which(value: str) -> str | None:
         if value == "codex.cmd":
@@ -91,7 +97,7 @@ def test_execute_prefers_cmd_when_available(monkeypatch: pytest.MonkeyPatch) ->
             return r"C:\tools\codex.ps1"
         return None
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     monkeypatch.setattr(shutil, "which", fake_which)
     monkeypatch.delenv("AGENTFORGE_CODEX_PATH", raising=False)
 
@@ -104,14 +110,14 @@ def test_execute_prefers_cmd_when_available(monkeypatch: pytest.MonkeyPatch) ->
 def test_execute_prefers_cmd_over_ps1_path(monkeypatch: pytest.MonkeyPatch) -> None:
     seen = {}
 
-    def fake_run(args, **_kwargs):
+    def fake_run(args, _input_text, _timeout):
         seen["args"] = args
-        return subprocess.CompletedProcess(args=args, returncode=0, stdout="ok")
+        return CompletedRun(0, "ok", "")
 
     def fake_exists(self):
         return str(self).lower() == r"c:\tools\codex.cmd"
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_group, "run", fake_run)
     monkeypatch.setattr(executor.Path, "exists", fake_exists)
     monkeypatch.setenv("AGENTFORGE_CODEX_PATH", r"C:\tools\codex.ps1")
 
@@ -119,3 +125,271 @@ def test_execute_prefers_cmd_over_ps1_path(monkeypatch: pytest.MonkeyPatch) -> N
 
     assert seen["args"][:2] == ["cmd", "/c"]
     assert seen["args"][2].endswith("codex.cmd")
+
+
+def test_execute_uses_response_cache(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    calls = []
+
+    def fake_run(args, _input_text, _timeout):
+        calls.append(args)
+        if args[-1] == "--version":
+            return CompletedRun(0, "codex 1.0\n", "")
+        return CompletedRun(0, "fresh", "")
+
+    monkeypatch.setattr(process_group, "run", fake_run)
+    monkeypatch.delenv("AGENTFORGE_CODEX_PATH", raising=False)
+    monkeypatch.setenv("AGENTFORGE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(executor, "_caches", {})
+    executor._codex_version.cache_clear()
+
+    assert executor.execute("prompt") == "fresh"
+    assert executor.execute("prompt") == "fresh"
+    exec_calls = [args for args in calls if args[-1] == "-"]
+    assert len(exec_calls) == 1
+
+    stats = executor.get_response_cache().stats
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    monkeypatch.setenv("AGENTFORGE_CACHE_REFRESH", "1")
+    executor.execute("prompt")
+    assert len([args for args in calls if args[-1] == "-"]) == 2
+
+
+def test_response_cache_is_keyed_by_working_directory(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    def fake_run(args, _input_text, _timeout):
+        if args[-1] == "--version":
+            return CompletedRun(0, "codex 1.0\n", "")
+        return CompletedRun(0, f"ran in {os.path.basename(os.getcwd())}", "")
+
+    monkeypatch.setattr(process_group, "run", fake_run)
+    monkeypatch.delenv("AGENTFORGE_CODEX_PATH", raising=False)
+    monkeypatch.setenv("AGENTFORGE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(executor, "_caches", {})
+    executor._codex_version.cache_clear()
+
+    for name in ("repoA", "repoB"):
+        (tmp_path / name).mkdir()
+        monkeypatch.chdir(tmp_path / name)
+        assert executor.execute("prompt") == f"ran in {name}"
+    monkeypatch.setenv("CODEX_PROFILE", "other")
+    assert executor.execute("prompt") == "ran in repoB"
+    assert executor.get_response_cache().stats.hits == 0
+
+
+def test_codex_version_is_remembered_per_executable(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    codex = tmp_path / "codex"
+    codex.write_text("v1", encoding="utf-8")
+    probes = []
+
+    def fake_run(args, _input_text, _timeout):
+        if args[-1] == "--version":
+            probes.append(args)
+            return CompletedRun(0, f"codex {codex.read_text(encoding='utf-8')}\n", "")
+        return CompletedRun(0, "ok", "")
+
+    monkeypatch.setattr(process_group, "run", fake_run)
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(codex))
+    monkeypatch.setenv("AGENTFORGE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(executor, "_caches", {})
+    base_command = (str(codex),)
+
+    for _ in range(2):
+        # A fresh process only has the on-disk record.
+        executor._codex_version.cache_clear()
+        assert executor._codex_version(base_command) == "codex v1"
+    assert len(probes) == 1
+
+    codex.write_text("v2.0", encoding="utf-8")
+    executor._codex_version.cache_clear()
+    assert executor._codex_version(base_command) == "codex v2.0"
+    assert len(probes) == 2
+    # Only the current build of each live executable is kept.
+    versions = json.loads((tmp_path / "cache" / "codex-versions.json").read_text(encoding="utf-8"))
+    assert list(versions.values()) == ["codex v2.0"]
+
+
+def _write_fake_codex(tmp_path, body: str):
+    script = tmp_path / "fake-codex"
+    script.write_text(f"#!{sys.executable}\nimport sys, time\n{body}\n", encoding="utf-8")
+    script.chmod(0o755)
+    return script
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shebang script")
+def test_execute_async_success_and_failure(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    script = _write_fake_codex(
+        tmp_path,
+        "data = sys.stdin.read()\n"
+        "if 'fail' in data:\n"
+        "    sys.stderr.write('boom')\n"
+        "    sys.exit(2)\n"
+        "sys.stdout.write(data.upper())",
+    )
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(script))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+
+    assert asyncio.run(executor.execute_async("hello")) == "HELLO"
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(executor.execute_async("fail"))
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shebang script")
+def test_execute_async_timeout(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    script = _write_fake_codex(tmp_path, "time.sleep(10)")
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(script))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+
+    with pytest.raises(RuntimeError, match="timeout"):
+        asyncio.run(executor.execute_async("prompt", timeout=1))
+
+
+def test_execute_async_missing_binary(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(tmp_path / "missing-codex"))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+
+    with pytest.raises(RuntimeError, match="executable not found"):
+        asyncio.run(executor.execute_async("prompt"))
+
+
+def test_concurrency_limiter_caps_in_flight() -> None:
+    limiter = executor.ConcurrencyLimiter(2)
+    peak = 0
+
+    async def worker() -> None:
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main() -> None:
+        await asyncio.gather(*(worker() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shebang script")
+def test_stream_execute_yields_chunks(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    script = _write_fake_codex(
+        tmp_path,
+        "sys.stdin.read()\n"
+        "for part in ('alpha ', 'beta ', 'gamma'):\n"
+        "    sys.stdout.write(part)\n"
+        "    sys.stdout.flush()\n"
+        "    time.sleep(0.05)",
+    )
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(script))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+
+    chunks = list(executor.stream_execute("prompt"))
+    assert len(chunks) > 1
+    assert "".join(chunks) == "alpha beta gamma"
+
+    target = tmp_path / "out.txt"
+    executor.execute_to_file("prompt", str(target))
+    assert target.read_text(encoding="utf-8") == "alpha beta gamma"
+
+    async def collect() -> str:
+        return "".join([chunk async for chunk in executor.stream_execute_async("prompt")])
+
+    assert asyncio.run(collect()) == "alpha beta gamma"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shebang script")
+def test_stream_execute_maps_errors(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    failing = _write_fake_codex(tmp_path, "sys.stderr.write('bad input')\nsys.exit(3)")
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(failing))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+    with pytest.raises(RuntimeError, match="bad input"):
+        list(executor.stream_execute("prompt"))
+
+    slow = tmp_path / "slow"
+    slow.mkdir()
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(_write_fake_codex(slow, "time.sleep(10)")))
+    with pytest.raises(RuntimeError, match="timeout"):
+        list(executor.stream_execute("prompt", timeout=1))
+
+
+def test_execute_coalesces_identical_concurrent_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+    release = threading.Event()
+
+    def fake_run(_command, input_text, _timeout):
+        calls.append(input_text)
+        release.wait(5)
+        return CompletedRun(0, "shared", "")
+
+    monkeypatch.setattr(process_group, "run", fake_run)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(executor.execute, "same prompt") for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["shared"] * 4
+    assert calls == ["same prompt"]
+
+
+def test_execute_async_coalesces_identical_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    async def fake_run_async(_command, _executable, prompt, _timeout, **_kwargs):
+        calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return prompt.upper()
+
+    monkeypatch.setattr(executor, "_run_codex_async", fake_run_async)
+
+    async def main() -> list[str]:
+        return await asyncio.gather(
+            executor.execute_async("a"), executor.execute_async("a"), executor.execute_async("b")
+        )
+
+    assert asyncio.run(main()) == ["A", "A", "B"]
+    assert sorted(calls) == ["a", "b"]
+
+
+def _seed_latency(monkeypatch: pytest.MonkeyPatch, prompt: str, seconds: float) -> None:
+    history = latency.LatencyHistory()
+    bucket = latency.bucket_for(len(prompt.encode("utf-8")))
+    for _ in range(latency.MIN_SAMPLES):
+        history.record(bucket, seconds)
+    monkeypatch.setattr(latency, "_histories", {"": history})
+    monkeypatch.delenv("AGENTFORGE_LATENCY_FILE", raising=False)
+    monkeypatch.setenv("AGENTFORGE_HEDGE", "1")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shebang script")
+def test_execute_hedges_slow_calls_and_kills_the_loser(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    # The first invocation hangs; the hedged second one answers immediately.
+    script = _write_fake_codex(
+        tmp_path,
+        f"import os\nmarker = {str(tmp_path / 'first')!r}\n"
+        "sys.stdin.read()\n"
+        "if not os.path.exists(marker):\n"
+        "    open(marker, 'w').write(str(os.getpid()))\n"
+        "    time.sleep(30)\n"
+        "sys.stdout.write('hedged')",
+    )
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(script))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+    _seed_latency(monkeypatch, "slow prompt", 0.2)
+
+    started = time.monotonic()
+    assert executor.execute("slow prompt", timeout=20) == "hedged"
+    assert time.monotonic() - started < 10
+    loser = int((tmp_path / "first").read_text(encoding="utf-8"))
+    with pytest.raises(ProcessLookupError):
+        os.kill(loser, 0)
+
+    (tmp_path / "first").unlink()
+    started = time.monotonic()
+    assert asyncio.run(executor.execute_async("slow prompt", timeout=20)) == "hedged"
+    assert time.monotonic() - started < 10
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import framework_signatures, repo_analyzer
+
+
+def test_builtin_table_compiles_into_one_index() -> None:
+    signatures = framework_signatures.load_signatures(framework_signatures.DEFAULT_TABLE)
+    names = [signature["name"] for signature in signatures]
+    assert len(names) == len(set(names)) > 300
+
+    index = framework_signatures.SignatureIndex(signatures)
+
+    assert index.frameworks_for_dependencies(["Django", "flask_sqlalchemy", "@angular/core"]) == {
+        "Django",
+        "Angular",
+    }
+    assert index.frameworks_for_file("vite.config.ts", ".ts") == {"Vite"}
+    assert index.frameworks_for_file("main.TF", ".tf") == {"Terraform"}
+    assert index.is_signature_file("Dockerfile.dev", ".dev")
+    assert not index.is_signature_file("views.py", ".py")
+    setup_py = 'setup(install_requires=["Django>=4", "reactor", \'celery[redis]\'])'
+    assert index.dependencies_in_text(setup_py) == {"django", "celery"}
+
+
+def test_extra_table_is_merged_and_invalidates_snapshots(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "requirements.txt").write_text("flask\ninternal-web\n", encoding="utf-8")
+    (repo / "house.yaml").write_text("", encoding="utf-8")
+    snapshot = tmp_path / "snapshot.json"
+    monkeypatch.delenv("AGENTFORGE_FRAMEWORKS_FILE", raising=False)
+
+    before = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot))
+
+    extra = tmp_path / "frameworks.json"
+    extra.write_text(
+        json.dumps(
+            {
+                "frameworks": [
+                    {"name": "House Web", "dependencies": ["internal_web"]},
+                    {"name": "Flask", "files": ["house.yaml"]},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("AGENTFORGE_FRAMEWORKS_FILE", str(extra))
+    after = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot))
+
+    assert before["frameworks"] == ["Flask"]
+    assert after["frameworks"] == ["Flask", "House Web"]
+    assert "house.yaml" in json.loads(snapshot.read_text(encoding="utf-8"))["manifests"]
+
+
+def test_invalid_table_is_reported(tmp_path: Path) -> None:
+    table = tmp_path / "frameworks.json"
+    table.write_text(json.dumps({"frameworks": [{"name": "X", "files": "a"}]}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="list of strings"):
+        framework_signatures.load_signatures(table)
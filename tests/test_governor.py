@@ -0,0 +1,55 @@
+import os
+import threading
+import time
+
+from agentforge.core import governor as governor_module
+from agentforge.core.governor import Governor
+
+
+def test_governor_caps_concurrent_slots(tmp_path) -> None:
+    governor = Governor(tmp_path, max_concurrent=1)
+    first = governor.acquire()
+    acquired = []
+
+    def waiter() -> None:
+        with governor.acquire() as slot:
+            acquired.append(slot)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.2)
+    assert acquired == []
+
+    first.release()
+    thread.join(timeout=5)
+
+    assert len(acquired) == 1
+    assert acquired[0].wait_seconds >= 0.15
+
+
+def test_governor_notes_long_waits_on_stderr(tmp_path, monkeypatch, capsys) -> None:
+    monkeypatch.setattr(governor_module, "NOTICE_AFTER_SECONDS", 0.1)
+    governor = Governor(tmp_path, max_concurrent=1)
+    governor.acquire().release()
+    assert capsys.readouterr().err == ""
+
+    first = governor.acquire()
+    thread = threading.Thread(target=lambda: governor.acquire().release())
+    thread.start()
+    time.sleep(0.2)
+    first.release()
+    thread.join(timeout=5)
+    assert "for a codex slot (1 allowed host-wide" in capsys.readouterr().err
+
+
+def test_governor_skips_tickets_of_dead_waiters(tmp_path) -> None:
+    governor = Governor(tmp_path, max_concurrent=1)
+    # An unlocked ticket ahead of ours is what a crashed waiter leaves behind.
+    stale = tmp_path / "tickets" / f"{0:020d}"
+    stale.write_text("", encoding="utf-8")
+
+    slot = governor.acquire()
+    slot.release()
+
+    assert not stale.exists()
+    assert os.listdir(tmp_path / "tickets") == []
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from agentforge.core.json_stream import AgentArrayParser
+
+
+def _feed_in_chunks(text: str, size: int) -> tuple[AgentArrayParser, list[dict]]:
+    parser = AgentArrayParser()
+    found: list[dict] = []
+    for start in range(0, len(text), size):
+        found.extend(parser.feed(text[start:start + size]))
+    parser.close()
+    return parser, found
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_parser_extracts_agents_around_noise(size: int) -> None:
+    agents = [
+        {"name": "A", "role": "r", "responsibilities": ["x {"], "constraints": ['y "]']},
+        {"name": "B", "role": "r", "responsibilities": [], "constraints": []},
+    ]
+    text = (
+        "[info] starting \"agents\": [1, 2]\n"
+        + json.dumps({"agents": agents}, indent=2)
+        + "\ntokens used: 1234\n"
+    )
+
+    parser, found = _feed_in_chunks(text, size)
+
+    assert found == agents
+    assert parser.done
+
+
+def test_parser_accepts_bare_array() -> None:
+    _, found = _feed_in_chunks('[{"name": "A"}, {"name": "B"}]', 4)
+    assert [agent["name"] for agent in found] == ["A", "B"]
+
+
+@pytest.mark.parametrize("text", ["[]", "[ \n ]", '{"agents": []}'])
+def test_parser_accepts_an_empty_agent_list(text: str) -> None:
+    parser, found = _feed_in_chunks(text, 1)
+    assert found == []
+    assert parser.done
+
+
+def test_parser_reports_missing_or_truncated_output() -> None:
+    with pytest.raises(ValueError, match="Expected a JSON array"):
+        _feed_in_chunks("no json here", 5)
+    with pytest.raises(ValueError, match="before the agents array was closed"):
+        _feed_in_chunks('{"agents": [{"name": "A"}, {"na', 5)
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from agentforge.core import latency
+
+
+def test_latency_history_needs_samples_before_acting(tmp_path: Path) -> None:
+    history = latency.LatencyHistory(tmp_path / "latency.json")
+    for _ in range(latency.MIN_SAMPLES - 1):
+        history.record("3", 1.0)
+
+    assert history.hedge_delay("3") is None
+    assert history.adaptive_timeout("3", 300) == 300
+
+    history.record("3", 1.0)
+    assert history.hedge_delay("3") == 1.0
+    assert history.adaptive_timeout("3", 300) == latency.MIN_TIMEOUT_SECONDS
+
+
+def test_latency_history_percentiles_ignore_other_buckets_and_persist(tmp_path: Path) -> None:
+    path = tmp_path / "latency.json"
+    history = latency.LatencyHistory(path)
+    for value in range(1, 101):
+        history.record("4", float(value))
+    history.record("9", 1000.0)
+
+    reloaded = latency.LatencyHistory(path)
+    assert reloaded.percentile("4", 0.95) == 95.0
+    assert reloaded.adaptive_timeout("4", 250) == 250
+    assert reloaded.adaptive_timeout("4", 1000) == 99.0 * latency.TIMEOUT_MULTIPLIER
+    assert latency.bucket_for(1000) != latency.bucket_for(100_000)
+
+
+def test_latency_history_merges_samples_from_other_processes(tmp_path: Path) -> None:
+    path = tmp_path / "latency.json"
+    first = latency.LatencyHistory(path)
+    second = latency.LatencyHistory(path)
+    for _ in range(10):
+        first.record("4", 1.0)
+        second.record("4", 2.0)
+
+    # Twenty samples in total, half from each history.
+    reloaded = latency.LatencyHistory(path)
+    assert reloaded.percentile("4", 0.5) == 1.0
+    assert reloaded.percentile("4", 1.0) == 2.0
+    assert second.percentile("4", 0.5) == 1.0
@@ -0,0 +1,90 @@
+import io
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import multi_repo, repo_analyzer
+
+
+def _records(output: io.StringIO) -> dict[str, dict]:
+    return {record["repo"]: record for record in map(json.loads, output.getvalue().splitlines())}
+
+
+def test_analyze_repos_streams_one_record_per_root(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    python_repo = tmp_path / "py"
+    (python_repo / "tests").mkdir(parents=True)
+    (python_repo / "manage.py").write_text("", encoding="utf-8")
+    (python_repo / "tests" / "test_app.py").write_text("", encoding="utf-8")
+    rust_repo = tmp_path / "rs"
+    rust_repo.mkdir()
+    (rust_repo / "main.rs").write_text("fn main() {}", encoding="utf-8")
+    roots = multi_repo.iter_roots(
+        [f"{python_repo}\n", "# comment\n", "\n", f"{rust_repo}\n", f"{tmp_path / 'gone'}\n"]
+    )
+    output = io.StringIO()
+
+    summary = multi_repo.analyze_repos(roots, output, jobs=2)
+
+    records = _records(output)
+    assert (summary.succeeded, summary.failed) == (2, 1)
+    assert records[str(python_repo)]["metadata"] == repo_analyzer.analyze_repo(str(python_repo))
+    assert records[str(rust_repo)]["metadata"]["primary_languages"] == ["Rust"]
+    assert records[str(python_repo)]["elapsed_ms"] >= 0
+    assert records[str(tmp_path / "gone")]["status"] == "error"
+    assert "Not a directory" in records[str(tmp_path / "gone")]["error"]
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="patches reach forked workers only"
+)
+def test_analyze_repos_survives_a_crashed_worker(tmp_path: Path, monkeypatch) -> None:
+    real_analyze = repo_analyzer.analyze_repo
+
+    def analyze(root: str, **kwargs) -> dict:
+        if root.endswith("crash"):
+            os._exit(1)
+        return real_analyze(root, **kwargs)
+
+    monkeypatch.setattr(repo_analyzer, "analyze_repo", analyze)
+    for name in ("crash", "after"):
+        (tmp_path / name).mkdir()
+    output = io.StringIO()
+
+    summary = multi_repo.analyze_repos(
+        [str(tmp_path / "crash"), str(tmp_path / "after")], output, jobs=1, snapshots=False
+    )
+
+    records = _records(output)
+    assert (summary.succeeded, summary.failed) == (1, 1)
+    assert "exited unexpectedly" in records[str(tmp_path / "crash")]["error"]
+    assert records[str(tmp_path / "after")]["status"] == "ok"
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="patches reach forked workers only"
+)
+def test_analyze_repos_isolates_unexpected_errors(tmp_path: Path, monkeypatch) -> None:
+    real_analyze = repo_analyzer.analyze_repo
+
+    def analyze(root: str, **kwargs) -> dict:
+        if root.endswith("bad"):
+            raise AttributeError("'list' object has no attribute 'keys'")
+        return real_analyze(root, **kwargs)
+
+    monkeypatch.setattr(repo_analyzer, "analyze_repo", analyze)
+    for name in ("good", "bad"):
+        (tmp_path / name).mkdir()
+    output = io.StringIO()
+
+    summary = multi_repo.analyze_repos(
+        [str(tmp_path / "good"), str(tmp_path / "bad")], output, jobs=2, snapshots=False
+    )
+
+    records = _records(output)
+    assert (summary.succeeded, summary.failed) == (1, 1)
+    assert records[str(tmp_path / "good")]["status"] == "ok"
+    assert records[str(tmp_path / "bad")]["error"].startswith("AttributeError: ")
@@ -0,0 +1,33 @@
+import os
+from pathlib import Path
+
+from agentforge.core import output_writer
+
+
+def test_write_files_only_rewrites_changed_content(tmp_path: Path) -> None:
+    files = {"a/agent.md": "alpha\n", "b/agent.md": "beta\n", "agents.json": "[]\n"}
+    first = output_writer.write_files(tmp_path, files)
+    assert (first.written, first.unchanged) == (3, 0)
+
+    unchanged = tmp_path / "a" / "agent.md"
+    os.utime(unchanged, ns=(1, 1))
+    second = output_writer.write_files(tmp_path, {**files, "b/agent.md": "beta v2\n"})
+
+    assert (second.written, second.unchanged) == (1, 2)
+    assert unchanged.stat().st_mtime_ns == 1
+    assert (tmp_path / "b" / "agent.md").read_text(encoding="utf-8") == "beta v2\n"
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_write_files_prunes_stale_agent_directories(tmp_path: Path) -> None:
+    files = {"a/agent.md": "a\n", "b/agent.md": "b\n", "c/agent.md": "c\n"}
+    output_writer.write_files(tmp_path, files)
+    (tmp_path / "c" / "notes.txt").write_text("keep me", encoding="utf-8")
+    (tmp_path / "other").mkdir()
+
+    summary = output_writer.write_files(tmp_path, {"a/agent.md": "a\n"}, prune=True)
+
+    assert (summary.unchanged, summary.removed) == (1, 2)
+    assert not (tmp_path / "b").exists()
+    assert (tmp_path / "c" / "notes.txt").exists() and not (tmp_path / "c" / "agent.md").exists()
+    assert (tmp_path / "other").is_dir()
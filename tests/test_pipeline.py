@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import pipeline
+
+
+def _write_config(tmp_path: Path, entries: list[dict]) -> str:
+    for entry in entries:
+        (tmp_path / f"{entry['id']}.md").write_text(f"# {entry['id']}\n", encoding="utf-8")
+    config = tmp_path / "agents-config.json"
+    config.write_text(json.dumps(entries), encoding="utf-8")
+    return str(config)
+
+
+def _diamond(tmp_path: Path) -> list[pipeline.PipelineNode]:
+    return pipeline.load_pipeline(
+        _write_config(
+            tmp_path,
+            [
+                {"id": "join", "depends_on": ["left", "right"]},
+                {"id": "left", "depends_on": ["root"]},
+                {"id": "right", "depends_on": ["root"]},
+                {"id": "root"},
+            ],
+        )
+    )
+
+
+def test_load_pipeline_orders_nodes_and_rejects_cycles(tmp_path: Path) -> None:
+    nodes = _diamond(tmp_path)
+    assert [node.id for node in nodes] == ["root", "left", "right", "join"]
+    assert nodes[0].agent_path == tmp_path / "root.md"
+
+    cyclic_dir = tmp_path / "cyclic"
+    cyclic_dir.mkdir()
+    cyclic = _write_config(
+        cyclic_dir,
+        [{"id": "a", "depends_on": ["b"]}, {"id": "b", "depends_on": ["a"]}],
+    )
+    with pytest.raises(ValueError, match="cycle"):
+        pipeline.load_pipeline(cyclic)
+
+
+def test_run_pipeline_runs_independent_nodes_concurrently(tmp_path: Path) -> None:
+    nodes = _diamond(tmp_path)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    seen: dict[str, dict] = {}
+
+    def runner(agent: str, task: str, context: dict) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        name = Path(agent).stem
+        seen[name] = context["upstream"]
+        return f"{name}<{'+'.join(sorted(context['upstream'].values()))}>"
+
+    result = pipeline.run_pipeline(
+        nodes, "task", {}, str(tmp_path / "out"), jobs=4, runner=runner
+    )
+
+    assert peak == 2
+    assert seen["join"] == {"left": "left<root<>>", "right": "right<root<>>"}
+    assert result.outputs["join"] == "join<left<root<>>+right<root<>>>"
+    assert (tmp_path / "out" / "join.md").read_text(encoding="utf-8") == result.outputs["join"]
+
+
+def test_run_pipeline_reruns_only_nodes_with_changed_inputs(tmp_path: Path) -> None:
+    nodes = _diamond(tmp_path)
+    calls: list[str] = []
+
+    def runner(agent: str, task: str, context: dict) -> str:
+        name = Path(agent).stem
+        calls.append(name)
+        return name + (Path(agent).read_text(encoding="utf-8") if name == "left" else "")
+
+    output_dir = str(tmp_path / "out")
+    pipeline.run_pipeline(nodes, "task", {}, output_dir, runner=runner)
+    calls.clear()
+
+    result = pipeline.run_pipeline(nodes, "task", {}, output_dir, runner=runner)
+    assert calls == [] and len(result.reused) == 4
+
+    (tmp_path / "left.md").write_text("# left v2\n", encoding="utf-8")
+    result = pipeline.run_pipeline(nodes, "task", {}, output_dir, runner=runner)
+    assert sorted(calls) == ["join", "left"]
+    assert sorted(result.reused) == ["right", "root"]
+
+
+def test_run_pipeline_skips_dependents_of_failed_nodes(tmp_path: Path) -> None:
+    nodes = _diamond(tmp_path)
+
+    def runner(agent: str, task: str, context: dict) -> str:
+        if Path(agent).stem == "left":
+            raise RuntimeError("boom")
+        return "ok"
+
+    result = pipeline.run_pipeline(nodes, "task", {}, str(tmp_path / "out"), runner=runner)
+
+    assert result.failed == {"left": "boom"}
+    assert result.skipped == ["join"]
+    assert sorted(result.executed) == ["right", "root"]
+
+
+def test_run_pipeline_keeps_finished_nodes_when_interrupted(tmp_path: Path) -> None:
+    class Interrupted(Exception):
+        pass
+
+    nodes = _diamond(tmp_path)
+    calls: list[str] = []
+
+    def runner(agent: str, _task: str, _context: dict) -> str:
+        calls.append(Path(agent).stem)
+        if Path(agent).stem == "left" and calls.count("left") == 1:
+            raise Interrupted
+        return Path(agent).stem
+
+    with pytest.raises(Interrupted):
+        pipeline.run_pipeline(nodes, "task", {}, str(tmp_path / "out"), jobs=1, runner=runner)
+
+    result = pipeline.run_pipeline(nodes, "task", {}, str(tmp_path / "out"), runner=runner)
+    assert "root" in result.reused
+    assert calls.count("root") == 1
+    assert result.executed[-1] == "join"
+
+
+def test_run_pipeline_fails_only_nodes_with_a_missing_agent(tmp_path: Path) -> None:
+    nodes = _diamond(tmp_path)
+    (tmp_path / "right.md").unlink()
+
+    result = pipeline.run_pipeline(
+        nodes, "task", {}, str(tmp_path / "out"), runner=lambda agent, *_: Path(agent).stem
+    )
+
+    assert "right.md" in result.failed["right"]
+    assert result.outputs.keys() == {"root", "left"}
+    assert result.skipped == ["join"]
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+
+import pytest
+
+from agentforge.core import executor
+
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX process groups")
+
+
+def _write_fake_codex(tmp_path, body: str):
+    script = tmp_path / "fake-codex"
+    script.write_text(
+        f"#!{sys.executable}\nimport subprocess, sys, time\n{body}\n", encoding="utf-8"
+    )
+    script.chmod(0o755)
+    return script
+
+
+def _running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # An orphan may linger as a zombie until init reaps it.
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as handle:
+            return handle.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_timeout_kills_processes_spawned_by_codex(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    pid_file = tmp_path / "grandchild"
+    script = _write_fake_codex(
+        tmp_path,
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(30)",
+    )
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(script))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="timeout"):
+        executor.execute("prompt", timeout=1)
+    assert time.monotonic() - started < 10
+
+    grandchild = int(pid_file.read_text(encoding="utf-8"))
+    deadline = time.monotonic() + 5
+    while _running(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _running(grandchild)
+
+
+def test_cpu_limit_stops_runaway_codex_and_reports_usage(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    script = _write_fake_codex(tmp_path, "while True:\n    pass")
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(script))
+    monkeypatch.setenv("AGENTFORGE_CODEX_CPU_SECONDS", "1")
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+    usages = []
+
+    with pytest.raises(RuntimeError):
+        executor.execute("prompt", timeout=30, on_usage=usages.append)
+
+    assert len(usages) == 1
+    assert usages[0].cpu_seconds >= 0.9
+    assert usages[0].max_rss_kb > 0
+
+
+def test_limits_are_applied_by_an_exec_wrapper(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    from agentforge.core import process_group
+
+    script = _write_fake_codex(
+        tmp_path,
+        "import resource\n"
+        "print(resource.getrlimit(resource.RLIMIT_CPU)[0], resource.getrlimit(resource.RLIMIT_AS)[0])",
+    )
+    monkeypatch.setenv("AGENTFORGE_CODEX_CPU_SECONDS", "7")
+    monkeypatch.setenv("AGENTFORGE_CODEX_MEMORY_MB", "4096")
+
+    assert "preexec_fn" not in process_group.popen_options()
+    process = process_group.spawn([str(script)])
+    stdout, _stderr = process.communicate(timeout=10)
+    assert stdout.split() == [b"7", str(4096 * 1024 * 1024).encode()]
+
+    with pytest.raises(FileNotFoundError):
+        process_group.limited_command([str(tmp_path / "missing-codex")])
+    monkeypatch.delenv("AGENTFORGE_CODEX_CPU_SECONDS")
+    monkeypatch.delenv("AGENTFORGE_CODEX_MEMORY_MB")
+    assert process_group.limited_command([str(script)]) == [str(script)]
+
+
+def test_async_execution_reports_usage_and_spans(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    import asyncio
+
+    from agentforge.core import tracing
+
+    script = _write_fake_codex(tmp_path, "print(sys.stdin.read().upper())")
+    monkeypatch.setenv("AGENTFORGE_CODEX_PATH", str(script))
+    monkeypatch.delenv("AGENTFORGE_CACHE_DIR", raising=False)
+    usages = []
+
+    async def main() -> list[str]:
+        return await asyncio.gather(
+            executor.execute_async("a", on_usage=usages.append),
+            executor.execute_async("b", on_usage=usages.append),
+        )
+
+    tracing.enable()
+    try:
+        assert [out.strip() for out in asyncio.run(main())] == ["A", "B"]
+    finally:
+        tracing.disable()
+
+    assert len(usages) == 2 and all(usage.max_rss_kb > 0 for usage in usages)
+    spans = [record for record in tracing.records() if record.name == "codex_exec"]
+    assert len(spans) == 2
+    # Concurrent tasks must not nest under each other's span.
+    assert all(span.child_ns == 0 for span in spans)
+    assert all("max_rss_kb" in span.attrs for span in spans)
@@ -1,5 +1,6 @@
 import json
 
+from agentforge.core import prompt_budget
 from agentforge.core.prompt_builder import build_agent_generation_prompt
 
 
@@ -13,3 +14,38 @@ def test_build_agent_generation_prompt_contains_spec_and_repo() -> None:
     assert "Repository Metadata:" in prompt
     assert json.dumps(spec, indent=2, sort_keys=True, ensure_ascii=True) in prompt
     assert json.dumps(repo, indent=2, sort_keys=True, ensure_ascii=True) in prompt
+
+
+def test_compact_mode_drops_raw_and_indentation(monkeypatch) -> None:
+    spec = {
+        "raw": "# Goals\nShip\n# Constraints\nFast\n",
+        "preamble": "",
+        "sections": {"Goals": "Ship\n\n---", "Constraints": "Fast"},
+    }
+    verbose = build_agent_generation_prompt(spec, {"size": "small"})
+    monkeypatch.setenv("AGENTFORGE_PROMPT_COMPACT", "1")
+
+    prompt = build_agent_generation_prompt(spec, {"size": "small"})
+
+    assert len(prompt) < len(verbose)
+    assert '"raw"' not in prompt and "---" not in prompt
+    assert '{"preamble":"","sections":{"Constraints":"Fast","Goals":"Ship"}}' in prompt
+
+
+def test_budget_trims_low_priority_sections_first(monkeypatch) -> None:
+    sections = {
+        "Goals": "g",
+        "Constraints": "c",
+        "Agents": "a" * 400,
+        "Context": "x" * 400,
+        "Notes": "n" * 400,
+    }
+    spec = {"preamble": "", "sections": sections}
+    base = len(build_agent_generation_prompt({"preamble": "", "sections": {}}, {})) // 4
+    monkeypatch.setenv("AGENTFORGE_PROMPT_BUDGET", str(base + 150))
+
+    prompt = build_agent_generation_prompt(spec, {})
+
+    assert prompt_budget.estimate_tokens(prompt) <= base + 150
+    assert "Agents" in prompt
+    assert "Notes" not in prompt and "Context" not in prompt
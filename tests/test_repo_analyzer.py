@@ -1,3 +1,6 @@
+import json
+import os
+import time
 from pathlib import Path
 
 from agentforge.core import repo_analyzer
@@ -13,3 +16,222 @@ def test_analyze_repo_aggregates_languages(tmp_path: Path) -> None:
     assert metadata["languages"]["Python"] == 2
     assert metadata["languages"]["JavaScript"] == 1
     assert "Python" in metadata["primary_languages"]
+
+
+def _make_tree(root: Path) -> None:
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "tests").mkdir()
+    (root / "node_modules").mkdir()
+    (root / "pkg" / "a.py").write_text("", encoding="utf-8")
+    (root / "pkg" / "sub" / "b.ts").write_text("", encoding="utf-8")
+    (root / "node_modules" / "skip.js").write_text("", encoding="utf-8")
+    (root / "requirements.txt").write_text("flask==3.0\n", encoding="utf-8")
+
+
+def test_snapshot_rescans_only_changed_directories(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _make_tree(repo)
+    snapshot = tmp_path / "snapshot.json"
+
+    first = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot))
+    assert first == repo_analyzer.analyze_repo(str(repo))
+    assert first["frameworks"] == ["Flask"]
+    assert first["tests"] is True
+
+    # Pretend the previous scan happened long ago so unchanged mtimes are trusted.
+    data = json.loads(snapshot.read_text(encoding="utf-8"))
+    data["scanned_at_ns"] = time.time_ns() + 10**10
+    snapshot.write_text(json.dumps(data), encoding="utf-8")
+
+    scanned: list[str] = []
+    original = repo_analyzer._scan_directory
+
+    def tracking_scan(path, mtime_ns):
+        scanned.append(path.name)
+        return original(path, mtime_ns)
+
+    monkeypatch.setattr(repo_analyzer, "_scan_directory", tracking_scan)
+    (repo / "pkg" / "sub" / "c.go").write_text("", encoding="utf-8")
+    os.utime(repo / "pkg" / "sub", ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+
+    second = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot))
+
+    assert scanned == ["sub"]
+    assert second["languages"]["Go"] == 1
+    assert second == repo_analyzer.analyze_repo(str(repo), full_rescan=True)
+
+
+def test_memo_keeps_snapshots_in_memory_across_processes(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _make_tree(repo)
+    snapshot = tmp_path / "snapshot.json"
+    monkeypatch.setattr(repo_analyzer, "_memo", {})
+    monkeypatch.setattr(repo_analyzer, "_memo_changed", set())
+
+    # What a forked daemon request saves comes back to the daemon as JSON.
+    first = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot))
+    updates = json.loads(json.dumps(repo_analyzer.memo_updates()))
+    assert repo_analyzer.memo_updates() == []
+    repo_analyzer._memo.clear()
+    repo_analyzer.adopt_memo(updates)
+
+    reads: list[str] = []
+    original = Path.read_text
+
+    def tracking_read(self, *args, **kwargs):
+        reads.append(self.name)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", tracking_read)
+    assert repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot)) == first
+    assert "snapshot.json" not in reads
+
+    # A snapshot rewritten by another process is read again.
+    snapshot.write_text(snapshot.read_text(encoding="utf-8") + " ", encoding="utf-8")
+    reads.clear()
+    assert repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot)) == first
+    assert "snapshot.json" in reads
+
+
+def test_parallel_walk_matches_serial(tmp_path: Path) -> None:
+    for index in range(30):
+        directory = tmp_path / f"d{index % 5}" / f"n{index}"
+        directory.mkdir(parents=True)
+        suffix = (".py", ".js", ".go", ".md", ".txt")[index % 5]
+        (directory / f"file{index}{suffix}").write_text("", encoding="utf-8")
+    (tmp_path / "d1" / "n1" / "test_x.py").write_text("", encoding="utf-8")
+
+    serial = repo_analyzer.analyze_repo(str(tmp_path))
+    parallel = repo_analyzer.analyze_repo(str(tmp_path), workers=4)
+
+    assert parallel == serial
+    assert list(parallel["languages"].items()) == list(serial["languages"].items())
+
+
+def test_sampling_is_exact_on_small_trees(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+
+    full = repo_analyzer.analyze_repo(str(tmp_path))
+    sampled = repo_analyzer.analyze_repo(str(tmp_path), sample_budget_seconds=5)
+
+    assert sampled["sampling"]["exact"] is True
+    assert {key: sampled[key] for key in full} == full
+
+
+def test_sampling_respects_file_budget(tmp_path: Path) -> None:
+    for index in range(400):
+        directory = tmp_path / f"d{index}"
+        directory.mkdir()
+        (directory / "a.py").write_text("", encoding="utf-8")
+        (directory / "b.py").write_text("", encoding="utf-8")
+
+    sampled = repo_analyzer.analyze_repo(str(tmp_path), sample_max_files=100)
+
+    info = sampled["sampling"]
+    assert info["exact"] is False
+    assert info["files_examined"] < 800
+    assert info["estimated_files"] == 800
+    assert sampled["languages"]["Python"] == 800
+    assert sampled["size"] == "large"
+
+
+def test_sampling_observes_every_level_when_the_budget_is_spent(tmp_path: Path) -> None:
+    for index in range(20):
+        (tmp_path / f"top{index}.py").write_text("", encoding="utf-8")
+    for index in range(30):
+        directory = tmp_path / f"d{index}"
+        directory.mkdir()
+        for name in range(30):
+            (directory / f"m{name}.py").write_text("", encoding="utf-8")
+
+    for options in ({"sample_max_files": 10}, {"sample_budget_seconds": 0.0}):
+        sampled = repo_analyzer.analyze_repo(str(tmp_path), **options)
+
+        info = sampled["sampling"]
+        assert info["depth_reached"] == 2
+        assert info["estimated_files"] == 920
+        assert sampled["size"] == "large"
+        assert info["size_confidence"] < 1.0
+
+
+def test_frameworks_are_detected_in_nested_packages(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "services" / "api").mkdir(parents=True)
+    (tmp_path / "web").mkdir()
+    (tmp_path / "requirements.txt").write_text("flask==3.0\n", encoding="utf-8")
+    (tmp_path / "services" / "api" / "pyproject.toml").write_text(
+        '[project]\ndependencies = ["fastapi>=0.100"]\n', encoding="utf-8"
+    )
+    (tmp_path / "web" / "package.json").write_text(
+        '{"dependencies": {"react": "^18"}}', encoding="utf-8"
+    )
+    (tmp_path / "web" / "vite.config.ts").write_text("", encoding="utf-8")
+    scanned: list[Path] = []
+    original = repo_analyzer._scan_directory
+
+    def tracking_scan(path, mtime_ns):
+        scanned.append(path)
+        return original(path, mtime_ns)
+
+    monkeypatch.setattr(repo_analyzer, "_scan_directory", tracking_scan)
+
+    metadata = repo_analyzer.analyze_repo(str(tmp_path), workers=4)
+
+    assert len(scanned) == len(set(scanned)) == 4
+    assert metadata["frameworks"] == ["FastAPI", "Flask", "React", "Vite"]
+    assert metadata["packages"] == {
+        ".": ["Flask"],
+        "services/api": ["FastAPI"],
+        "web": ["React", "Vite"],
+    }
+
+
+def test_manifests_are_parsed_once_per_content(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    for name in ("a", "b", "c"):
+        (repo / name).mkdir(parents=True)
+        (repo / name / "package.json").write_text(
+            '{"dependencies": {"vue": "3"}}', encoding="utf-8"
+        )
+    snapshot = tmp_path / "snapshot.json"
+    parsed: list[str] = []
+    original = repo_analyzer._MANIFEST_READERS["package.json"]
+
+    def tracking_reader(text: str) -> set[str]:
+        parsed.append(text)
+        return original(text)
+
+    monkeypatch.setitem(repo_analyzer._MANIFEST_READERS, "package.json", tracking_reader)
+    monkeypatch.setattr(repo_analyzer, "_PARSED_MANIFESTS", {})
+
+    first = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot))
+    (repo / "b" / "package.json").write_text(
+        '{"dependencies": {"svelte": "4"}}', encoding="utf-8"
+    )
+    second = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(snapshot))
+
+    assert len(parsed) == 2
+    assert first["packages"] == {"a": ["Vue"], "b": ["Vue"], "c": ["Vue"]}
+    assert second["packages"] == {"a": ["Vue"], "b": ["Svelte"], "c": ["Vue"]}
+    assert second["frameworks"] == ["Svelte", "Vue"]
+
+
+def test_malformed_nested_manifests_are_ignored(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    (repo / "fixtures").mkdir(parents=True)
+    (repo / "web").mkdir()
+    (repo / "fixtures" / "package.json").write_text(
+        '{"dependencies": ["react"], "devDependencies": null}', encoding="utf-8"
+    )
+    (repo / "fixtures" / "pyproject.toml").write_text(
+        '[project]\ndependencies = "flask"\n[tool]\npoetry = 1\n', encoding="utf-8"
+    )
+    (repo / "web" / "package.json").write_text(
+        '{"dependencies": {"vue": "3"}}', encoding="utf-8"
+    )
+
+    result = repo_analyzer.analyze_repo(str(repo), snapshot_path=str(tmp_path / "snap.json"))
+
+    assert result["packages"] == {"web": ["Vue"]}
+    assert result["frameworks"] == ["Vue"]
@@ -0,0 +1,51 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from agentforge.core import singleflight
+
+
+def test_single_flight_shares_exceptions_with_waiters() -> None:
+    flights = singleflight.SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors: list[str] = []
+
+    def failing_call() -> str:
+        started.set()
+        release.wait(5)
+        raise RuntimeError("codex failed")
+
+    def call(func) -> None:
+        try:
+            flights.do("key", func)
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    leader = threading.Thread(target=call, args=(failing_call,))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call, args=(lambda: "never runs",))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert errors == ["codex failed", "codex failed"]
+    assert flights.do("key", lambda: "fresh") == ("fresh", False)
+
+
+@pytest.mark.skipif(not singleflight.file_locks_supported(), reason="needs fcntl")
+def test_file_lock_is_exclusive_and_cleans_up(tmp_path: Path) -> None:
+    first = singleflight.FileLock(tmp_path, "abc")
+    second = singleflight.FileLock(tmp_path, "abc")
+
+    assert first.acquire(blocking=False)
+    assert not second.acquire(blocking=False)
+    first.release()
+    assert not (tmp_path / "abc.lock").exists()
+    assert second.acquire(blocking=False)
+    second.release()
@@ -35,3 +35,49 @@ def test_parse_spec_rejects_missing_file(tmp_path: Path) -> None:
     missing = tmp_path / "missing.md"
     with pytest.raises(FileNotFoundError):
         spec_parser.parse_spec(str(missing))
+
+
+def test_parse_spec_memo_reuses_until_the_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(spec_parser, "_memo", None)
+    spec_parser.enable_memo()
+    spec_path = tmp_path / "spec.md"
+    spec_path.write_text("# Goals\nA goal.\n# Constraints\nNone.\n", encoding="utf-8")
+
+    first = spec_parser.parse_spec(str(spec_path))
+    assert spec_parser.parse_spec(str(spec_path)) is first
+
+    spec_path.write_text("# Goals\nAnother goal.\n# Constraints\nNone.\n", encoding="utf-8")
+    assert spec_parser.parse_spec(str(spec_path))["sections"]["Goals"] == "Another goal."
+
+
+def test_split_spec_shards_agent_entries_and_shares_the_rest() -> None:
+    spec = {
+        "raw": "ignored",
+        "preamble": "",
+        "sections": {
+            "Goals": "Ship.",
+            "Constraints": "Fast.",
+            "Deliverables": "A site.",
+            "Agents": "We need two agents, both must speak French.\n- Router\n- Writer",
+            "Responsibilities": "## Router\n- Route work\n## Writer\n- Write copy",
+            "Success Criteria": "Happy users.",
+        },
+    }
+
+    shards = spec_parser.split_spec(spec)
+
+    assert [shard["focus"] for shard in shards] == [["Router"], ["Writer"]]
+    assert all("raw" not in shard for shard in shards)
+    assert shards[1]["sections"] == {
+        "Goals": "Ship.",
+        "Constraints": "Fast.",
+        "Deliverables": "A site.",
+        "Agents": "We need two agents, both must speak French.\n- Writer",
+        "Responsibilities": "## Writer\n- Write copy",
+        "Success Criteria": "Happy users.",
+    }
+    assert len(spec_parser.split_spec(spec, max_shards=1)) == 1
+    single = {"raw": "", "preamble": "", "sections": {"Goals": "g", "Constraints": "c"}}
+    assert spec_parser.split_spec(single) == [single]
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = [
+    "asyncio",
+    "tomllib",
+    "configparser",
+    "jinja2",
+    "concurrent.futures",
+    "dataclasses",
+]
+
+
+def _loaded_after(statement: str) -> set[str]:
+    script = f"import sys\n{statement}\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_cli_import_is_lazy() -> None:
+    loaded = _loaded_after("import agentforge.cli")
+
+    assert "agentforge.core.executor" not in loaded
+    assert "agentforge.core.repo_analyzer" not in loaded
+    assert not loaded.intersection(HEAVY_MODULES)
+
+
+def test_run_path_skips_analyzer_and_async() -> None:
+    loaded = _loaded_after("import agentforge.cli, agentforge.core.executor")
+
+    assert "agentforge.core.repo_analyzer" not in loaded
+    assert not loaded.intersection(HEAVY_MODULES)
+
+
+def test_generate_path_skips_heavy_modules() -> None:
+    loaded = _loaded_after(
+        "import agentforge.cli, agentforge.core.agent_generator, agentforge.core.repo_analyzer"
+    )
+
+    assert not loaded.intersection(HEAVY_MODULES)
+
+
+def test_package_attributes_resolve_lazily() -> None:
+    loaded = _loaded_after("import agentforge\nagentforge.parse_spec")
+
+    assert "agentforge.core.spec_parser" in loaded
+    assert "agentforge.core.executor" not in loaded
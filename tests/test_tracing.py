@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+from agentforge.core import tracing
+
+
+def test_span_is_noop_when_disabled() -> None:
+    tracing.disable()
+    with tracing.span("phase") as span:
+        assert not span
+        span.set(bytes=1)
+    assert not tracing.is_enabled()
+
+
+def test_summary_reports_self_time_and_attrs(tmp_path: Path) -> None:
+    tracing.enable()
+    try:
+        with tracing.span("outer") as outer:
+            outer.set(prompt_bytes=10)
+            with tracing.span("inner"):
+                pass
+            with tracing.span("inner"):
+                pass
+    finally:
+        tracing.disable()
+
+    phases = {phase["phase"]: phase for phase in tracing.summarize()}
+    assert phases["inner"]["calls"] == 2
+    assert phases["outer"]["prompt_bytes"] == 10
+    assert phases["outer"]["self_ms"] <= phases["outer"]["total_ms"]
+
+    trace_path = tmp_path / "trace.json"
+    tracing.write_chrome_trace(str(trace_path))
+    events = json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"]
+    assert {event["name"] for event in events} == {"outer", "inner"}
+    assert all(event["ph"] == "X" for event in events)